@@ -44,6 +44,9 @@ def main(update: bool = False):
         except IntegrityError as e:
             print(f"❌ Failed to create superuser: {e}")
 
-if __name__ == "__main__":
+def cli():
     update_flag = "--update" in sys.argv
     main(update=update_flag)
+
+if __name__ == "__main__":
+    cli()
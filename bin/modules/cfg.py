@@ -1,9 +1,12 @@
 import sys
 import os
 import re
+import json
+import hashlib
 from pathlib import Path
-from dotenv import dotenv_values
-import yaml  # PyYAML library for YAML parsing :contentReference[oaicite:4]{index=4}
+
+# yaml and dotenv are imported lazily: a valid config snapshot lets CLI entry
+# points skip both the imports and the parsing.
 
 # Determine project root (assumes this file is in bin/modules/ under the project root)
 APP_ROOT = Path(__file__).resolve().parents[2]
@@ -17,6 +20,13 @@ if str(BIN_DIR) not in sys.path:
 CONFIG_FILE_PATH = APP_ROOT / ".licman-cfg.yml"
 ENV_FILE_PATH = APP_ROOT / ".env"
 
+# Compiled configuration snapshots
+SNAPSHOT_DIR = APP_ROOT / "var" / "cache" / "cfg"
+SNAPSHOT_VERSION = 1
+
+# Pattern to match $ENV{VAR_NAME}
+ENV_PLACEHOLDER_PATTERN = re.compile(r"\$ENV\{([^}]+)\}")
+
 def get_config_file():
     """
     Determine the path to the licman YAML configuration file.
@@ -38,11 +48,35 @@ def get_configuration():
     """
     Load the licman configuration from YAML, creating a default config if needed.
     Performs environment-based section selection and placeholder substitution.
+
+    The resolved result is cached as a JSON snapshot under var/cache/cfg and
+    reused for as long as the YAML file, the .env file and every environment
+    variable the resolution consulted are unchanged.
     """
     config_path = get_config_file()
     if not config_path.exists():
         return {}  # ← Let the caller (configure.py) handle population
 
+    use_snapshot = os.getenv("LICMAN_CONFIG_CACHE", "1").lower() not in ("0", "false", "no")
+    if use_snapshot:
+        config = _load_snapshot(config_path)
+        if config is not None:
+            return config
+
+    config, consulted = _compile_configuration(config_path)
+
+    if use_snapshot:
+        _write_snapshot(config_path, config, consulted)
+
+    return config
+
+def _compile_configuration(config_path):
+    """
+    Parse and resolve the configuration. Returns the config and the names of
+    the environment variables the result depends on.
+    """
+    import yaml
+
     # Load the YAML configuration file
     with open(config_path, "r") as f:
         yaml_content = f.read()
@@ -71,32 +105,112 @@ def get_configuration():
         config = data
 
     # Substitute environment placeholders in the config values
-    config = _substitute_env_placeholders(config, {**env_vars, **os.environ})
+    consulted = {"LICMAN_ENV"}
+    config = _substitute_env_placeholders(config, {**env_vars, **os.environ}, consulted)
 
-    return config
+    return config, consulted
 
-def _substitute_env_placeholders(config_fragment, env_dict):
+def _substitute_env_placeholders(config_fragment, env_dict, consulted=None):
     """
     Recursively replace $ENV{VAR} placeholders in the given config fragment (dict, list, or value)
     using the values from env_dict (which should contain environment variables).
+    Variable names that were looked up are added to `consulted` when given.
     """
-    # Pattern to match $ENV{VAR_NAME}
-    pattern = re.compile(r"\$ENV\{([^}]+)\}")
     if isinstance(config_fragment, dict):
-        return {key: _substitute_env_placeholders(val, env_dict)
+        return {key: _substitute_env_placeholders(val, env_dict, consulted)
                 for key, val in config_fragment.items()}
     elif isinstance(config_fragment, list):
-        return [_substitute_env_placeholders(item, env_dict) for item in config_fragment]
+        return [_substitute_env_placeholders(item, env_dict, consulted) for item in config_fragment]
     elif isinstance(config_fragment, str):
+        if "$ENV{" not in config_fragment:
+            return config_fragment
         # Replace all occurrences of the pattern in the string
         def replacer(match):
             var_name = match.group(1)
+            if consulted is not None:
+                consulted.add(var_name)
             return str(env_dict.get(var_name, ""))
-        return pattern.sub(replacer, config_fragment)
+        return ENV_PLACEHOLDER_PATTERN.sub(replacer, config_fragment)
     else:
         # For numbers, booleans, None, or other types, return as-is
         return config_fragment
 
+def _snapshot_path(config_path):
+    digest = hashlib.sha1(str(config_path).encode()).hexdigest()[:16]
+    return SNAPSHOT_DIR / f"config-{digest}.json"
+
+def _fingerprint(path):
+    """
+    Describe a source file by mtime, size and content hash (or its absence).
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return {"exists": False}
+    return {
+        "exists": True,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+    }
+
+def _fingerprint_matches(path, expected):
+    """
+    Cheap check first: an unchanged mtime and size costs one stat(). Only when
+    those differ is the file hashed, so a touched-but-identical file still hits.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return not expected.get("exists")
+    if not expected.get("exists"):
+        return False
+    if stat.st_mtime_ns == expected["mtime_ns"] and stat.st_size == expected["size"]:
+        return True
+    if stat.st_size != expected["size"]:
+        return False
+    return hashlib.sha256(path.read_bytes()).hexdigest() == expected["sha256"]
+
+def _load_snapshot(config_path):
+    try:
+        snapshot = json.loads(_snapshot_path(config_path).read_text())
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    for name, value in snapshot["environ"].items():
+        if os.environ.get(name) != value:
+            return None
+    for path, expected in snapshot["sources"].items():
+        if not _fingerprint_matches(Path(path), expected):
+            return None
+
+    return snapshot["config"]
+
+def _write_snapshot(config_path, config, consulted):
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "sources": {str(p): _fingerprint(p) for p in (config_path, ENV_FILE_PATH)},
+        "environ": {name: os.environ.get(name) for name in sorted(consulted)},
+        "config": config,
+    }
+    target = _snapshot_path(config_path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(snapshot)
+        # Resolved config and environ values include secrets: owner-only from creation.
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    except (OSError, TypeError, ValueError):
+        # Unwritable cache dir or values JSON can't represent (e.g. YAML dates): run uncached.
+        tmp.unlink(missing_ok=True)
+
+def invalidate_snapshot(config_path=None):
+    _snapshot_path(config_path or get_config_file()).unlink(missing_ok=True)
+
 def save_configuration(config_data):
     """
     Save the provided configuration dictionary back to the YAML config file.
@@ -110,6 +224,8 @@ def write_config_file(config_data=None, file_path=None):
     If config_data is None, writes the DEFAULT_CONFIG.
     If file_path is None, writes to the default config file path.
     """
+    import yaml
+
     if file_path is None:
         file_path = get_config_file()
     data_to_write = config_data if config_data is not None else {}
@@ -120,9 +236,11 @@ def write_config_file(config_data=None, file_path=None):
     with open(file_path, "w") as f:
         yaml.safe_dump(data_to_write, f, default_flow_style=False)
 
+    invalidate_snapshot(file_path)
+
 def parse_env_file(path=None):
-    from pathlib import Path
-    path = path or Path(__file__).resolve().parents[2] / ".env"
+    from dotenv import dotenv_values
+    path = path or ENV_FILE_PATH
     return dotenv_values(path)
 
 def write_env_file(path, data: dict):
@@ -130,6 +248,9 @@ def write_env_file(path, data: dict):
         for key, value in data.items():
             f.write(f"{key}={value}\n")
 
+    if Path(path).resolve() == ENV_FILE_PATH:
+        invalidate_snapshot()
+
 def write_template_file(src: Path, dst: Path, **values):
     """
     Copy a config template from `src` to `dst`, replacing __PLACEHOLDER__ tokens
@@ -1,17 +1,135 @@
-import shutil
+import argparse
+import compileall
+import importlib.util
 import os
+import shutil
+import sys
+import time
 from pathlib import Path
 
 APP_ROOT = Path(__file__).resolve().parents[2]
+BIN_DIR = APP_ROOT / "bin"
 SRC_DIR = APP_ROOT / "src" / "backend"
+VENV_DIR = APP_ROOT / "opt" / "venv"
 
-def main():
-    for root, dirs, _ in os.walk(SRC_DIR):
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+CACHE_TAG = sys.implementation.cache_tag
+MAGIC = importlib.util.MAGIC_NUMBER
+
+def venv_site_packages():
+    return sorted(VENV_DIR.glob("lib/python3*/site-packages"))
+
+def source_for(pyc: Path) -> Path:
+    """__pycache__/name.cpython-313[.opt-1].pyc -> ../name.py"""
+    return pyc.parent.parent / f"{pyc.name.split('.', 1)[0]}.py"
+
+def is_stale(pyc: Path, source: Path) -> bool:
+    """
+    True when a timestamp-based .pyc for this interpreter no longer matches its
+    source (or has the wrong magic). Hash-based and other interpreters' .pyc
+    files are left alone; the import system validates those itself.
+    """
+    if f".{CACHE_TAG}." not in pyc.name:
+        return False
+    try:
+        with open(pyc, "rb") as f:
+            header = f.read(16)
+        st = source.stat()
+    except OSError:
+        return True
+    if len(header) < 16 or header[:4] != MAGIC:
+        return True
+    if int.from_bytes(header[4:8], "little") & 0b1:
+        return False  # hash-based pyc
+    mtime = int.from_bytes(header[8:12], "little")
+    size = int.from_bytes(header[12:16], "little")
+    return mtime != (int(st.st_mtime) & 0xFFFFFFFF) or size != (st.st_size & 0xFFFFFFFF)
+
+def prune(root: Path) -> tuple[int, int]:
+    """Remove orphaned and stale .pyc files under `root`. Returns (orphaned, stale)."""
+    orphaned = stale = 0
+    for dirpath, dirs, files in os.walk(root):
+        if Path(dirpath).name != "__pycache__":
+            continue
+        for name in files:
+            if not name.endswith(".pyc"):
+                continue
+            pyc = Path(dirpath) / name
+            source = source_for(pyc)
+            if not source.exists():
+                orphaned += 1
+            elif is_stale(pyc, source):
+                stale += 1
+            else:
+                continue
+            print(f"...removing: {pyc}...")
+            pyc.unlink(missing_ok=True)
+        if not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return orphaned, stale
+
+def purge(root: Path):
+    """Previous behaviour: delete every __pycache__ directory under `root`."""
+    for root_dir, dirs, _ in os.walk(root):
         for d in dirs:
             if d == "__pycache__":
-                target = Path(root) / d
+                target = Path(root_dir) / d
                 print(f"...removing: {target}...")
                 shutil.rmtree(target, ignore_errors=True)
 
+def precompile(roots, workers: int = 0) -> bool:
+    """Compile missing or out-of-date bytecode with a compileall process pool (0 = one per CPU)."""
+    ok = True
+    for root in roots:
+        started = time.perf_counter()
+        ok &= bool(compileall.compile_dir(str(root), quiet=1, workers=workers))
+        print(f"✓ Compiled {root} in {time.perf_counter() - started:.1f}s")
+    return ok
+
+def warmup():
+    """
+    Import Django, every installed app, the URLconf (and with it the views and
+    serializers) and the Celery app, so any bytecode compileall did not cover
+    is written and the files are hot in the page cache before gunicorn forks.
+    """
+    from importlib import import_module
+    from modules import management
+
+    started = time.perf_counter()
+    management.setup()
+    from django.conf import settings
+    import_module(settings.ROOT_URLCONF)
+    import_module("backend.celery_app")
+    print(f"✓ Warmed up Django imports in {time.perf_counter() - started:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain Python bytecode caches for faster worker cold starts.")
+    parser.add_argument("--purge", action="store_true", help="Delete every __pycache__ under src/backend and stop")
+    parser.add_argument("--no-venv", action="store_true", help="Do not precompile the virtualenv's site-packages")
+    parser.add_argument("--warmup", action="store_true", help="Import Django apps and URLconf after compiling")
+    parser.add_argument("--workers", type=int, default=0, help="compileall worker processes (0 = CPU count)")
+    args = parser.parse_args()
+
+    if args.purge:
+        purge(SRC_DIR)
+        return
+
+    orphaned, stale = prune(SRC_DIR)
+    print(f"✓ Removed {orphaned} orphaned and {stale} stale bytecode files.")
+
+    # Only the backend's own sources decide the exit status; third-party
+    # packages often ship files that do not compile on this interpreter.
+    ok = precompile([SRC_DIR], workers=args.workers)
+    if not args.no_venv:
+        precompile(venv_site_packages(), workers=args.workers)
+
+    if args.warmup:
+        warmup()
+
+    if not ok:
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,139 @@
+"""
+Subcommand dispatcher behind bin/licman.
+
+Subcommand modules are imported only when invoked, so `licman dhp` never pays
+for yaml, dotenv or Django, and Django management commands run in this
+interpreter instead of booting another one for manage.py.
+"""
+
+import os
+import sys
+import time
+from importlib import import_module
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parents[2]
+BIN_DIR = APP_ROOT / "bin"
+LICMAN_SCRIPT = BIN_DIR / "licman"
+
+# name: (module or script path, callable, summary)
+COMMANDS = {
+    "install":    ("modules.install", "main", "Install toolchains, dependencies and build the frontend"),
+    "configure":  ("modules.configure", "main", "Write .licman-cfg.yml, .env and runtime config files"),
+    "migrate":    ("modules.migrate", "main", "Apply database migrations"),
+    "seed":       ("modules.seed", "seed", "Seed default groups and permissions"),
+    "adminuser":  ("modules.adminuser", "cli", "Create (or --update) the Django superuser"),
+    "static":     ("modules.static", "main", "Collect and precompress static assets"),
+    "web":        ("modules.web", "main", "Manage nginx and gunicorn under supervisor"),
+    "queue":      ("modules.queue_manager", "main", "Manage Celery workers under supervisor"),
+    "dhp":        ("modules.dhp", "main", "Generate Diffie-Hellman parameters (--background keeps a pool)"),
+    "procmon":    ("modules.procmon", "main", "Supervisor event listener for process metrics and recycling"),
+    "cleancache": ("modules.cleancache", "main", "Clean Python bytecode caches"),
+    "manage":     ("modules.management", "cli", "Run any Django management command in-process"),
+    "audit":      (str(BIN_DIR / "audit"), None, "Print or list files in a directory tree"),
+}
+
+DEFAULT_STARTUP_BUDGET_MS = 50
+
+def print_help():
+    print("Usage: licman [--profile] <command> [args...]\n\nCommands:")
+    for name, (_, _, summary) in COMMANDS.items():
+        print(f"  {name:<12} {summary}")
+    print("\n  --profile    Report interpreter startup, dispatch and import times for the command")
+
+def process_age_ms() -> float | None:
+    """Milliseconds since this process started (Linux only; clock-tick resolution)."""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return (uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")) * 1000
+    except (OSError, ValueError, IndexError):
+        return None
+
+def run(name: str, args: list[str]) -> int:
+    target, func_name, _ = COMMANDS[name]
+    profiling = bool(os.getenv("LICMAN_PROFILE"))
+    startup_ms = process_age_ms() if profiling else None
+
+    # Subcommands parse sys.argv themselves, exactly as when run from their own wrapper.
+    sys.argv = [f"licman {name}", *args]
+
+    started = time.perf_counter()
+    if func_name is None:
+        import runpy
+        runpy.run_path(target, run_name="__main__")
+        result = 0
+        imported = started
+    else:
+        module = import_module(target)
+        imported = time.perf_counter()
+        result = getattr(module, func_name)()
+    finished = time.perf_counter()
+
+    if profiling:
+        budget = int(os.getenv("LICMAN_STARTUP_BUDGET_MS", DEFAULT_STARTUP_BUDGET_MS))
+        verdict = "n/a" if startup_ms is None else ("ok" if startup_ms <= budget else "OVER BUDGET")
+        startup = "unknown" if startup_ms is None else f"{startup_ms:.0f}ms"
+        sys.stderr.write(
+            f"[licman] startup {startup} (budget {budget}ms: {verdict}), "
+            f"import {target} {(imported - started) * 1000:.1f}ms, "
+            f"run {(finished - imported) * 1000:.1f}ms\n"
+        )
+
+    return result if isinstance(result, int) else 0
+
+def profile(argv: list[str]) -> int:
+    """
+    Re-run the command under `-X importtime` and summarize the slowest
+    top-level imports after it finishes. The command's own output passes through.
+    """
+    import subprocess
+
+    env = os.environ.copy()
+    env["LICMAN_PROFILE"] = "1"
+    proc = subprocess.Popen(
+        [sys.executable, "-X", "importtime", str(LICMAN_SCRIPT), *argv],
+        env=env, stderr=subprocess.PIPE, text=True,
+    )
+
+    imports = []
+    for line in proc.stderr:
+        if not line.startswith("import time:"):
+            sys.stderr.write(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except (IndexError, ValueError):
+            continue  # header line
+        name = parts[2].rstrip("\n")
+        if len(name) - len(name.lstrip()) == 1:  # top-level import
+            imports.append((cumulative, name.strip()))
+    code = proc.wait()
+
+    imports.sort(reverse=True)
+    total_ms = sum(us for us, _ in imports) / 1000
+    sys.stderr.write(f"[licman] {len(imports)} top-level imports, {total_ms:.1f}ms total. Slowest:\n")
+    for us, module in imports[:15]:
+        sys.stderr.write(f"  {us / 1000:8.1f}ms  {module}\n")
+    return code
+
+def main(argv: list[str]) -> int:
+    if argv and argv[0] == "--profile":
+        argv = argv[1:]
+        if argv and argv[0] in COMMANDS:
+            return profile(argv)
+
+    if not argv or argv[0] in ("help", "-h", "--help"):
+        print_help()
+        return 0
+
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        sys.stderr.write(f"❌ Unknown command: {name}\n\n")
+        print_help()
+        return 2
+
+    return run(name, args)
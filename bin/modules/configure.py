@@ -14,6 +14,7 @@ if str(BIN_DIR) not in sys.path:
 
 from modules import cfg
 from modules import utility
+from modules import dhp
 
 # Base paths
 SRC_DIR = APP_ROOT / "src"
@@ -37,9 +38,13 @@ CONFIG_FILES = {
     "queue_manager":    [ ETC_DIR / "supervisor/queue-manager.conf.dist",       ETC_DIR / "supervisor/queue-manager.conf" ],
 }
 
+# Django session engines selectable for SESSION_BACKEND (see settings.SESSION_ENGINE)
+SESSION_BACKENDS = ("db", "cache", "cached_db")
+
 DEFAULTS = {
     "django": {
         "DJANGO_SECRET_KEY": utility.generate_rand_str(50),
+        "FIELD_ENCRYPTION_KEY": secrets.token_urlsafe(48),
         "DEBUG": "true",
         "ALLOWED_HOSTS": "localhost,127.0.0.1",
         "DATABASE_NAME": "licman",
@@ -51,6 +56,11 @@ DEFAULTS = {
         "STATIC_ROOT": str(VAR_DIR / "static"),
         "MEDIA_ROOT": str(VAR_DIR / "media"),
         "LOG_DIR": str(LOG_DIR),
+        "ARCHIVE_DIR": str(VAR_DIR / "archive"),
+        "SESSION_BACKEND": "cached_db",
+        "ARGON2_TIME_COST": "2",
+        "ARGON2_MEMORY_COST": "102400",
+        "ARGON2_PARALLELISM": "8",
     },
     "celery": {
         "CELERY_RESULT_BACKEND": "",  # Optional — some apps skip this
@@ -63,6 +73,10 @@ DEFAULTS = {
         "SUPERVISORCTL_SECRET": secrets.token_hex(16),
         "SUPERVISORCTL_PORT": "6160",
     },
+    "procmon": {
+        "PROCMON_MAX_RSS_MB": "512",
+        "PROCMON_GRACE_SAMPLES": "3",
+    },
     "queue_manager": {
         "QUEUECTL_USER": getpass.getuser(),
         "QUEUECTL_SECRET": secrets.token_hex(16),
@@ -93,6 +107,9 @@ def configure(interactive: bool = True):
         if src.exists():
             cfg.write_template_file(src, dst, **flatten_config(merged))
 
+    # ssl-params.conf includes this; it must exist before nginx first starts.
+    dhp.ensure_include()
+
     print("✅ Configuration complete.")
 
     if interactive:
@@ -124,6 +141,7 @@ def interactive_prompt(cnf: dict) -> dict:
         ("DATABASE_HOST", "Database Host", "localhost"),
         ("DATABASE_PORT", "Database Port", "5432"),
         ("TIME_ZONE", "Time Zone", "UTC"),
+        ("SESSION_BACKEND", "Session Storage (db, cache, cached_db)", "cached_db"),
 
         # Required admin fields — no default allowed
         ("ADMIN_USERNAME", "Superuser Username (Required)", None),
@@ -154,11 +172,16 @@ def interactive_prompt(cnf: dict) -> dict:
                 print(f"❌ {label} is required.")
                 sys.exit(1)
 
+        if key == "SESSION_BACKEND" and value not in SESSION_BACKENDS:
+            print(f"❌ {label} must be one of: {', '.join(SESSION_BACKENDS)}.")
+            sys.exit(1)
+
         cnf["django"][key] = value
 
     cnf["django"]["STATIC_ROOT"] = str(VAR_DIR / "static")
     cnf["django"]["MEDIA_ROOT"] = str(VAR_DIR / "media")
     cnf["django"]["LOG_DIR"] = str(LOG_DIR)
+    cnf["django"]["ARCHIVE_DIR"] = str(VAR_DIR / "archive")
 
     return cnf
 
@@ -264,6 +287,11 @@ def assign_dynamic_config(cnf: dict) -> dict:
 
     cnf["celery"]["CELERY_BROKER_URL"] = broker_url
 
+    # Celery recycles its own pool children (after the current task) at the
+    # same threshold procmon applies to everything else; the option takes KiB.
+    max_rss_mb = int(cnf.get("procmon", {}).get("PROCMON_MAX_RSS_MB", 512))
+    cnf["celery"]["CELERY_MAX_MEMORY_PER_CHILD"] = str(max_rss_mb * 1024 if max_rss_mb else 0)
+
     allowed_hosts = cnf["django"].get("ALLOWED_HOSTS", "localhost,127.0.0.1")
     parsed_hosts = [d.strip() for d in allowed_hosts.replace(",", " ").split()]
 
@@ -320,11 +348,12 @@ def assign_dynamic_config(cnf: dict) -> dict:
         "REDIS_DB": redis_db,
         "REDIS_PASSWORD": cnf["redis"].get("REDIS_PASSWORD", ""),
         "CELERY_BROKER_URL": broker_url,
+        "EDGE_ADMIN_SOCKET": str(VAR_DIR / "socket/edge.sock"),
     })
 
     return cnf
 
-if __name__ == "__main__":
+def main():
     import argparse
 
     parser = argparse.ArgumentParser()
@@ -332,3 +361,6 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     configure(interactive=not args.non_interactive)
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,161 @@
-import sys
+import argparse
+import fcntl
+import os
+import signal
 import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 APP_ROOT = Path(__file__).resolve().parents[2]
 ETC_DIR = APP_ROOT / "etc"
 CERT_DIR = ETC_DIR / "ssl" / "certs"
+POOL_DIR = CERT_DIR / "dhparam-pool"
 CERT_DIR.mkdir(parents=True, exist_ok=True)
 
-def main():
-    bitdepth = 2048
-    overwrite = False
-
-    args = sys.argv[1:]
-    i = 0
-    while i < len(args):
-        if args[i] == "--overwrite":
-            overwrite = True
-        elif args[i] == "--bitdepth" and i + 1 < len(args):
-            i += 1
-            try:
-                bitdepth = int(args[i])
-            except ValueError:
-                sys.exit(f"Invalid bitdepth: {args[i]}")
-        i += 1
+DHPARAM_FILE = CERT_DIR / "dhparam.pem"
+LOCK_FILE = CERT_DIR / ".dhp.lock"
+
+# Included by ssl-params.conf. Until DH parameters exist nginx runs with
+# ECDHE-only suites, so it never has to wait for `openssl dhparam`.
+INCLUDE_FILE = ETC_DIR / "nginx" / "dhparam.conf"
+NGINX_PID_FILE = APP_ROOT / "opt" / "openresty" / "nginx" / "logs" / "nginx.pid"
 
-    dhparam_file = CERT_DIR / "dhparam.pem"
+ECDHE_CIPHERS = "ECDHE+AESGCM:ECDHE+CHACHA20"
+DHE_CIPHERS = f"{ECDHE_CIPHERS}:DHE+AESGCM:DHE+CHACHA20"
 
-    if overwrite and dhparam_file.exists():
-        dhparam_file.unlink()
+DEFAULT_BITDEPTH = 2048
+DEFAULT_POOL_SIZE = 2
 
-    if not dhparam_file.exists():
-        cmd = ["openssl", "dhparam", "-out", str(dhparam_file), str(bitdepth)]
-        subprocess.run(cmd, check=True)
-        print("✓ DH parameters generated.")
+def write_include(ready: bool):
+    if ready:
+        body = (
+            f"ssl_dhparam {DHPARAM_FILE};\n"
+            f"ssl_ciphers {DHE_CIPHERS};\n"
+        )
     else:
+        body = (
+            "# DH parameters are still being generated by bin/dhp; ECDHE only until then.\n"
+            f"ssl_ciphers {ECDHE_CIPHERS};\n"
+        )
+    if INCLUDE_FILE.exists() and INCLUDE_FILE.read_text() == body:
+        return False
+    tmp = INCLUDE_FILE.with_name(f".{INCLUDE_FILE.name}.tmp")
+    tmp.write_text(body)
+    os.replace(tmp, INCLUDE_FILE)
+    return True
+
+def ensure_include():
+    """Write the include for the current state if it is missing (used by bin/configure)."""
+    if not INCLUDE_FILE.exists():
+        write_include(DHPARAM_FILE.exists())
+
+def reload_nginx():
+    """SIGHUP a running nginx so it picks up the new include; a stopped one reads it at start."""
+    try:
+        pid = int(NGINX_PID_FILE.read_text().strip())
+        os.kill(pid, signal.SIGHUP)
+        print("✓ Reloaded nginx.")
+    except (OSError, ValueError):
+        pass
+
+def pool_entries(bitdepth: int) -> list[Path]:
+    return sorted(POOL_DIR.glob(f"dhparam-{bitdepth}-*.pem"), key=lambda p: p.stat().st_mtime)
+
+def generate(bitdepth: int) -> Path:
+    """Run one `openssl dhparam` into the pool directory and return the finished file."""
+    POOL_DIR.mkdir(parents=True, exist_ok=True)
+    target = POOL_DIR / f"dhparam-{bitdepth}-{uuid.uuid4().hex[:12]}.pem"
+    tmp = target.with_name(f".{target.name}.tmp")
+    try:
+        subprocess.run(
+            ["openssl", "dhparam", "-out", str(tmp), str(bitdepth)],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return target
+
+def install(params: Path):
+    os.replace(params, DHPARAM_FILE)
+    if write_include(True):
+        reload_nginx()
+    print(f"✓ DH parameters installed from {params.name}.")
+
+def take_from_pool(bitdepth: int) -> bool:
+    entries = pool_entries(bitdepth)
+    if not entries:
+        return False
+    install(entries[0])
+    return True
+
+def fill(bitdepth: int, pool_size: int, workers: int, install_first: bool):
+    """
+    Generate the missing parameter sets concurrently (openssl dhparam is
+    single-threaded, so each set gets its own core). When `install_first` is
+    set the first set to finish becomes dhparam.pem; the rest stay pooled.
+    """
+    needed = max(0, pool_size - len(pool_entries(bitdepth))) + (1 if install_first else 0)
+    if not needed:
+        print("...dhp pool is full. skipping...")
+        return
+
+    print(f"Generating {needed} x {bitdepth}-bit DH parameter sets on {min(workers, needed)} cores...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(workers, needed)) as pool:
+        futures = [pool.submit(generate, bitdepth) for _ in range(needed)]
+        for future in as_completed(futures):
+            try:
+                params = future.result()
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"❌ openssl dhparam failed: {e}", file=sys.stderr)
+                continue
+            if install_first:
+                install(params)
+                install_first = False
+    print(f"✓ DH parameter pool refilled in {time.perf_counter() - started:.0f}s.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Diffie-Hellman parameters for nginx.")
+    parser.add_argument("--overwrite", action="store_true", help="Replace the current dhparam.pem")
+    parser.add_argument("--bitdepth", type=int, default=DEFAULT_BITDEPTH, help=f"Prime size in bits (default {DEFAULT_BITDEPTH})")
+    parser.add_argument("--background", action="store_true",
+                        help="Refill the pool at low CPU priority and keep a pool by default; nginx runs ECDHE-only meanwhile")
+    parser.add_argument("--pool", type=int, default=None,
+                        help=f"Spare parameter sets to keep (default {DEFAULT_POOL_SIZE} with --background, else 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Concurrent openssl processes (default: CPU count)")
+    args = parser.parse_args()
+    pool_size = args.pool if args.pool is not None else (DEFAULT_POOL_SIZE if args.background else 0)
+
+    lock = open(LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("...dhp is already running. skipping...")
+        return
+
+    if DHPARAM_FILE.exists() and not args.overwrite:
         print("...dhp file already exists. skipping...")
+        if write_include(True):
+            reload_nginx()
+        missing = False
+    else:
+        # A pooled set makes --overwrite and fresh hosts instant.
+        missing = not take_from_pool(args.bitdepth)
+
+    if missing:
+        if write_include(False):
+            reload_nginx()
+        if args.overwrite:
+            DHPARAM_FILE.unlink(missing_ok=True)
+
+    if missing or pool_size:
+        if args.background:
+            os.nice(10)  # keep openssl from competing with gunicorn and nginx at startup
+        fill(args.bitdepth, pool_size, args.workers, install_first=missing)
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 
+import hashlib
+import os
+import platform
+import sys
 import subprocess
 import tarfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 PYTHON_VERSION = "3.13.3"
@@ -18,12 +25,62 @@ PYTHON_TARBALL = OPT_DIR / f"Python-{PYTHON_VERSION}.tgz"
 OPENRESTY_TARBALL = OPT_DIR / f"openresty-{OPENRESTY_VERSION}.tar.gz"
 OPENSSL_TARBALL = OPT_DIR / f"openssl-{OPENSSL_VERSION}.tar.gz"
 
+# Built trees are archived here keyed by version, build flags and platform,
+# so a reinstall (or a new node sharing LICMAN_ARTIFACT_CACHE) skips compiling.
+ARTIFACT_CACHE_DIR = Path(os.getenv("LICMAN_ARTIFACT_CACHE", BASE_DIR / "var" / "cache" / "install"))
+LOG_DIR = BASE_DIR / "var" / "log" / "install"
+
+# Step dependencies; declaration order is also the serial execution order.
+STEPS = {
+    "system":    [],
+    "python":    ["system"],
+    "node":      ["system"],
+    "openresty": ["system"],
+    "openssl":   ["system"],
+    "build":     ["node"],
+    "cleanup":   ["python", "openresty", "openssl"],
+}
+
+# Steps that keep the terminal (sudo prompts); everything else depends on them anyway.
+FOREGROUND_STEPS = {"system"}
+
+_output = threading.local()
+
 def run(cmd, cwd=None, shell=False):
-    print(f"→ {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-    result = subprocess.run(cmd, cwd=cwd, shell=shell)
+    line = f"→ {' '.join(cmd) if isinstance(cmd, list) else cmd}"
+    log = getattr(_output, "log", None)
+    if log:
+        print(f"[{_output.step}] {line}")
+        log.write(f"{line}\n")
+        log.flush()
+    else:
+        print(line)
+    result = subprocess.run(cmd, cwd=cwd, shell=shell, stdout=log, stderr=subprocess.STDOUT if log else None)
     if result.returncode != 0:
         raise RuntimeError(f"❌ Command failed: {cmd}")
 
+def artifact_path(name: str, version: str, flags: list[str]) -> Path:
+    key = "\0".join([version, platform.machine(), *platform.libc_ver(), *flags])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    return ARTIFACT_CACHE_DIR / f"{name}-{version}-{digest}.tar.gz"
+
+def restore_artifact(artifact: Path, install_dir: Path) -> bool:
+    if not artifact.exists():
+        return False
+    print(f"♻️ Restoring {install_dir.name} from cached build {artifact.name}")
+    run(["tar", "-xzf", str(artifact), "-C", str(install_dir.parent)])
+    return True
+
+def save_artifact(artifact: Path, install_dir: Path):
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    tmp = artifact.with_name(f".{artifact.name}.{os.getpid()}.tmp")
+    print(f"Caching {install_dir.name} build as {artifact.name}")
+    try:
+        run(["tar", "-czf", str(tmp), "-C", str(install_dir.parent), install_dir.name])
+        os.replace(tmp, artifact)
+    finally:
+        tmp.unlink(missing_ok=True)
+
 def install_system_packages():
     system_packages = [
         "build-essential", "libssl-dev", "zlib1g-dev",
@@ -53,10 +110,12 @@ def install_system_packages():
     else:
         print("✅ All system packages already installed.")
 
-def install_python(force=False):
+def install_python(force=False, cache=True):
     install_dir = OPT_DIR / "python"
     python_bin = install_dir / "bin/python3"
     venv_dir = OPT_DIR / "venv"
+    configure_flags = [f"--prefix={install_dir}"]
+    artifact = artifact_path("python", PYTHON_VERSION, configure_flags)
 
     if python_bin.exists() and not force:
         print("✅ Python already installed.")
@@ -65,16 +124,19 @@ def install_python(force=False):
             print(f"🗑️ Removing existing Python install at {install_dir}")
             run(["rm", "-rf", str(install_dir)])
 
-        build_dir = OPT_DIR / f"Python-{PYTHON_VERSION}"
-        if build_dir.exists():
-            run(["rm", "-rf", str(build_dir)])
+        if not (cache and restore_artifact(artifact, install_dir)):
+            build_dir = OPT_DIR / f"Python-{PYTHON_VERSION}"
+            if build_dir.exists():
+                run(["rm", "-rf", str(build_dir)])
 
-        with tarfile.open(PYTHON_TARBALL) as tar:
-            tar.extractall(OPT_DIR)
+            with tarfile.open(PYTHON_TARBALL) as tar:
+                tar.extractall(OPT_DIR)
 
-        run(["./configure", f"--prefix={install_dir}"], cwd=build_dir)
-        run(["make", "-j4"], cwd=build_dir)
-        run(["make", "install"], cwd=build_dir)
+            run(["./configure", *configure_flags], cwd=build_dir)
+            run(["make", "-j4"], cwd=build_dir)
+            run(["make", "install"], cwd=build_dir)
+            if cache:
+                save_artifact(artifact, install_dir)
 
     if venv_dir.exists() and not force:
         print("✅ Virtual environment already exists.")
@@ -143,8 +205,18 @@ def build_frontend():
         npm run build
     """])
 
-def install_openresty(force=False):
+def install_openresty(force=False, cache=True):
     install_dir = OPT_DIR / "openresty"
+    configure_flags = [
+        f"--prefix={install_dir}",
+        "--with-pcre-jit",
+        "--with-ipv6",
+        "--with-http_iconv_module",
+        "--with-http_realip_module",
+        "--with-http_ssl_module",
+        "--with-http_gzip_static_module"
+    ]
+    artifact = artifact_path("openresty", OPENRESTY_VERSION, configure_flags)
 
     if install_dir.exists() and not force:
         print("✅ OpenResty already installed.")
@@ -157,6 +229,9 @@ def install_openresty(force=False):
         print(f"🗑️ Removing existing OpenResty install at {install_dir}")
         run(["rm", "-rf", str(install_dir)])
 
+    if cache and restore_artifact(artifact, install_dir):
+        return
+
     print("Building OpenResty...")
     run(["tar", "-xzf", str(OPENRESTY_TARBALL), "-C", str(OPT_DIR)])
 
@@ -167,21 +242,17 @@ def install_openresty(force=False):
     if not source_dir:
         raise FileNotFoundError("❌ Could not find extracted OpenResty source directory.")
 
-    run([
-        "./configure",
-        f"--prefix={install_dir}",
-        "--with-pcre-jit",
-        "--with-ipv6",
-        "--with-http_iconv_module",
-        "--with-http_realip_module",
-        "--with-http_ssl_module"
-    ], cwd=source_dir)
+    run(["./configure", *configure_flags], cwd=source_dir)
 
     run(["make", "-j4"], cwd=source_dir)
     run(["make", "install"], cwd=source_dir)
+    if cache:
+        save_artifact(artifact, install_dir)
 
-def install_openssl(force=False):
+def install_openssl(force=False, cache=True):
     install_dir = OPT_DIR / "openssl"
+    configure_flags = [f"--prefix={install_dir}", "enable-ec_nistp_64_gcc_128", "no-shared"]
+    artifact = artifact_path("openssl", OPENSSL_VERSION, configure_flags)
 
     if install_dir.exists() and not force:
         print("✅ OpenSSL already installed.")
@@ -191,6 +262,9 @@ def install_openssl(force=False):
         print(f"🗑️ Removing existing OpenSSL install at {install_dir}")
         run(["rm", "-rf", str(install_dir)])
 
+    if cache and restore_artifact(artifact, install_dir):
+        return
+
     if not OPENSSL_TARBALL.exists():
         raise FileNotFoundError(f"❌ OpenSSL tarball not found at {OPENSSL_TARBALL}")
 
@@ -202,14 +276,15 @@ def install_openssl(force=False):
         raise FileNotFoundError("❌ Could not find extracted OpenSSL source directory.")
 
     print("Configuring OpenSSL build...")
-    run(["./Configure", f"--prefix={install_dir}", "enable-ec_nistp_64_gcc_128", "no-shared"],
-        cwd=source_dir)
+    run(["./Configure", *configure_flags], cwd=source_dir)
 
     print("Building OpenSSL...")
     run(["make", "-j4"], cwd=source_dir)
 
     print("Installing OpenSSL...")
     run(["make", "install_sw"], cwd=source_dir)
+    if cache:
+        save_artifact(artifact, install_dir)
 
 def cleanup():
     print("🧹 Cleaning build directories...")
@@ -222,9 +297,14 @@ def parse_options(argv):
     all = {"system", "python", "node", "openresty", "build", "cleanup"}
     selected = {k: True for k in all}
     exclusive = False
+    options = {"cache": True, "parallel": True}
 
     for arg in argv:
-        if arg.startswith("--skip-"):
+        if arg == "--no-cache":
+            options["cache"] = False
+        elif arg == "--serial":
+            options["parallel"] = False
+        elif arg.startswith("--skip-"):
             selected[arg[7:]] = False
         elif arg.startswith("--"):
             component = arg[2:]
@@ -233,18 +313,74 @@ def parse_options(argv):
                 selected[component] = True
                 exclusive = True
 
-    return selected, exclusive
+    return selected, exclusive, options
+
+def run_step(name: str, func, log_to_file: bool):
+    started = time.perf_counter()
+    if log_to_file:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        log_path = LOG_DIR / f"{name}.log"
+        print(f"▶ {name} started (output in {log_path})")
+        with open(log_path, "w") as log:
+            _output.log, _output.step = log, name
+            try:
+                func()
+            except Exception as e:
+                raise RuntimeError(f"{e} (see {log_path})") from e
+            finally:
+                _output.log = None
+    else:
+        func()
+    print(f"✓ {name} finished in {time.perf_counter() - started:.0f}s")
+
+def schedule(components: dict, parallel: bool = True):
+    """
+    Run each component once the components it depends on have finished.
+    Dependencies that were not selected count as satisfied. After a failure
+    nothing new is started; running steps finish and the first error is raised.
+    """
+    if not parallel:
+        for name, func in components.items():
+            run_step(name, func, log_to_file=False)
+        return
 
-def install(selected: dict, exclusive_mode: bool):
+    pending = dict(components)
+    done = set()
+    failure = None
+    with ThreadPoolExecutor(max_workers=len(components) or 1) as pool:
+        running = {}
+        while pending or running:
+            if failure is None:
+                for name in list(pending):
+                    if all(dep in done or dep not in components for dep in STEPS[name]):
+                        func = pending.pop(name)
+                        running[pool.submit(run_step, name, func, name not in FOREGROUND_STEPS)] = name
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    future.result()
+                    done.add(name)
+                except Exception as e:
+                    print(f"❌ {name} failed: {e}")
+                    failure = failure or e
+    if failure is not None:
+        raise failure
+
+def install(selected: dict, exclusive_mode: bool, cache: bool = True, parallel: bool = True):
     components = {
         "system": 		install_system_packages,
-        "python": 		lambda: install_python(force=exclusive_mode),
+        "python": 		lambda: install_python(force=exclusive_mode, cache=cache),
         "node": 		lambda: install_node(force=exclusive_mode),
-        "openresty": 	lambda: install_openresty(force=exclusive_mode),
-        "openssl": 		lambda: install_openssl(force=exclusive_mode),
+        "openresty": 	lambda: install_openresty(force=exclusive_mode, cache=cache),
+        "openssl": 		lambda: install_openssl(force=exclusive_mode, cache=cache),
         "build": 		build_frontend,
         "cleanup": 		cleanup,
     }
-    for name, func in components.items():
-        if selected.get(name, True):
-            func()
+    schedule({name: func for name, func in components.items() if selected.get(name, True)}, parallel=parallel)
+
+def main():
+    selected, exclusive_mode, options = parse_options(sys.argv[1:])
+    install(selected, exclusive_mode, **options)
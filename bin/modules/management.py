@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parents[2]
+SRC_DIR = APP_ROOT / "src"
+MANAGE_PY = SRC_DIR / "backend" / "manage.py"
+VENV_PYTHON = APP_ROOT / "opt" / "venv" / "bin" / "python"
+
+def setup():
+    """
+    Prepare this interpreter to run Django the way manage.py would: `src` for
+    the `backend.*` packages and `src/backend` for the project-relative ones.
+    """
+    for path in (SRC_DIR / "backend", SRC_DIR):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.config.settings")
+
+    import django
+    django.setup()
+
+def django_available() -> bool:
+    try:
+        import django  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def call(command: str, *args: str):
+    """
+    Run a Django management command in-process when Django is importable
+    (i.e. we are already running inside the venv), otherwise fall back to a
+    manage.py subprocess. Raises on failure either way.
+    """
+    if not django_available():
+        if not MANAGE_PY.exists():
+            raise FileNotFoundError(f"manage.py not found at: {MANAGE_PY}")
+        subprocess.run([str(VENV_PYTHON), str(MANAGE_PY), command, *args], check=True)
+        return
+
+    setup()
+    from django.core.management import call_command
+    call_command(command, *args)
+
+def cli():
+    """Entry point for `licman manage <command> [args]`: manage.py, without the extra interpreter."""
+    setup()
+    from django.core.management import execute_from_command_line
+    execute_from_command_line(["licman manage", *sys.argv[1:]])
@@ -1,12 +1,17 @@
-import subprocess
+import sys
 from pathlib import Path
 
 APP_ROOT = Path(__file__).resolve().parents[2]
-SRC_DIR = APP_ROOT / "src"
-MANAGE_PY = SRC_DIR / "backend" / "manage.py"
+BIN_DIR = APP_ROOT / "bin"
 
-if not MANAGE_PY.exists():
-    raise FileNotFoundError(f"manage.py not found at: {MANAGE_PY}")
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
 
-# Assume wrapper has already set interpreter, PYTHONPATH, and environment
-subprocess.run(["python", str(MANAGE_PY), "migrate"], check=True)
+from modules import management
+
+def main():
+    # Assume wrapper has already set interpreter, PYTHONPATH, and environment
+    management.call("migrate", *sys.argv[1:])
+
+if __name__ == "__main__":
+    main()
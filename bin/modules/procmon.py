@@ -0,0 +1,215 @@
+"""
+Supervisor event listener that samples gunicorn and Celery processes.
+
+Subscribed to TICK_5, it walks each monitored program's process tree in /proc
+and records RSS, CPU and open file descriptors to var/run/procmon-<name>.json.
+A process whose RSS stays above --max-rss-mb for --grace consecutive samples
+is recycled gracefully before the OOM killer gets to it:
+
+  * gunicorn workers get SIGTERM; they finish their request and the master
+    forks a replacement.
+  * a bloated program master (gunicorn arbiter, Celery main process) is
+    restarted through supervisor, which sends its stopsignal (TERM: warm
+    shutdown for Celery) and waits for it to exit.
+
+Celery pool children are recycled by Celery itself (--max-memory-per-child,
+set from the same threshold) once their current task completes, since
+killing them from outside would lose the task.
+
+Only the event protocol may be written to stdout; everything else goes to stderr.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+from supervisor import childutils
+
+APP_ROOT = Path(__file__).resolve().parents[2]
+RUN_DIR = APP_ROOT / "var" / "run"
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+# Programs whose workers can be recycled individually, and the signal that does it gracefully.
+WORKER_RECYCLE_SIGNALS = {
+    "gunicorn": signal.SIGTERM,
+    "asgi": signal.SIGTERM,  # uvicorn respawns it; SSE clients resume from Last-Event-ID
+}
+
+def log(message: str):
+    sys.stderr.write(f"{message}\n")
+    sys.stderr.flush()
+
+def read_stat(pid: int):
+    """(ppid, cpu ticks, start time) from /proc/<pid>/stat, or None if the process is gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[19])
+
+def read_rss(pid: int) -> int:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+def count_fds(pid: int) -> int | None:
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None  # not ours to inspect
+
+def children_by_parent() -> dict[int, list[int]]:
+    tree = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        stat = read_stat(int(entry.name))
+        if stat:
+            tree.setdefault(stat[0], []).append(int(entry.name))
+    return tree
+
+def descendants(pid: int, tree: dict) -> list[int]:
+    found, stack = [], list(tree.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(tree.get(child, []))
+    return found
+
+class ProcessMonitor:
+    def __init__(self, rpc, name: str, programs: set, max_rss: int, grace: int):
+        self.rpc = rpc
+        self.programs = programs
+        self.max_rss = max_rss
+        self.grace = grace
+        self.metrics_file = RUN_DIR / f"procmon-{name}.json"
+        # (pid, start time) -> (cpu ticks, monotonic time); start time guards against pid reuse
+        self._cpu = {}
+        self._over = {}
+
+    def sample(self, pid: int, program: str, role: str, now: float):
+        stat = read_stat(pid)
+        if stat is None:
+            return None
+        _, ticks, started = stat
+        key = (pid, started)
+        try:
+            rss = read_rss(pid)
+        except OSError:
+            return None
+
+        previous = self._cpu.get(key)
+        self._cpu[key] = (ticks, now)
+        cpu = None
+        if previous and now > previous[1]:
+            cpu = round(100 * (ticks - previous[0]) / CLK_TCK / (now - previous[1]), 1)
+
+        over = self._over.get(key, 0) + 1 if self.max_rss and rss > self.max_rss else 0
+        self._over[key] = over
+        return {
+            "program": program,
+            "pid": pid,
+            "role": role,
+            "rss_mb": round(rss / 1048576, 1),
+            "cpu_percent": cpu,
+            "fds": count_fds(pid),
+            "over_limit_samples": over,
+            "_key": key,
+        }
+
+    def collect(self) -> list[dict]:
+        now = time.monotonic()
+        tree = children_by_parent()
+        samples = []
+        for info in self.rpc.supervisor.getAllProcessInfo():
+            if info["group"] not in self.programs or not info["pid"]:
+                continue
+            master = self.sample(info["pid"], info["group"], "master", now)
+            if master is None:
+                continue
+            master["process"] = f"{info['group']}:{info['name']}"
+            samples.append(master)
+            for pid in descendants(info["pid"], tree):
+                worker = self.sample(pid, info["group"], "worker", now)
+                if worker is not None:
+                    samples.append(worker)
+
+        live = {s["_key"] for s in samples}
+        self._cpu = {k: v for k, v in self._cpu.items() if k in live}
+        self._over = {k: v for k, v in self._over.items() if k in live}
+        return samples
+
+    def recycle(self, samples: list[dict]):
+        restarted = set()
+        for s in samples:
+            if s["over_limit_samples"] < self.grace or s["program"] in restarted:
+                continue
+            if s["role"] == "worker":
+                sig = WORKER_RECYCLE_SIGNALS.get(s["program"])
+                if sig is None:
+                    continue
+                log(f"procmon: recycling {s['program']} worker {s['pid']} at {s['rss_mb']} MB RSS")
+                try:
+                    os.kill(s["pid"], sig)
+                except ProcessLookupError:
+                    pass
+            else:
+                log(f"procmon: restarting {s['process']} (pid {s['pid']}) at {s['rss_mb']} MB RSS")
+                self.rpc.supervisor.stopProcess(s["process"], True)
+                self.rpc.supervisor.startProcess(s["process"], False)
+                restarted.add(s["program"])  # its workers went with it
+            s["recycled"] = True
+            self._over.pop(s["_key"], None)
+
+    def write(self, samples: list[dict]):
+        RUN_DIR.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "updated": time.time(),
+            "max_rss_mb": self.max_rss // 1048576,
+            "processes": [{k: v for k, v in s.items() if k != "_key"} for s in samples],
+        }
+        tmp = self.metrics_file.with_name(f".{self.metrics_file.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2))
+        os.replace(tmp, self.metrics_file)
+
+    def tick(self):
+        samples = self.collect()
+        self.recycle(samples)
+        self.write(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Supervisor event listener: process metrics and memory-bloat recycling.")
+    parser.add_argument("--name", default="web", help="Metrics file suffix (var/run/procmon-<name>.json)")
+    parser.add_argument("--programs", default="gunicorn,celery", help="Comma-separated supervisor program names to monitor")
+    parser.add_argument("--max-rss-mb", type=int, default=512, help="Recycle processes above this RSS (0 disables recycling)")
+    parser.add_argument("--grace", type=int, default=3, help="Consecutive samples over the limit before recycling")
+    args = parser.parse_args()
+
+    if "SUPERVISOR_SERVER_URL" not in os.environ:
+        sys.exit("procmon must be run as a supervisor [eventlistener].")
+
+    monitor = ProcessMonitor(
+        childutils.getRPCInterface(os.environ),
+        args.name,
+        {p.strip() for p in args.programs.split(",") if p.strip()},
+        args.max_rss_mb * 1048576,
+        max(1, args.grace),
+    )
+
+    while True:
+        headers, _ = childutils.listener.wait(sys.stdin, sys.stdout)
+        if headers["eventname"].startswith("TICK"):
+            try:
+                monitor.tick()
+            except Exception as e:  # a bad sample must never wedge the listener
+                log(f"procmon: {type(e).__name__}: {e}")
+        childutils.listener.ok(sys.stdout)
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,26 @@
-import subprocess
+import sys
 from pathlib import Path
 
 APP_ROOT = Path(__file__).resolve().parents[2]
 BIN_DIR = APP_ROOT / "bin"
-SRC_DIR = APP_ROOT / "src"
-VENV_PYTHON = APP_ROOT / "opt" / "venv" / "bin" / "python"
+
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from modules import management
 
 def seed():
     print("Running seed routines...\n")
 
     seeds = [
-        ("Initialize groups", [str(VENV_PYTHON), str(SRC_DIR / "backend/manage.py"), "init_groups"]),
+        ("Initialize groups", ["init_groups"]),
     ]
 
     for label, command in seeds:
         print(f"→ {label}")
         try:
-            subprocess.run(command, check=True)
-        except subprocess.CalledProcessError as e:
+            management.call(*command)
+        except Exception as e:
             print(f"✗ Failed: {label}\n  Error: {e}")
             break
         else:
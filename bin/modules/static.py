@@ -1,22 +1,158 @@
-import subprocess
+import argparse
+import gzip
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings are produced without it
+    brotli = None
+
 APP_ROOT = Path(__file__).resolve().parents[2]
+BIN_DIR = APP_ROOT / "bin"
 SRC_DIR = APP_ROOT / "src"
 ENV_FILE = SRC_DIR / ".env"
-VENV_PYTHON = APP_ROOT / "opt" / "venv" / "bin" / "python"
+
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from modules import management
 
 load_dotenv(dotenv_path=ENV_FILE)
 
+STATIC_ROOT = Path(os.getenv("STATIC_ROOT", APP_ROOT / "var" / "static"))
+WEB_ROOT = APP_ROOT / "var" / "www" / "html"
+# Assets whose .gz/.br would not be smaller than the source, so none is
+# written: {path: [mtime_ns, [suffixes]]}. Lets incremental runs skip them.
+MANIFEST = APP_ROOT / "var" / "cache" / "precompress.json"
+
+# Only text-like assets benefit; images and fonts like woff2 are already compressed.
+COMPRESSIBLE_EXTENSIONS = {
+    ".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml",
+    ".ico", ".ttf", ".otf", ".eot", ".wasm",
+}
+MIN_SIZE = 1000  # matches gzip_min_length in nginx.conf
+
 def collect_static():
-    cmd = [
-        str(VENV_PYTHON),
-        str(SRC_DIR / "backend/manage.py"),
-        "collectstatic",
-        "--noinput"
-    ]
-    subprocess.run(cmd, check=True)
+    management.call("collectstatic", "--noinput")
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_manifest(manifest: dict):
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST.with_name(f".{MANIFEST.name}.tmp")
+    tmp.write_text(json.dumps(manifest, sort_keys=True))
+    os.replace(tmp, MANIFEST)
+
+def find_compressible(roots, incremental: bool, manifest: dict | None = None):
+    """
+    Yield assets that need (re)compressing. In incremental mode an asset is
+    skipped when every sibling exists with the source's mtime, which is
+    stamped onto the siblings when they are written, or is recorded in the
+    manifest as not worth writing for that mtime.
+    """
+    manifest = manifest or {}
+    suffixes = [".gz"] + ([".br"] if brotli else [])
+    for root in roots:
+        if not root.is_dir():
+            continue
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                path = Path(dirpath) / name
+                if path.suffix not in COMPRESSIBLE_EXTENSIONS:
+                    continue
+                stat = path.stat()
+                if stat.st_size < MIN_SIZE:
+                    continue
+                mtime_ns, skipped = manifest.get(str(path), (None, []))
+                if incremental and all(
+                    _sibling_is_current(path, suffix, stat) or (suffix in skipped and mtime_ns == stat.st_mtime_ns)
+                    for suffix in suffixes
+                ):
+                    continue
+                yield path
+
+def _sibling_is_current(path: Path, suffix: str, stat) -> bool:
+    try:
+        return os.stat(f"{path}{suffix}").st_mtime_ns == stat.st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def _write_sibling(path: Path, suffix: str, data: bytes, stat):
+    target = Path(f"{path}{suffix}")
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.write_bytes(data)
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp, target)
+
+def _skip_sibling(path: Path, suffix: str, skipped: list):
+    # A sibling left from an older version of the asset would be served instead of it.
+    Path(f"{path}{suffix}").unlink(missing_ok=True)
+    skipped.append(suffix)
+
+def compress_file(path: Path):
+    """
+    Write .gz (and .br when brotli is available) next to `path`. Returns
+    (path, mtime_ns, bytes saved by gzip, suffixes not written because they
+    would not be smaller).
+    """
+    stat = path.stat()
+    data = path.read_bytes()
+    skipped = []
+
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        _write_sibling(path, ".gz", gz, stat)
+    else:
+        _skip_sibling(path, ".gz", skipped)
+
+    if brotli:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            _write_sibling(path, ".br", br, stat)
+        else:
+            _skip_sibling(path, ".br", skipped)
+
+    return path, stat.st_mtime_ns, max(0, len(data) - len(gz)), skipped
+
+def compress_static(incremental: bool = False, workers: int | None = None):
+    manifest = load_manifest() if incremental else {}
+    paths = list(find_compressible([STATIC_ROOT, WEB_ROOT], incremental, manifest))
+    if not paths:
+        print("...static assets already compressed. skipping...")
+        return
+
+    print(f"Compressing {len(paths)} static assets{'' if brotli else ' (gzip only; brotli not installed)'}...")
+    saved = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, mtime_ns, path_saved, skipped in pool.map(compress_file, paths, chunksize=8):
+            saved += path_saved
+            if skipped:
+                manifest[str(path)] = [mtime_ns, skipped]
+            else:
+                manifest.pop(str(path), None)
+    # Forget assets that no longer exist, so the manifest does not grow forever.
+    save_manifest({path: entry for path, entry in manifest.items() if os.path.exists(path)})
+    print(f"✓ Compressed {len(paths)} assets, {saved // 1024} KiB saved by gzip.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect, hash and precompress static assets.")
+    parser.add_argument("--incremental", action="store_true", help="Only recompress assets that changed since the last run")
+    parser.add_argument("--no-collect", action="store_true", help="Skip collectstatic and only compress")
+    parser.add_argument("--workers", type=int, default=None, help="Compression worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not args.no_collect:
+        collect_static()
+    compress_static(incremental=args.incremental, workers=args.workers)
 
 if __name__ == "__main__":
-    collect_static()
+    main()
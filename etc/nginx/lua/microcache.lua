@@ -0,0 +1,182 @@
+-- Micro-cache for idempotent GET /api/ responses.
+--
+-- Entries are keyed by the caller's identity (Authorization header or session
+-- cookie), the request URI and the Accept header, and live for a few seconds.
+-- Concurrent misses for the same key are coalesced behind a resty.lock so only
+-- one request reaches gunicorn. Django purges by bumping a generation counter
+-- (globally or per API resource) through the admin socket, which makes every
+-- older key unreachable without scanning the dictionary.
+
+local resty_lock = require "resty.lock"
+local cjson = require "cjson.safe"
+
+local cache = ngx.shared.api_microcache
+local meta = ngx.shared.api_microcache_meta
+
+local LOCK_DICT = "api_microcache_locks"
+local DEFAULT_TTL = 5
+local MAX_BODY_SIZE = 512 * 1024
+
+local _M = {}
+
+local function identity()
+  local auth = ngx.var.http_authorization
+  if auth and auth ~= "" then
+    return auth
+  end
+  local session = ngx.var.cookie_sessionid
+  if session and session ~= "" then
+    return "session:" .. session
+  end
+  return nil
+end
+
+-- /api/licenses/12/ -> "licenses"
+local function scope_of(uri)
+  return uri:match("^/api/([^/]+)") or ""
+end
+
+local function generation(scope)
+  return meta:get("gen:" .. scope) or 0
+end
+
+local function cache_key(id)
+  return table.concat({
+    generation("*"),
+    generation(scope_of(ngx.var.uri)),
+    ngx.md5(id),
+    ngx.var.request_uri,
+    ngx.var.http_accept or "",
+  }, "|")
+end
+
+local function serve(entry)
+  local data = cjson.decode(entry)
+  if not data then
+    return
+  end
+  ngx.status = data.status
+  ngx.header["Content-Type"] = data.content_type
+  ngx.header["X-Micro-Cache"] = "HIT"
+  ngx.print(data.body)
+  return ngx.exit(data.status)
+end
+
+local function bypass()
+  ngx.ctx.microcache = "BYPASS"
+end
+
+function _M.access()
+  if ngx.req.get_method() ~= "GET" then
+    return
+  end
+
+  local id = identity()
+  if not id or ngx.var.http_cache_control == "no-cache" then
+    return bypass()
+  end
+
+  local key = cache_key(id)
+  local entry = cache:get(key)
+  if entry then
+    return serve(entry)
+  end
+
+  -- Coalesce concurrent misses: the first request fills, the others wait on
+  -- the lock and are then answered from the entry it stored.
+  local lock = resty_lock:new(LOCK_DICT, { exptime = 30, timeout = 5 })
+  if not lock or not lock:lock(key) then
+    return bypass()
+  end
+
+  entry = cache:get(key)
+  if entry then
+    lock:unlock()
+    return serve(entry)
+  end
+
+  ngx.ctx.microcache = "MISS"
+  ngx.ctx.microcache_key = key
+  ngx.ctx.microcache_lock = lock
+end
+
+function _M.header_filter()
+  local ctx = ngx.ctx
+  if not ctx.microcache then
+    return
+  end
+
+  local ttl = tonumber(ngx.header["X-Micro-Cache-TTL"] or ngx.var.microcache_ttl) or DEFAULT_TTL
+  ngx.header["X-Micro-Cache-TTL"] = nil
+  ngx.header["X-Micro-Cache"] = ctx.microcache
+
+  if not ctx.microcache_key then
+    return
+  end
+
+  local cache_control = ngx.header["Cache-Control"] or ""
+  if type(cache_control) == "table" then
+    cache_control = table.concat(cache_control, ",")
+  end
+
+  if ngx.status ~= ngx.HTTP_OK
+    or ttl <= 0
+    or ngx.header["Set-Cookie"]
+    or cache_control:find("no-store", 1, true)
+    or cache_control:find("private", 1, true) then
+    ctx.microcache_key = nil
+    return
+  end
+
+  ctx.microcache_ttl = ttl
+  ctx.microcache_content_type = ngx.header["Content-Type"]
+  ctx.microcache_chunks = {}
+  ctx.microcache_size = 0
+end
+
+function _M.body_filter()
+  local ctx = ngx.ctx
+  if not ctx.microcache_chunks then
+    return
+  end
+
+  local chunk, eof = ngx.arg[1], ngx.arg[2]
+  ctx.microcache_size = ctx.microcache_size + #chunk
+  if ctx.microcache_size > MAX_BODY_SIZE then
+    ctx.microcache_chunks = nil
+    return
+  end
+  ctx.microcache_chunks[#ctx.microcache_chunks + 1] = chunk
+
+  if eof then
+    local entry = cjson.encode({
+      status = ngx.status,
+      content_type = ctx.microcache_content_type,
+      body = table.concat(ctx.microcache_chunks),
+    })
+    if entry then
+      cache:set(ctx.microcache_key, entry, ctx.microcache_ttl)
+    end
+    ctx.microcache_chunks = nil
+  end
+end
+
+function _M.log()
+  local lock = ngx.ctx.microcache_lock
+  if lock then
+    lock:unlock()
+  end
+end
+
+-- POST /microcache/purge[?scope=licenses] on the admin socket.
+function _M.purge()
+  local scope = ngx.var.arg_scope
+  if not scope or scope == "" then
+    scope = "*"
+  end
+  local gen = meta:incr("gen:" .. scope, 1, 0)
+  ngx.header["Content-Type"] = "application/json"
+  ngx.say(cjson.encode({ scope = scope, generation = gen }))
+end
+
+return _M
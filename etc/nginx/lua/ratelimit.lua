@@ -0,0 +1,134 @@
+-- Per-identity sliding-window rate limiting and daily quotas for /api/.
+--
+-- Callers presenting a DRF token Django has synced are identified by its SHA-1.
+-- Everyone else is counted by address: the edge cannot tell a made-up token or
+-- session cookie from a real one, so a fresh credential must not mean a fresh
+-- bucket. Requests carrying a session cookie get the session rate for their
+-- address, the rest the anonymous one. The request rate is estimated with a
+-- sliding window over two fixed one-minute buckets; daily quotas are counted
+-- per UTC day. Excess traffic is rejected with 429 before it reaches gunicorn.
+--
+-- Limits live in the api_limits dict and are pushed by Django
+-- (`manage.py sync_edge_limits`, also run periodically by Celery beat, and
+-- whenever a token or quota changes) to POST /ratelimit/limits on the admin
+-- socket. Until the first sync, the built-in defaults below apply and every
+-- token is counted by address.
+
+local cjson = require "cjson.safe"
+local to_hex = require("resty.string").to_hex
+
+local counters = ngx.shared.api_ratelimit
+local limits = ngx.shared.api_limits
+
+local WINDOW = 60
+local DAY = 86400
+
+-- kind -> { requests per minute, requests per day (0 = unlimited) }
+local DEFAULT_LIMITS = {
+  token = { 600, 100000 },
+  session = { 600, 0 },
+  anonymous = { 60, 0 },
+}
+
+local _M = {}
+
+-- "rate,quota" as stored by sync(), or nil.
+local function parse(value)
+  local rate, quota = (value or ""):match("^(%d+),(%d+)$")
+  if rate then
+    return tonumber(rate), tonumber(quota)
+  end
+end
+
+local function limits_for(kind)
+  local rate, quota = parse(limits:get("default:" .. kind))
+  if rate then
+    return rate, quota
+  end
+  local default = DEFAULT_LIMITS[kind]
+  return default[1], default[2]
+end
+
+-- Returns the counter key and the limits that apply to it.
+local function identify()
+  local auth = ngx.var.http_authorization
+  local token = auth and auth:match("^Token%s+(%S+)")
+  if token then
+    local id = to_hex(ngx.sha1_bin(token))
+    local rate, quota = parse(limits:get("id:" .. id))
+    if rate then
+      return id, rate, quota
+    end
+  end
+  local session = ngx.var.cookie_sessionid
+  local kind = (session and session ~= "") and "session" or "anonymous"
+  return ngx.var.binary_remote_addr, limits_for(kind)
+end
+
+local function reject(reason, retry_after, limit)
+  ngx.header["Retry-After"] = math.ceil(retry_after)
+  ngx.header["X-RateLimit-Limit"] = limit
+  ngx.header["X-RateLimit-Remaining"] = 0
+  ngx.header["Content-Type"] = "application/json"
+  ngx.status = ngx.HTTP_TOO_MANY_REQUESTS
+  ngx.say(cjson.encode({ detail = reason }))
+  return ngx.exit(ngx.HTTP_TOO_MANY_REQUESTS)
+end
+
+function _M.access()
+  local id, rate, quota = identify()
+  local now = ngx.now()
+
+  if rate > 0 then
+    local bucket = math.floor(now / WINDOW)
+    local elapsed = now - bucket * WINDOW
+    local previous = counters:get("r:" .. id .. ":" .. (bucket - 1)) or 0
+    local current = counters:get("r:" .. id .. ":" .. bucket) or 0
+    local estimate = previous * ((WINDOW - elapsed) / WINDOW) + current
+
+    if estimate >= rate then
+      return reject("Request rate limit exceeded.", WINDOW - elapsed, rate)
+    end
+
+    counters:incr("r:" .. id .. ":" .. bucket, 1, 0, WINDOW * 2)
+    ngx.header["X-RateLimit-Limit"] = rate
+    ngx.header["X-RateLimit-Remaining"] = math.max(0, math.floor(rate - estimate - 1))
+  end
+
+  if quota > 0 then
+    local day = math.floor(now / DAY)
+    local used = counters:incr("q:" .. id .. ":" .. day, 1, 0, DAY + WINDOW)
+    if used and used > quota then
+      return reject("Daily request quota exceeded.", (day + 1) * DAY - now, quota)
+    end
+  end
+end
+
+-- POST /ratelimit/limits on the admin socket. Body:
+--   { "defaults": { "token": [rate, quota], ... }, "identities": { "<sha1>": [rate, quota], ... } }
+-- The payload replaces every previously synced limit.
+function _M.sync()
+  ngx.req.read_body()
+  local payload = cjson.decode(ngx.req.get_body_data() or "")
+  if type(payload) ~= "table" then
+    ngx.status = ngx.HTTP_BAD_REQUEST
+    ngx.say(cjson.encode({ detail = "Invalid JSON payload." }))
+    return ngx.exit(ngx.HTTP_BAD_REQUEST)
+  end
+
+  limits:flush_all()
+  local count = 0
+  for kind, value in pairs(payload.defaults or {}) do
+    limits:set("default:" .. kind, value[1] .. "," .. value[2])
+  end
+  for id, value in pairs(payload.identities or {}) do
+    limits:set("id:" .. id, value[1] .. "," .. value[2])
+    count = count + 1
+  end
+  limits:flush_expired()
+
+  ngx.header["Content-Type"] = "application/json"
+  ngx.say(cjson.encode({ identities = count }))
+end
+
+return _M
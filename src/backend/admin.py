@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import ApiQuota, KeyRotation
+
+
+@admin.register(ApiQuota)
+class ApiQuotaAdmin(admin.ModelAdmin):
+    list_display = ("user", "requests_per_minute", "requests_per_day", "updated_at")
+    raw_id_fields = ("user",)
+
+
+@admin.register(KeyRotation)
+class KeyRotationAdmin(admin.ModelAdmin):
+    list_display = ("field", "key_version", "scanned", "rotated", "last_pk", "updated_at", "finished_at")
+    readonly_fields = ("started_at", "updated_at")
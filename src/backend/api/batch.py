@@ -0,0 +1,162 @@
+"""
+Executes a list of license operations as one unit of work.
+
+All operations are validated together against rows loaded (and locked) with
+one query per model; if any item is invalid nothing is written. Otherwise the
+whole batch is applied with bulk_create, a single bulk_update and a set-based
+delete inside the same transaction. Bulk writes skip model signals, so the
+dashboard summary deltas, audit rows, notification events and change-feed
+entries for the batch are collected here and written once.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from backend.changefeed import publish_on_commit
+from backend.licensing.audit import record_many
+from backend.licensing.models import License, Vendor
+from backend.licensing.notifications import license_payload, notify_many
+from backend.licensing.summary import SummaryDelta, summary_key
+
+from .serializers import BatchLicenseSerializer
+
+BULK_BATCH_SIZE = 500
+
+
+class LicenseBatch:
+    def __init__(self, operations: list[dict]):
+        self.operations = operations
+        self.results: list[dict] = []
+        self.has_errors = False
+
+        self._creates: list[tuple[int, License]] = []
+        self._dirty: dict[int, set[str]] = {}
+        self._deleted: set[int] = set()
+
+    def run(self) -> bool:
+        """Validate and, if everything is valid, execute. Returns True on success."""
+        with transaction.atomic():
+            self._load()
+            for index, operation in enumerate(self.operations):
+                self._apply(index, operation)
+            if self.has_errors:
+                return False
+            self._write()
+        return True
+
+    def _load(self):
+        license_ids, vendor_ids, user_ids = set(), set(), set()
+        for operation in self.operations:
+            if operation.get('id') is not None:
+                license_ids.add(operation['id'])
+            data = operation.get('data') or {}
+            for key, bucket in (('vendor', vendor_ids), ('assigned_to', user_ids)):
+                try:
+                    if data.get(key) is not None:
+                        bucket.add(int(data[key]))
+                except (TypeError, ValueError):
+                    pass  # reported by the serializer
+            if operation.get('user') is not None:
+                user_ids.add(operation['user'])
+
+        self.licenses = License.objects.select_for_update().in_bulk(license_ids) if license_ids else {}
+        self.context = {
+            'vendors': Vendor.objects.in_bulk(vendor_ids) if vendor_ids else {},
+            'users': get_user_model().objects.in_bulk(user_ids) if user_ids else {},
+        }
+
+    def _fail(self, index: int, operation: dict, errors):
+        self.has_errors = True
+        self.results.append({'index': index, 'op': operation['op'], 'status': 'error', 'errors': errors})
+
+    def _ok(self, index: int, operation: dict, status: str, pk=None):
+        self.results.append({'index': index, 'op': operation['op'], 'status': status, 'id': pk})
+
+    def _target(self, index: int, operation: dict) -> License | None:
+        pk = operation['id']
+        if pk in self._deleted:
+            self._fail(index, operation, {'id': [f'License {pk} is deleted earlier in this batch.']})
+            return None
+        instance = self.licenses.get(pk)
+        if instance is None:
+            self._fail(index, operation, {'id': [f'License {pk} does not exist.']})
+        return instance
+
+    def _touch(self, instance: License, fields):
+        self._dirty.setdefault(instance.pk, set()).update(fields)
+
+    def _apply(self, index: int, operation: dict):
+        op = operation['op']
+
+        if op == 'create':
+            serializer = BatchLicenseSerializer(data=operation['data'], context=self.context)
+            if not serializer.is_valid():
+                return self._fail(index, operation, serializer.errors)
+            instance = License(**serializer.validated_data)
+            self._creates.append((len(self.results), instance))
+            return self._ok(index, operation, 'created')
+
+        instance = self._target(index, operation)
+        if instance is None:
+            return
+
+        if op == 'update':
+            serializer = BatchLicenseSerializer(instance, data=operation['data'], partial=True, context=self.context)
+            if not serializer.is_valid():
+                return self._fail(index, operation, serializer.errors)
+            for field, value in serializer.validated_data.items():
+                setattr(instance, field, value)
+            self._touch(instance, serializer.validated_data)
+            return self._ok(index, operation, 'updated', instance.pk)
+
+        if op == 'assign':
+            user = self.context['users'].get(operation['user']) if operation['user'] is not None else None
+            if operation['user'] is not None and user is None:
+                return self._fail(index, operation, {'user': [f"User {operation['user']} does not exist."]})
+            if instance.status != License.Status.ACTIVE:
+                return self._fail(index, operation, {'id': [f'License {instance.pk} is {instance.status}.']})
+            instance.assigned_to = user
+            self._touch(instance, ['assigned_to'])
+            return self._ok(index, operation, 'assigned', instance.pk)
+
+        if op == 'revoke':
+            instance.status = License.Status.REVOKED
+            instance.assigned_to = None
+            self._touch(instance, ['status', 'assigned_to'])
+            return self._ok(index, operation, 'revoked', instance.pk)
+
+        if op == 'delete':
+            self._deleted.add(instance.pk)
+            self._dirty.pop(instance.pk, None)
+            return self._ok(index, operation, 'deleted', instance.pk)
+
+    def _write(self):
+        delta = SummaryDelta()
+        events = []
+
+        if self._creates:
+            created = License.objects.bulk_create([instance for _, instance in self._creates], batch_size=BULK_BATCH_SIZE)
+            for (position, _), instance in zip(self._creates, created):
+                self.results[position]['id'] = instance.pk
+                delta.move(None, summary_key(instance))
+                events.append(('license.created', license_payload(instance)))
+
+        if self._dirty:
+            now = timezone.now()
+            instances = [self.licenses[pk] for pk in self._dirty]
+            for instance in instances:
+                instance.updated_at = now
+            fields = set().union(*self._dirty.values()) | {'updated_at'}
+            License.objects.bulk_update(instances, sorted(fields), batch_size=BULK_BATCH_SIZE)
+            for instance in instances:
+                delta.move(instance._summary_key, summary_key(instance))
+                events.append(('license.updated', license_payload(instance)))
+
+        delta.apply()
+        record_many(events)
+        notify_many(events)
+        publish_on_commit(events)
+
+        if self._deleted:
+            License.objects.filter(pk__in=self._deleted).delete()
@@ -1,5 +1,6 @@
 from rest_framework.routers import DefaultRouter
-from .viewsets import HelloViewSet
+from .viewsets import HelloViewSet, LicenseViewSet
 
 router = DefaultRouter()
 router.register(r'hello', HelloViewSet, basename='hello')
+router.register(r'licenses', LicenseViewSet, basename='license')
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
+
+from backend.licensing.models import License, Seat, Vendor
+
+User = get_user_model()
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves primary keys against a dict preloaded into the serializer context
+    under `cache_key`, so validating hundreds of items costs one query per
+    related model instead of one per item.
+    """
+
+    def __init__(self, cache_key, **kwargs):
+        self.cache_key = cache_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        cache = self.context.get(self.cache_key)
+        if cache is None:
+            return super().to_internal_value(data)
+        try:
+            return cache[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class LicenseSerializer(serializers.ModelSerializer):
+    vendor_name = serializers.CharField(source='vendor.name', read_only=True)
+
+    class Meta:
+        model = License
+        fields = [
+            'id', 'vendor', 'vendor_name', 'product', 'license_key', 'assigned_to',
+            'seats', 'status', 'expires_at', 'notes', 'metadata', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # List views leave the secret out unless asked, so rows are never decrypted for nothing.
+        if not self.context.get('reveal_secrets', True):
+            self.fields.pop('license_key')
+
+
+class BatchLicenseSerializer(LicenseSerializer):
+    vendor = PrefetchedPrimaryKeyRelatedField('vendors', queryset=Vendor.objects.all())
+    assigned_to = PrefetchedPrimaryKeyRelatedField('users', queryset=User.objects.all(), allow_null=True, required=False)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    OPERATIONS = ('create', 'update', 'assign', 'revoke', 'delete')
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.IntegerField(required=False)
+    user = serializers.IntegerField(required=False, allow_null=True)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs['op'] != 'create' and attrs.get('id') is None:
+            raise serializers.ValidationError({'id': f"Required for '{attrs['op']}' operations."})
+        if attrs['op'] == 'assign' and 'user' not in attrs:
+            raise serializers.ValidationError({'user': "Required for 'assign' operations."})
+        if attrs['op'] in ('create', 'update') and not attrs.get('data'):
+            raise serializers.ValidationError({'data': f"Required for '{attrs['op']}' operations."})
+        return attrs
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    operations = BatchOperationSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=getattr(settings, 'LICENSE_BATCH_MAX_OPERATIONS', 1000),
+    )
+
+
+class SeatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Seat
+        fields = ['license', 'number', 'holder', 'checked_out_at']
+        read_only_fields = fields
@@ -1,8 +1,11 @@
-from django.urls import path, include
-from .views import PingAPIView
+from django.urls import path, include, re_path
+from .views import DashboardAPIView, HealthAPIView, PingAPIView, change_feed
 from .routers import router
 
 urlpatterns = [
     path('', include(router.urls)),
     path('ping/', PingAPIView.as_view(), name='api-ping'),
+    re_path(r'^changes/?$', change_feed, name='api-changes'),
+    path('dashboard/', DashboardAPIView.as_view(), name='api-dashboard'),
+    re_path(r'^health/?$', HealthAPIView.as_view(), name='api-health'),
 ]
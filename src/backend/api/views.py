@@ -1,7 +1,122 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+
+from backend.changefeed import broadcaster, stream
+from backend.health import FAIL, monitor
+from backend.licensing.models import ExpirationCalendar, License, LicenseStatusSummary
 
 class PingAPIView(APIView):
     def get(self, request):
         return Response({'status': 'ok'}, status=status.HTTP_200_OK)
+
+class HealthAPIView(APIView):
+    """
+    Deep health check for load balancers: probes the database, Redis, the
+    Celery broker and workers. 503 only when a critical dependency fails.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        result = monitor.get()
+        code = status.HTTP_503_SERVICE_UNAVAILABLE if result['status'] == FAIL else status.HTTP_200_OK
+        return Response(result, status=code, headers={'Cache-Control': 'no-store'})
+
+class DashboardAPIView(APIView):
+    """
+    License totals and expiration warnings for the dashboard. Reads only the
+    summary tables maintained by backend.licensing.summary, so the cost does
+    not grow with the license table.
+
+    ?days=N (default 30) limits the daily calendar, ?weeks=N (default 12) the
+    weekly one; both start today, in the site time zone.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        days = self._bounded(request, 'days', 30, 366)
+        weeks = self._bounded(request, 'weeks', 12, 104)
+        today = timezone.localdate()
+
+        totals = {choice: {'count': 0, 'seats': 0} for choice in License.Status.values}
+        vendors = {}
+        for row in LicenseStatusSummary.objects.select_related('vendor').order_by('vendor__name', 'status'):
+            if not row.count:
+                continue
+            entry = vendors.setdefault(row.vendor_id, {'id': row.vendor_id, 'name': row.vendor.name, 'statuses': {}})
+            entry['statuses'][row.status] = {'count': row.count, 'seats': row.seats}
+            totals[row.status]['count'] += row.count
+            totals[row.status]['seats'] += row.seats
+
+        # Active licenses by time to expiry; each 'within' bucket is cumulative from today.
+        thresholds = sorted(set(settings.DASHBOARD_EXPIRY_BUCKETS))
+        buckets = {'overdue': Q(day__lt=today)}
+        for n in thresholds:
+            buckets[f'within_{n}_days'] = Q(day__gte=today, day__lt=today + timedelta(days=n))
+        buckets['later'] = Q(day__gte=today + timedelta(days=thresholds[-1] if thresholds else 0))
+        sums = ExpirationCalendar.objects.aggregate(**{
+            f'{name}_{column}': Sum(column, filter=condition)
+            for name, condition in buckets.items() for column in ('count', 'seats')
+        })
+        expiry = {name: {'count': sums[f'{name}_count'] or 0, 'seats': sums[f'{name}_seats'] or 0} for name in buckets}
+
+        week_start = today - timedelta(days=today.weekday())
+        horizon = max(today + timedelta(days=days), week_start + timedelta(weeks=weeks))
+        calendar = (
+            ExpirationCalendar.objects.filter(day__gte=today, day__lt=horizon)
+            .values('day').annotate(total=Sum('count'), total_seats=Sum('seats')).order_by('day')
+        )
+        daily = []
+        weekly = {week_start + timedelta(weeks=i): {'count': 0, 'seats': 0} for i in range(weeks)}
+        for row in calendar:
+            if row['day'] < today + timedelta(days=days):
+                daily.append({'day': row['day'], 'count': row['total'], 'seats': row['total_seats']})
+            week = weekly.get(row['day'] - timedelta(days=row['day'].weekday()))
+            if week is not None:
+                week['count'] += row['total']
+                week['seats'] += row['total_seats']
+
+        return Response({
+            'today': today,
+            'totals': totals,
+            'vendors': list(vendors.values()),
+            'expiry': expiry,
+            'daily': daily,
+            'weekly': [{'week': start, **values} for start, values in weekly.items()],
+        })
+
+    @staticmethod
+    def _bounded(request, name: str, default: int, maximum: int) -> int:
+        try:
+            value = int(request.query_params.get(name, default))
+        except (TypeError, ValueError):
+            raise ValidationError({name: ['Must be an integer.']})
+        return max(1, min(value, maximum))
+
+
+async def change_feed(request):
+    """
+    License changes as server-sent events (see backend.changefeed). Runs only
+    under the ASGI server; nginx routes /api/changes/ there. Session-
+    authenticated, since EventSource cannot send an Authorization header.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    subscriber = await broadcaster.subscribe()
+    if subscriber is None:
+        return JsonResponse({'detail': 'Change feed unavailable.'}, status=503, headers={'Retry-After': '5'})
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    response = StreamingHttpResponse(stream(subscriber, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-store'
+    response['X-Accel-Buffering'] = 'no'
+    return response
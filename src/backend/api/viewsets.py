@@ -1,8 +1,130 @@
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.viewsets import ViewSet
+from rest_framework.viewsets import ModelViewSet, ViewSet
+
+from backend.edge import purge_api_cache_on_commit
+from backend.fields import reveal_all
+from backend.licensing import archive, seats
+from backend.licensing.models import License, Vendor
+from .batch import LicenseBatch
+from .serializers import BatchRequestSerializer, LicenseSerializer, SeatSerializer
 
 class HelloViewSet(ViewSet):
     def list(self, request):
         return Response({'message': 'Hello from DRF ViewSet'})
+
+class LicenseViewSet(ModelViewSet):
+    queryset = License.objects.select_related('vendor')
+    serializer_class = LicenseSerializer
+    permission_classes = [IsAuthenticated]
+
+    def reveal_secrets(self) -> bool:
+        """
+        Secrets are included on single-object views, and on lists only with
+        ?reveal=license_key, which is limited to staff and holders of
+        licensing.reveal_license_key since it decrypts keys in bulk.
+        """
+        if self.action != 'list':
+            return True
+        if self.request.query_params.get('reveal') != 'license_key':
+            return False
+        user = self.request.user
+        if not (user.is_staff or user.has_perm('licensing.reveal_license_key')):
+            raise PermissionDenied('Listing licenses with their keys requires the reveal_license_key permission.')
+        return True
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.reveal_secrets():
+            queryset = queryset.defer('license_key')
+        return queryset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'reveal_secrets': self.reveal_secrets()}
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args and self.reveal_secrets():
+            args = (reveal_all(list(args[0]), 'license_key'), *args[1:])
+        return super().get_serializer(*args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Licenses moved to the cold archive are still served, read-only, flagged 'archived'."""
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            record = archive.fetch(kwargs.get(self.lookup_field))
+            if record is None:
+                raise
+        record = archive.reveal(record)
+        vendor = Vendor.objects.filter(pk=record['vendor_id']).values_list('name', flat=True).first()
+        return Response({
+            'id': record['id'],
+            'vendor': record['vendor_id'],
+            'vendor_name': vendor,
+            'product': record['product'],
+            'license_key': record['license_key'],
+            'assigned_to': record['assigned_to_id'],
+            'seats': record['seats'],
+            'status': record['status'],
+            'expires_at': record['expires_at'],
+            'notes': record['notes'],
+            'metadata': record['metadata'],
+            'created_at': record['created_at'],
+            'updated_at': record['updated_at'],
+            'archived': True,
+        })
+
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request):
+        """
+        Apply a list of create/update/assign/revoke/delete operations in one
+        transaction. Either every operation is applied (200) or none is (400);
+        both responses carry per-item results in request order.
+        """
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        batch = LicenseBatch(serializer.validated_data['operations'])
+        applied = batch.run()
+        if applied:
+            # Bulk writes bypass model signals, so purge the edge cache explicitly.
+            purge_api_cache_on_commit('licenses')
+        return Response(
+            {'applied': applied, 'results': batch.results},
+            status=status.HTTP_200_OK if applied else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def seat_user(self, request):
+        """The requesting user, or with staff rights the user named in the body."""
+        user_id = request.data.get('user')
+        if user_id is None or str(user_id) == str(request.user.pk):
+            return request.user
+        if not request.user.is_staff:
+            raise PermissionDenied('Only staff can check out seats for other users.')
+        try:
+            return get_user_model().objects.get(pk=int(user_id))
+        except (TypeError, ValueError, get_user_model().DoesNotExist):
+            raise ValidationError({'user': [f'User {user_id} does not exist.']})
+
+    @action(detail=True, methods=['post'])
+    def checkout(self, request, pk=None):
+        """Take a seat on a floating/volume license (idempotent). 409 when none is free."""
+        license = self.get_object()
+        try:
+            seat = seats.checkout(license.pk, self.seat_user(request))
+        except seats.SeatUnavailable as e:
+            return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(SeatSerializer(seat).data)
+
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None):
+        """Give back the seat held on this license. 404 when none was held."""
+        license = self.get_object()
+        if not seats.release(license.pk, self.seat_user(request)):
+            return Response({'detail': 'No seat held on this license.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
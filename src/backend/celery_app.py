@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import before_task_publish, task_postrun, task_prerun
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.config.settings")
 app = Celery("backend")
@@ -9,3 +10,31 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Discover tasks in all registered Django apps
 app.autodiscover_tasks()
+
+
+# Carry the publishing request's ID to the worker so its log lines correlate.
+@before_task_publish.connect
+def attach_request_id(headers=None, **kwargs):
+    from backend.jsonlog import request_id_var
+
+    request_id = request_id_var.get()
+    if headers is not None and request_id and "request_id" not in headers:
+        headers["request_id"] = request_id
+
+
+@task_prerun.connect
+def bind_request_id(task_id=None, task=None, **kwargs):
+    from backend.jsonlog import clean_request_id, request_id_var, task_var
+
+    request_id = clean_request_id(getattr(task.request, "request_id", None)) or task_id
+    task.request._log_tokens = (request_id_var.set(request_id), task_var.set(f"{task.name}[{task_id}]"))
+
+
+@task_postrun.connect
+def unbind_request_id(task=None, **kwargs):
+    from backend.jsonlog import request_id_var, task_var
+
+    tokens = getattr(task.request, "_log_tokens", None)
+    if tokens:
+        request_id_var.reset(tokens[0])
+        task_var.reset(tokens[1])
@@ -0,0 +1,222 @@
+"""
+License change feed: server-sent events for the dashboard, served by the
+ASGI app (backend.config.asgi under uvicorn).
+
+Writers append each change to a Redis stream (CHANGEFEED_STREAM, trimmed to
+roughly CHANGEFEED_MAXLEN entries) once their transaction commits. In every
+ASGI process a single Broadcaster task tails the stream with a blocking XREAD
+and fans entries out to in-process subscriber queues, so open dashboards cost
+one Redis connection per process and no database queries.
+
+Stream entry IDs double as SSE event IDs, i.e. resume tokens: a reconnecting
+EventSource sends the last one as Last-Event-ID and is replayed what it
+missed. If that part of the stream has been trimmed, the client gets a
+'reset' event and should refetch. A subscriber that falls too far behind is
+disconnected and catches up the same way.
+"""
+
+import asyncio
+import json
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger("backend.changefeed")
+
+
+def parse_id(entry_id) -> tuple[int, int] | None:
+    """'1700000000000-3' -> (1700000000000, 3); None if malformed."""
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    try:
+        ms, _, seq = str(entry_id).partition("-")
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+# Publishing (sync, from Django request and Celery code)
+
+@lru_cache(maxsize=None)
+def _client():
+    import redis
+
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1.0, socket_connect_timeout=1.0)
+
+
+def publish(changes) -> bool:
+    """
+    Append (event_type, payload) pairs to the stream. Failures are logged and
+    reported as False: the feed being down must never fail a write.
+    """
+    import redis
+
+    changes = list(changes)
+    if not changes:
+        return True
+    try:
+        pipe = _client().pipeline(transaction=False)
+        for event_type, payload in changes:
+            data = json.dumps(payload, cls=DjangoJSONEncoder)
+            pipe.xadd(
+                settings.CHANGEFEED_STREAM,
+                {"event": event_type, "data": data},
+                maxlen=settings.CHANGEFEED_MAXLEN,
+                approximate=True,
+            )
+        pipe.execute()
+        return True
+    except redis.RedisError as e:
+        logger.warning("Change feed publish failed: %s", e)
+        return False
+
+
+def publish_on_commit(changes):
+    """Publish once the current transaction commits, so the feed never announces rolled-back rows."""
+    changes = list(changes)
+    if changes:
+        transaction.on_commit(lambda: publish(changes))
+
+
+# Streaming (async, inside the ASGI process)
+
+class Subscriber:
+    def __init__(self, size: int):
+        self.queue = asyncio.Queue(maxsize=size)
+        self.overflowed = False
+        self.position = None  # the tail's position when this subscriber joined
+
+
+class Broadcaster:
+    """Tails the stream once per process and fans entries out to subscribers."""
+
+    def __init__(self):
+        self.subscribers: set[Subscriber] = set()
+        self.position = None  # last stream ID the tail has read
+        self._ready = None
+        self._task = None
+        self._redis = None
+
+    def redis(self):
+        if self._redis is None:
+            import redis.asyncio
+
+            self._redis = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+        return self._redis
+
+    async def subscribe(self) -> Subscriber | None:
+        """
+        Register a subscriber once the tail has a position, so everything
+        after `position` reaches its queue. None if the process is at
+        CHANGEFEED_MAX_SUBSCRIBERS or Redis is unreachable.
+        """
+        if len(self.subscribers) >= settings.CHANGEFEED_MAX_SUBSCRIBERS:
+            return None
+        subscriber = Subscriber(settings.CHANGEFEED_QUEUE_SIZE)
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(self._ready))
+        try:
+            await asyncio.wait_for(self._ready.wait(), settings.CHANGEFEED_KEEPALIVE)
+        except TimeoutError:
+            self.unsubscribe(subscriber)
+            return None
+        subscriber.position = self.position
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def _run(self, ready: asyncio.Event):
+        from redis.exceptions import RedisError
+
+        while self.subscribers:
+            try:
+                if not ready.is_set():
+                    self.position = await self.latest_id()
+                    ready.set()
+                result = await self.redis().xread({settings.CHANGEFEED_STREAM: self.position}, count=500, block=5000)
+            except RedisError as e:
+                logger.warning("Change feed read failed: %s", e)
+                await asyncio.sleep(1.0)
+                continue
+            for _, entries in result or []:
+                for entry in entries:
+                    self.position = entry[0].decode()
+                    self._fan_out(entry)
+
+    def _fan_out(self, entry):
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                # Cut it loose; it reconnects with Last-Event-ID and replays from the stream.
+                subscriber.overflowed = True
+                self.subscribers.discard(subscriber)
+
+    async def latest_id(self) -> str:
+        entries = await self.redis().xrevrange(settings.CHANGEFEED_STREAM, count=1)
+        return entries[0][0].decode() if entries else "0-0"
+
+    async def replay(self, after: str):
+        """
+        Entries after `after`, or None if some of them may have been trimmed.
+        """
+        stream = settings.CHANGEFEED_STREAM
+        oldest = await self.redis().xrange(stream, count=1)
+        if oldest and parse_id(oldest[0][0]) > parse_id(after):
+            return None
+        return await self.redis().xrange(stream, min=f"({after}", count=settings.CHANGEFEED_MAXLEN)
+
+
+broadcaster = Broadcaster()
+
+
+def format_event(entry_id, event: str, data: str) -> bytes:
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    return f"id: {entry_id}\nevent: {event}\ndata: {data}\n\n".encode()
+
+
+def format_entry(entry) -> bytes:
+    entry_id, fields = entry
+    return format_event(entry_id, fields[b"event"].decode(), fields[b"data"].decode())
+
+
+async def stream(subscriber: Subscriber, last_event_id: str | None):
+    """
+    SSE body for one connection: a 'ready' event carrying the current resume
+    token (or a replay of what was missed), then live changes, with comment
+    keepalives so idle connections survive proxies.
+    """
+    try:
+        start = parse_id(last_event_id) if last_event_id else None
+        missed = await broadcaster.replay(f"{start[0]}-{start[1]}") if start else None
+        if missed is None:
+            # New connection, or a resume token older than the stream. Anything
+            # after the position at subscribe time is already in the queue.
+            sent = parse_id(subscriber.position)
+            yield format_event(subscriber.position, "reset" if start else "ready", "{}")
+        else:
+            sent = start
+            for entry in missed:
+                sent = parse_id(entry[0])
+                yield format_entry(entry)
+
+        while not subscriber.overflowed:
+            try:
+                entry = await asyncio.wait_for(subscriber.queue.get(), settings.CHANGEFEED_KEEPALIVE)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            entry_id = parse_id(entry[0])
+            if entry_id <= sent:
+                continue  # already sent in the replay
+            sent = entry_id
+            yield format_entry(entry)
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Served by uvicorn (supervisor program ``asgi``) for long-lived connections,
+currently the /api/changes/ server-sent event feed; everything else is WSGI.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -1,18 +1,23 @@
 from pathlib import Path
+from urllib.parse import quote
 from dotenv import load_dotenv
 import os
+import sys
 
 # Load environment variables from ../.env (relative to src/backend/)
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
 # Paths
 BASE_DIR = Path(os.getenv("BASE_DIR", Path(__file__).resolve().parent.parent))
+# Runtime data (logs, archives): the app's var/, as laid out by bin/configure
+VAR_DIR = Path(os.getenv("VAR", Path(__file__).resolve().parents[3] / "var"))
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "unsafe-dev-key")
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+TESTING = sys.argv[1:2] == ["test"] or "pytest" in sys.modules
 
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
 
@@ -29,12 +34,15 @@ INSTALLED_APPS = [
 
     # Third party packages
     'rest_framework',
+    'rest_framework.authtoken',
 
     # Project-local app
     'backend.apps.BackendConfig',  # ✅ AppConfig class preferred
+    'backend.licensing.apps.LicensingConfig',
 ]
 
 MIDDLEWARE = [
+    'backend.middleware.RequestIdMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -44,6 +52,23 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Query counting / N+1 detection (on by default in debug, opt-in elsewhere)
+QUERY_COUNT_ENABLED = os.getenv("QUERY_COUNT_ENABLED", str(DEBUG)).lower() in ("1", "true", "yes")
+QUERY_COUNT_REPEAT_THRESHOLD = int(os.getenv("QUERY_COUNT_REPEAT_THRESHOLD", "5"))
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "0")) or None
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() in ("1", "true", "yes")
+
+# Per-endpoint query budgets, keyed by resolved view name (e.g. 'api-ping')
+QUERY_BUDGETS = {
+    'api-ping': 0,
+    'license-list': 4,
+    'license-detail': 4,
+    'api-dashboard': 5,
+}
+
+if QUERY_COUNT_ENABLED:
+    MIDDLEWARE.insert(1, 'backend.middleware.QueryCountMiddleware')
+
 ROOT_URLCONF = 'backend.config.urls'
 
 REST_FRAMEWORK = {
@@ -92,6 +117,19 @@ DATABASES = {
     }
 }
 
+# Password hashing: Argon2id first; older PBKDF2 hashes still verify and are
+# upgraded at login. Cost parameters come from .licman-cfg.yml (bin/configure);
+# `manage.py calibrate_argon2` recommends values for this host.
+PASSWORD_HASHERS = [
+    'backend.hashers.ConfiguredArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -121,5 +159,216 @@ STATIC_ROOT = os.getenv("STATIC_ROOT", str(BASE_DIR / "static"))
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.getenv("MEDIA_ROOT", str(BASE_DIR / "media"))
 
+# Content-hashed static file names (staticfiles.json manifest), so nginx can
+# serve them as immutable along with the .gz/.br siblings written by bin/static.
+# The manifest only exists after collectstatic, so DEBUG and test runs keep
+# plain names.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+            if DEBUG or TESTING
+            else 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+        ),
+    },
+}
+
+# Logging: JSON lines with request IDs, written off the request thread by a
+# QueueListener, rotated by size (rename, not copytruncate) across processes.
+LOG_DIR = os.getenv("LOG_DIR", str(VAR_DIR / "log"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FILE = os.getenv("LOG_FILE", str(Path(LOG_DIR) / "licman.json.log"))
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'backend.jsonlog.RequestIdFilter'},
+    },
+    'formatters': {
+        'json': {'()': 'backend.jsonlog.JsonFormatter'},
+    },
+    'handlers': {
+        'file': {
+            'class': 'backend.jsonlog.SharedRotatingFileHandler',
+            'filename': LOG_FILE,
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
+            'delay': True,  # opened on first record, so startup never depends on the log directory
+            'formatter': 'json',
+        },
+        # Listener started by BackendConfig.ready() (backend.jsonlog.start_listeners)
+        'queue': {
+            'class': 'backend.jsonlog.StructuredQueueHandler',
+            'handlers': ['file'],
+            'respect_handler_level': True,
+            'filters': ['request_id'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+}
+
+# Key for encrypted model fields (backend.fields); derived per version with HKDF.
+# Falls back to SECRET_KEY, but should be set separately so either can rotate.
+FIELD_ENCRYPTION_KEY = os.getenv("FIELD_ENCRYPTION_KEY", "")
+
+# Key versions for rotation, e.g. "2=<new secret>,1=<old secret>". The first
+# (or FIELD_ENCRYPTION_PRIMARY) encrypts; every listed version decrypts. Empty
+# means a single version 1 built from FIELD_ENCRYPTION_KEY.
+FIELD_ENCRYPTION_KEYS = dict(
+    item.split("=", 1) for item in os.getenv("FIELD_ENCRYPTION_KEYS", "").split(",") if "=" in item
+)
+FIELD_ENCRYPTION_PRIMARY = os.getenv("FIELD_ENCRYPTION_PRIMARY", "")
+
+# Re-encryption job (manage.py rotate_encryption_keys): rows per chunk and rows/sec budget
+KEY_ROTATION_CHUNK_SIZE = int(os.getenv("KEY_ROTATION_CHUNK_SIZE", "500"))
+KEY_ROTATION_ROWS_PER_SECOND = float(os.getenv("KEY_ROTATION_ROWS_PER_SECOND", "200"))
+
+# Upper bound on operations accepted by POST /api/licenses/batch/
+LICENSE_BATCH_MAX_OPERATIONS = int(os.getenv("LICENSE_BATCH_MAX_OPERATIONS", "1000"))
+
+# OpenResty edge admin socket (micro-cache purges); empty disables edge calls
+EDGE_ADMIN_SOCKET = os.getenv("EDGE_ADMIN_SOCKET", "")
+EDGE_ADMIN_TIMEOUT = float(os.getenv("EDGE_ADMIN_TIMEOUT", "1.0"))
+
+# Default edge rate limits per caller kind: (requests per minute, requests per day), 0 = unlimited.
+# Per-user overrides live in backend.models.ApiQuota.
+EDGE_RATE_LIMITS = {
+    'token': (int(os.getenv("EDGE_RATE_LIMIT_TOKEN", "600")), int(os.getenv("EDGE_DAILY_QUOTA_TOKEN", "100000"))),
+    'session': (int(os.getenv("EDGE_RATE_LIMIT_SESSION", "600")), int(os.getenv("EDGE_DAILY_QUOTA_SESSION", "0"))),
+    'anonymous': (int(os.getenv("EDGE_RATE_LIMIT_ANONYMOUS", "60")), int(os.getenv("EDGE_DAILY_QUOTA_ANONYMOUS", "0"))),
+}
+
+# Redis
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+REDIS_DB = os.getenv("REDIS_DB", "0")
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
+_redis_auth = f":{quote(REDIS_PASSWORD, safe='')}@" if REDIS_PASSWORD else ""
+if REDIS_HOST.startswith("/"):
+    REDIS_URL = f"unix://{_redis_auth}{REDIS_HOST}?db={REDIS_DB}"
+else:
+    REDIS_URL = f"redis://{_redis_auth}{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
+
+# Caches: sessions get their own Redis-backed alias so they never share
+# eviction or key space with anything else.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'licman:session',
+        'TIMEOUT': None,  # session expiry is set per key
+    },
+}
+
+# Session storage, chosen in bin/configure: 'db' (PostgreSQL only), 'cache'
+# (Redis only; sessions are lost if Redis is flushed) or 'cached_db' (reads
+# from Redis, writes through to PostgreSQL).
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "db")
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+}[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Expired django_session rows are deleted by Celery beat in batches of this size
+SESSION_CLEANUP_BATCH_SIZE = int(os.getenv("SESSION_CLEANUP_BATCH_SIZE", "1000"))
+
+# Dashboard (/api/dashboard/): expiry warning buckets in days, and how often
+# Celery beat rebuilds the summary tables to catch writes that bypass signals
+DASHBOARD_EXPIRY_BUCKETS = [int(d) for d in os.getenv("DASHBOARD_EXPIRY_BUCKETS", "7,30,90").split(",") if d.strip()]
+DASHBOARD_REFRESH_INTERVAL = float(os.getenv("DASHBOARD_REFRESH_INTERVAL", "900"))
+
+# Seat rows are reconciled with license seat counts and statuses this often, in seconds
+SEAT_RECONCILE_INTERVAL = float(os.getenv("SEAT_RECONCILE_INTERVAL", "300"))
+
+# Outbound notifications (backend.licensing.notifications)
+NOTIFICATION_HTTP_TIMEOUT = float(os.getenv("NOTIFICATION_HTTP_TIMEOUT", "10"))
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "8"))
+# Retry n waits a random 0..min(CAP, BASE * 2**(n-1)) seconds
+NOTIFICATION_RETRY_BASE = float(os.getenv("NOTIFICATION_RETRY_BASE", "30"))
+NOTIFICATION_RETRY_CAP = float(os.getenv("NOTIFICATION_RETRY_CAP", "3600"))
+# A claimed batch not finished within this many seconds is re-sent by another worker
+NOTIFICATION_LEASE = float(os.getenv("NOTIFICATION_LEASE", "300"))
+NOTIFICATION_DIGEST_DAYS = int(os.getenv("NOTIFICATION_DIGEST_DAYS", "30"))
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "licman@localhost")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "25"))
+
+# License change feed (/api/changes/, server-sent events from the ASGI process)
+CHANGEFEED_STREAM = os.getenv("CHANGEFEED_STREAM", "licman:changes")
+# Changes kept in Redis for resuming clients; older resume tokens get a 'reset'
+CHANGEFEED_MAXLEN = int(os.getenv("CHANGEFEED_MAXLEN", "10000"))
+# Per-connection backlog before a slow client is disconnected to resume later
+CHANGEFEED_QUEUE_SIZE = int(os.getenv("CHANGEFEED_QUEUE_SIZE", "256"))
+CHANGEFEED_MAX_SUBSCRIBERS = int(os.getenv("CHANGEFEED_MAX_SUBSCRIBERS", "5000"))
+CHANGEFEED_KEEPALIVE = float(os.getenv("CHANGEFEED_KEEPALIVE", "15"))
+
+# Monthly partitions (backend.partitions): created this many months ahead, and
+# audit events dropped a month at a time once older than the retention (0 keeps all)
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", "24"))
+
+# Cold archive (backend.licensing.archive): licenses expired or revoked for
+# longer than this many days move to compressed NDJSON files under ARCHIVE_DIR
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", str(VAR_DIR / "archive"))
+LICENSE_ARCHIVE_AFTER_DAYS = int(os.getenv("LICENSE_ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "1000"))
+ARCHIVE_BLOCK_SIZE = int(os.getenv("ARCHIVE_BLOCK_SIZE", "256"))
+
+# Deep health check (/api/health/): per-probe timeout and result cache lifetime, in seconds
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "1.0"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+
+# Celery
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_WORKER_HIJACK_ROOT_LOGGER = False  # keep LOGGING above in workers
+CELERY_BEAT_SCHEDULE = {
+    'sync-edge-limits': {
+        'task': 'backend.tasks.sync_edge_limits',
+        'schedule': 60.0,
+    },
+    'clear-expired-sessions': {
+        'task': 'backend.tasks.clear_expired_sessions',
+        'schedule': 3600.0,
+    },
+    'refresh-license-summaries': {
+        'task': 'backend.licensing.tasks.refresh_license_summaries',
+        'schedule': DASHBOARD_REFRESH_INTERVAL,
+    },
+    'reconcile-seats': {
+        'task': 'backend.licensing.tasks.reconcile_seats',
+        'schedule': SEAT_RECONCILE_INTERVAL,
+    },
+    'maintain-partitions': {
+        'task': 'backend.tasks.maintain_partitions',
+        'schedule': 86400.0,
+    },
+    'archive-licenses': {
+        'task': 'backend.licensing.tasks.archive_licenses',
+        'schedule': 86400.0,
+    },
+    'deliver-pending-notifications': {
+        'task': 'backend.licensing.tasks.deliver_pending_notifications',
+        'schedule': 60.0,
+    },
+    'license-expiration-digest': {
+        'task': 'backend.licensing.tasks.send_license_report',
+        'schedule': 86400.0,
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,125 @@
+"""
+Site-wide encryption for secret model fields (see backend.fields).
+
+Values are Fernet tokens tagged with the version of the key that produced
+them: ``enc:v<version>:<token>``. Key material is read from settings and run
+through HKDF once per process; the resulting Fernet instances are cached until
+the relevant settings change.
+
+Several key versions can be active at once (FIELD_ENCRYPTION_KEYS): new values
+are written under the primary version and any configured version decrypts,
+so a rotation (backend.rotation) can re-encrypt rows while the site runs.
+"""
+
+import base64
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+PREFIX = "enc:"
+HKDF_SALT = b"licman-field-encryption"
+
+
+class DecryptionError(Exception):
+    pass
+
+
+def derive_key(secret: str, version: str) -> bytes:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=HKDF_SALT, info=f"v{version}".encode())
+    return base64.urlsafe_b64encode(hkdf.derive(secret.encode()))
+
+
+class Keyring:
+    def __init__(self, secrets: dict[str, str], primary: str):
+        from cryptography.fernet import Fernet
+
+        if primary not in secrets:
+            raise ImproperlyConfigured(f"Field encryption key version {primary!r} is not configured.")
+        self.primary = primary
+        self.fernets = {version: Fernet(derive_key(secret, version)) for version, secret in secrets.items()}
+
+    def encrypt(self, plaintext: str) -> str:
+        token = self.fernets[self.primary].encrypt(plaintext.encode())
+        return f"{PREFIX}v{self.primary}:{token.decode()}"
+
+    def decrypt(self, value: str) -> str:
+        from cryptography.fernet import InvalidToken
+
+        version, token = split(value)
+        fernet = self.fernets.get(version)
+        if fernet is None:
+            raise DecryptionError(f"No key configured for version {version!r}.")
+        try:
+            return fernet.decrypt(token.encode()).decode()
+        except InvalidToken as e:
+            raise DecryptionError(f"Ciphertext does not verify under key version {version!r}.") from e
+
+    def needs_rotation(self, value: str) -> bool:
+        """True for legacy plaintext and for ciphertext written under a non-primary key."""
+        if not is_encrypted(value):
+            return bool(value)
+        return split(value)[0] != self.primary
+
+    def reencrypt(self, value: str) -> str:
+        return self.encrypt(self.decrypt(value) if is_encrypted(value) else value)
+
+
+def split(value: str) -> tuple[str, str]:
+    """'enc:v1:<token>' -> ('1', '<token>')"""
+    try:
+        version, token = value[len(PREFIX):].split(":", 1)
+    except ValueError:
+        raise DecryptionError("Malformed ciphertext.") from None
+    return version.removeprefix("v"), token
+
+
+def is_encrypted(value) -> bool:
+    return isinstance(value, str) and value.startswith(PREFIX)
+
+
+@lru_cache(maxsize=None)
+def keyring() -> Keyring:
+    secrets = dict(getattr(settings, "FIELD_ENCRYPTION_KEYS", None) or {})
+    if not secrets:
+        secrets = {"1": getattr(settings, "FIELD_ENCRYPTION_KEY", "") or settings.SECRET_KEY}
+    primary = getattr(settings, "FIELD_ENCRYPTION_PRIMARY", "") or next(iter(secrets))
+    return Keyring(secrets, primary)
+
+
+@receiver(setting_changed)
+def _reset_keyring(setting, **kwargs):
+    if setting in ("FIELD_ENCRYPTION_KEYS", "FIELD_ENCRYPTION_PRIMARY", "FIELD_ENCRYPTION_KEY", "SECRET_KEY"):
+        keyring.cache_clear()
+
+
+def encrypt(plaintext: str) -> str:
+    return keyring().encrypt(plaintext)
+
+
+def decrypt(value: str) -> str:
+    """Decrypt a stored value; anything without the prefix is legacy plaintext."""
+    return keyring().decrypt(value) if is_encrypted(value) else value
+
+
+def decrypt_many(values) -> list[str]:
+    """
+    Decrypt a batch with one keyring lookup, decrypting repeated ciphertexts
+    once. Used by exports, where every row's secret is needed.
+    """
+    ring = keyring()
+    seen = {}
+    out = []
+    for value in values:
+        if not is_encrypted(value):
+            out.append(value)
+            continue
+        if value not in seen:
+            seen[value] = ring.decrypt(value)
+        out.append(seen[value])
+    return out
@@ -0,0 +1,102 @@
+"""
+Client for the OpenResty edge's admin server, which listens on a local unix
+socket (EDGE_ADMIN_SOCKET) and is never exposed to the network.
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import socket
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger("backend.edge")
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = 1.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def request(method: str, path: str, body: bytes | None = None, headers: dict | None = None) -> bool:
+    """
+    Send a request to the edge admin socket. Failures are logged and reported
+    as False: the edge being down must never fail the Django request.
+    """
+    socket_path = getattr(settings, "EDGE_ADMIN_SOCKET", "")
+    if not socket_path:
+        return False
+
+    conn = UnixHTTPConnection(socket_path, timeout=getattr(settings, "EDGE_ADMIN_TIMEOUT", 1.0))
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        response.read()
+        if response.status >= 300:
+            logger.warning("Edge %s %s returned %s", method, path, response.status)
+            return False
+        return True
+    except OSError as e:
+        logger.warning("Edge %s %s failed: %s", method, path, e)
+        return False
+    finally:
+        conn.close()
+
+
+def purge_api_cache(scope: str | None = None) -> bool:
+    """Invalidate micro-cached API responses for one resource (e.g. 'licenses') or all of them."""
+    query = f"?{urlencode({'scope': scope})}" if scope else ""
+    return request("POST", f"/microcache/purge{query}")
+
+
+def purge_api_cache_on_commit(scope: str | None = None):
+    """Purge once the current transaction commits, so readers never re-cache the old rows."""
+    transaction.on_commit(lambda: purge_api_cache(scope))
+
+
+def rate_limit_payload() -> dict:
+    """
+    Build the limits table for lua/ratelimit.lua: the per-kind defaults plus
+    an entry for every token, keyed by the SHA-1 of the token so the edge never
+    holds raw credentials. The edge counts unknown tokens by address, so each
+    one is listed, with its user's ApiQuota override or the token defaults.
+    """
+    from rest_framework.authtoken.models import Token
+
+    defaults = getattr(settings, "EDGE_RATE_LIMITS", {})
+    token_rate, token_quota = defaults.get("token", (0, 0))
+
+    identities = {}
+    tokens = Token.objects.values_list(
+        "key", "user__api_quota__requests_per_minute", "user__api_quota__requests_per_day"
+    )
+    for key, rate, quota in tokens.iterator():
+        identities[hashlib.sha1(key.encode()).hexdigest()] = [
+            token_rate if rate is None else rate,
+            token_quota if quota is None else quota,
+        ]
+
+    return {
+        "defaults": {kind: list(values) for kind, values in defaults.items()},
+        "identities": identities,
+    }
+
+
+def sync_rate_limits(payload: dict | None = None) -> bool:
+    """Replace the edge's rate limit table with the current one from the database."""
+    body = json.dumps(payload if payload is not None else rate_limit_payload()).encode()
+    return request("POST", "/ratelimit/limits", body=body, headers={"Content-Type": "application/json"})
+
+
+def sync_rate_limits_on_commit():
+    transaction.on_commit(sync_rate_limits)
@@ -0,0 +1,99 @@
+"""
+Model fields whose values are encrypted at rest (see backend.crypto).
+"""
+
+from django.db import models
+
+from . import crypto
+
+_HIDDEN = object()
+
+
+class LazySecret:
+    """
+    A stored ciphertext that is decrypted on first use (str(), reveal() or a
+    comparison) and not before. Rows whose secret is never displayed cost no
+    crypto, and saving an untouched row writes the ciphertext back unchanged.
+    """
+
+    __slots__ = ("ciphertext", "_plaintext")
+
+    def __init__(self, ciphertext: str, plaintext=_HIDDEN):
+        self.ciphertext = ciphertext
+        self._plaintext = plaintext
+
+    @property
+    def revealed(self) -> bool:
+        return self._plaintext is not _HIDDEN
+
+    def reveal(self) -> str:
+        if self._plaintext is _HIDDEN:
+            self._plaintext = crypto.decrypt(self.ciphertext)
+        return self._plaintext
+
+    def __str__(self):
+        return self.reveal()
+
+    def __repr__(self):
+        return "<LazySecret>"
+
+    def __bool__(self):
+        return bool(self.ciphertext)
+
+    def __eq__(self, other):
+        if isinstance(other, LazySecret):
+            return self.ciphertext == other.ciphertext or self.reveal() == other.reveal()
+        if isinstance(other, str):
+            return self.reveal() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.reveal())
+
+
+def reveal_all(instances, field_name: str):
+    """
+    Decrypt `field_name` on every instance in one batch, e.g. before an
+    export serializes them all.
+    """
+    pending = [
+        (instance, value) for instance in instances
+        if isinstance(value := getattr(instance, field_name), LazySecret) and not value.revealed
+    ]
+    plaintexts = crypto.decrypt_many(value.ciphertext for _, value in pending)
+    for (_, value), plaintext in zip(pending, plaintexts):
+        value._plaintext = plaintext
+    return instances
+
+
+class EncryptedTextField(models.TextField):
+    """
+    TextField stored as a versioned Fernet token. Reads return a LazySecret;
+    assigning a str encrypts it on save. Values cannot be filtered on, since
+    every encryption of the same plaintext differs.
+    """
+
+    description = "Text encrypted at rest with the site field-encryption key"
+
+    def from_db_value(self, value, expression, connection):
+        if not value:
+            return value
+        return LazySecret(value)
+
+    def to_python(self, value):
+        if value is None or value == "" or isinstance(value, LazySecret):
+            return value
+        if crypto.is_encrypted(value):
+            return LazySecret(value)  # fixtures and dumpdata output carry ciphertext
+        return str(value)
+
+    def get_prep_value(self, value):
+        if value is None or value == "":
+            return value
+        if isinstance(value, LazySecret):
+            return value.ciphertext
+        return crypto.encrypt(str(value))
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return value.ciphertext if isinstance(value, LazySecret) else self.get_prep_value(value)
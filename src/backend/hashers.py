@@ -0,0 +1,27 @@
+"""
+Password hashers configured from settings (see bin/configure and
+manage.py calibrate_argon2).
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class ConfiguredArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Django's Argon2id hasher with its cost parameters taken from ARGON2_*
+    settings. Because must_update() compares a stored hash's parameters with
+    these, changing them rehashes each password at its owner's next login.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
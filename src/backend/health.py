@@ -0,0 +1,135 @@
+"""
+Deep health checks behind /api/health/.
+
+Every dependency is probed concurrently with its own timeout, and the
+composite result is cached per process for HEALTH_CACHE_TTL seconds so a load
+balancer polling every second costs at most one round of probes per worker
+per TTL. Concurrent requests arriving while a round is in flight wait for it
+instead of starting their own.
+
+The endpoint is public, so failures are reported there by status only; the
+errors themselves (which name hosts, socket paths and driver messages) go to
+the log.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+
+OK = "ok"
+DEGRADED = "degraded"
+FAIL = "fail"
+
+logger = logging.getLogger("backend.health")
+
+
+def check_database():
+    connection = connections["default"]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        # Probes run on pool threads; don't leave a connection parked on each.
+        connection.close()
+
+
+def check_redis():
+    import redis
+
+    timeout = settings.HEALTH_CHECK_TIMEOUT
+    client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=timeout, socket_connect_timeout=timeout)
+    try:
+        client.ping()
+    finally:
+        client.close()
+
+
+def check_broker():
+    from backend.celery_app import app
+
+    with app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, timeout=settings.HEALTH_CHECK_TIMEOUT)
+
+
+def check_workers():
+    from backend.celery_app import app
+
+    # ping() collects replies for its whole timeout, so it must end before the
+    # probe deadline in run_checks() or a healthy pool reads as timed out.
+    replies = app.control.ping(timeout=settings.HEALTH_CHECK_TIMEOUT * 0.8)
+    if not replies:
+        raise RuntimeError("no Celery workers replied")
+    return {"workers": len(replies)}
+
+
+# name: (probe, critical). A failing critical check makes the endpoint 503;
+# any other failure only marks the result as degraded.
+CHECKS = {
+    "database": (check_database, True),
+    "redis": (check_redis, False),
+    "broker": (check_broker, False),
+    "workers": (check_workers, False),
+}
+
+
+class HealthMonitor:
+    def __init__(self, checks: dict):
+        self.checks = checks
+        self._executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="health")
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._result = None
+        self._checked_at = 0.0
+
+    def _probe(self, func):
+        started = time.perf_counter()
+        details = func() or {}
+        return {"status": OK, "latency_ms": round((time.perf_counter() - started) * 1000, 1), **details}
+
+    def run_checks(self) -> dict:
+        timeout = settings.HEALTH_CHECK_TIMEOUT
+        futures = {}
+        for name, (func, _) in self.checks.items():
+            # A probe still stuck from an earlier round is reported, not stacked.
+            previous = self._in_flight.get(name)
+            if previous is not None and not previous.done():
+                continue
+            futures[name] = self._in_flight[name] = self._executor.submit(self._probe, func)
+
+        # Every probe shares one deadline, so the round never takes longer than the timeout.
+        wait(futures.values(), timeout=timeout)
+
+        results = {}
+        status = OK
+        for name, (_, critical) in self.checks.items():
+            future = futures.get(name)
+            if future is None or not future.done():
+                logger.warning("Health check %s timed out after %ss", name, timeout)
+                result = {"status": FAIL}
+            elif future.exception() is not None:
+                logger.warning("Health check %s failed", name, exc_info=future.exception())
+                result = {"status": FAIL}
+            else:
+                result = future.result()
+            if result["status"] == FAIL:
+                status = FAIL if critical else (status if status == FAIL else DEGRADED)
+            results[name] = result
+        return {"status": status, "checks": results}
+
+    def get(self) -> dict:
+        ttl = settings.HEALTH_CACHE_TTL
+        with self._lock:
+            now = time.monotonic()
+            if self._result is None or now - self._checked_at >= ttl:
+                self._result = self.run_checks()
+                self._checked_at = now = time.monotonic()
+            age = now - self._checked_at
+        return {**self._result, "cached": age > 0, "age": round(age, 1)}
+
+
+monitor = HealthMonitor(CHECKS)
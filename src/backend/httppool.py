@@ -0,0 +1,76 @@
+"""
+Per-process pool of keep-alive HTTP(S) connections for outbound requests
+(notification delivery). Connections are keyed by scheme, host and port and
+reused most-recently-used first, so a worker talking to the same endpoints
+pays for TCP and TLS setup once rather than per request.
+
+Each forked child (Celery's prefork pool) starts with an empty pool: sockets
+inherited from the parent would be shared with it.
+"""
+
+import http.client
+import os
+import ssl
+import threading
+from urllib.parse import urlsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class ConnectionPool:
+    def __init__(self, timeout: float = 10.0, max_idle_per_host: int = 4):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._ssl_context = ssl.create_default_context()
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, key) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, url: str, body: bytes | None = None, headers: dict | None = None) -> tuple[int, bytes]:
+        """Send one request and return (status, body). Network errors propagate as OSError."""
+        parts = urlsplit(url)
+        if parts.scheme not in DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url!r}")
+        key = (parts.scheme, parts.hostname, parts.port or DEFAULT_PORTS[parts.scheme])
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused:
+                    continue  # the server closed an idle keep-alive connection; retry on a fresh one
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, data
@@ -0,0 +1,183 @@
+"""
+Structured, non-blocking logging for gunicorn workers, Celery and management
+commands (wired up by settings.LOGGING).
+
+Records are enqueued by StructuredQueueHandler in the calling thread and
+written by a QueueListener thread, so request threads never wait on disk.
+Every record carries the current request ID: taken from nginx's X-Request-ID
+by RequestIdMiddleware and forwarded to Celery tasks in a message header, so
+nginx, Django and Celery lines for one request share an ID.
+"""
+
+import atexit
+import contextvars
+import fcntl
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+task_var = contextvars.ContextVar("task", default=None)
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+SERVICE = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+
+# Attributes every LogRecord has; anything else was passed via `extra=`.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "task"}
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def clean_request_id(value) -> str | None:
+    """Accept a caller-supplied ID only if it is short and header-safe."""
+    if isinstance(value, str) and REQUEST_ID_PATTERN.match(value):
+        return value
+    return None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the request ID and Celery task of the emitting context."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.task = task_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "service": SERVICE,
+            "pid": record.process,
+        }
+        task = getattr(record, "task", None)
+        if task:
+            entry["task"] = task
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        elif record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps the traceback separate from the message, so the
+    listener-side JsonFormatter can still emit it as its own field.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SharedRotatingFileHandler(logging.handlers.WatchedFileHandler):
+    """
+    Size-based rotation that is safe with many processes on one file.
+
+    Rotation renames files (no copytruncate), under an flock so exactly one
+    process rotates; the others notice the inode change and reopen, which is
+    what WatchedFileHandler does on every emit anyway.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding="utf-8", delay=False):
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+        self.lockFilename = f"{os.path.abspath(filename)}.lock"
+        try:
+            os.makedirs(os.path.dirname(self.lockFilename), exist_ok=True)
+        except OSError:
+            pass  # reported by handleError() when a record cannot be written
+        super().__init__(filename, encoding=encoding, delay=delay)
+
+    def emit(self, record):
+        try:
+            if self.maxBytes and self.stream and self.stream.tell() >= self.maxBytes:
+                self.rotate_shared()
+        except OSError:
+            self.handleError(record)
+        super().emit(record)
+
+    def rotate_shared(self):
+        with open(self.lockFilename, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                st = os.stat(self.baseFilename)
+            except FileNotFoundError:
+                st = None
+            # Another process may have rotated while we waited for the lock.
+            if st and st.st_ino == self.ino and st.st_size >= self.maxBytes:
+                for i in range(self.backupCount - 1, 0, -1):
+                    src = f"{self.baseFilename}.{i}"
+                    if os.path.exists(src):
+                        os.replace(src, f"{self.baseFilename}.{i + 1}")
+                if self.backupCount:
+                    os.replace(self.baseFilename, f"{self.baseFilename}.1")
+                else:
+                    os.remove(self.baseFilename)
+        self.reopenIfNeeded()
+
+
+_started = []
+
+
+def _queue_handlers():
+    for name in logging.getHandlerNames():
+        handler = logging.getHandlerByName(name)
+        if isinstance(handler, StructuredQueueHandler) and getattr(handler, "listener", None):
+            yield handler
+
+
+def start_listeners():
+    """
+    Start the QueueListener behind every configured StructuredQueueHandler.
+
+    Called from BackendConfig.ready(). Listener threads do not survive
+    fork(), so forked children (Celery's prefork pool, gunicorn --preload)
+    get fresh queues and threads.
+    """
+    first = not _started
+    for handler in _queue_handlers():
+        if handler.listener not in _started:
+            handler.listener.start()
+            _started.append(handler.listener)
+    if first and _started:
+        atexit.register(stop_listeners)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def stop_listeners():
+    """Flush queued records and stop the writer threads."""
+    while _started:
+        _started.pop().stop()
+
+
+def _restart_after_fork():
+    for handler in _queue_handlers():
+        if handler.listener in _started:
+            handler.queue = handler.listener.queue = queue.Queue()
+            handler.listener._thread = None
+            handler.listener.start()
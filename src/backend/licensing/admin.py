@@ -0,0 +1,77 @@
+from django.contrib import admin
+
+from .models import (
+    AuditEvent,
+    ExpirationCalendar,
+    License,
+    LicenseStatusSummary,
+    NotificationDestination,
+    NotificationEvent,
+    Seat,
+    Vendor,
+)
+
+
+@admin.register(Vendor)
+class VendorAdmin(admin.ModelAdmin):
+    list_display = ("name", "website", "created_at")
+    search_fields = ("name",)
+
+
+@admin.register(License)
+class LicenseAdmin(admin.ModelAdmin):
+    list_display = ("id", "vendor", "product", "status", "assigned_to", "expires_at")
+    list_filter = ("status", "vendor")
+    list_select_related = ("vendor", "assigned_to")
+    search_fields = ("product", "vendor__name")
+    raw_id_fields = ("assigned_to",)
+
+
+@admin.register(LicenseStatusSummary)
+class LicenseStatusSummaryAdmin(admin.ModelAdmin):
+    list_display = ("vendor", "status", "count", "seats")
+    list_filter = ("status",)
+    list_select_related = ("vendor",)
+
+
+@admin.register(ExpirationCalendar)
+class ExpirationCalendarAdmin(admin.ModelAdmin):
+    list_display = ("day", "vendor", "count", "seats")
+    list_select_related = ("vendor",)
+    date_hierarchy = "day"
+
+
+@admin.register(Seat)
+class SeatAdmin(admin.ModelAdmin):
+    list_display = ("license", "number", "holder", "checked_out_at")
+    list_select_related = ("license__vendor", "holder")
+    raw_id_fields = ("license", "holder")
+
+
+@admin.register(NotificationDestination)
+class NotificationDestinationAdmin(admin.ModelAdmin):
+    list_display = ("name", "kind", "target", "enabled", "batch_size", "max_concurrency")
+    list_filter = ("kind", "enabled")
+    search_fields = ("name", "target")
+
+
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "destination", "event_type", "status", "attempts", "next_attempt_at", "delivered_at")
+    list_filter = ("status", "event_type", "destination")
+    list_select_related = ("destination",)
+    readonly_fields = ("batch", "claimed_at", "delivered_at", "last_error", "created_at")
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = ("occurred_at", "action", "license_id", "request_id")
+    list_filter = ("action",)
+    search_fields = ("=license_id", "=request_id")
+    date_hierarchy = "occurred_at"  # keeps queries on the partitions for the selected period
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
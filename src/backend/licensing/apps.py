@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class LicensingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'backend.licensing'
+    label = 'licensing'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,235 @@
+"""
+Cold archive tier for expired and revoked licenses.
+
+archive() moves licenses that have been expired or revoked for longer than
+LICENSE_ARCHIVE_AFTER_DAYS out of PostgreSQL into gzip-compressed NDJSON
+under ARCHIVE_DIR/licenses/<YYYY>/<MM>/, by the month the license expired
+(or was last updated, if it never expires). Files are written once and never
+modified. Each holds blocks of ARCHIVE_BLOCK_SIZE records, every block a
+separate gzip member, so a lookup inflates one block rather than the file.
+
+ARCHIVE_DIR/licenses/index.sqlite3 maps each license ID to the file, offset
+and length of its block, with a few columns for listing. fetch() uses it, and
+the API falls back to it for IDs that are no longer in the database.
+
+License keys are archived as stored, i.e. encrypted. Key rotation only
+rewrites live rows, so key versions used by archived rows must stay in
+FIELD_ENCRYPTION_KEYS for as long as the archive is kept.
+
+Each chunk is processed in order: its rows are locked, its files are written
+and fsynced, its index entries are committed, and only then are the rows
+deleted. A crash in between re-archives the same rows on the next run, and
+the index then points at the newer copy.
+"""
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from itertools import batched
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from backend import changefeed, crypto
+from backend.edge import purge_api_cache_on_commit
+from backend.fields import LazySecret
+
+from . import audit
+from .models import License, Seat
+from .notifications import license_payload
+from .summary import SummaryDelta
+
+logger = logging.getLogger("backend.licensing.archive")
+
+RECORD_FIELDS = (
+    "id", "vendor_id", "product", "license_key", "assigned_to_id", "seats", "status",
+    "expires_at", "notes", "metadata", "created_at", "updated_at",
+)
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    license_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    vendor_id INTEGER,
+    product TEXT,
+    status TEXT,
+    expires_at TEXT,
+    archived_at TEXT NOT NULL
+)
+"""
+
+
+def archive_root() -> Path:
+    return Path(settings.ARCHIVE_DIR) / "licenses"
+
+
+def open_index() -> sqlite3.Connection:
+    root = archive_root()
+    root.mkdir(parents=True, exist_ok=True)
+    index = sqlite3.connect(root / "index.sqlite3", timeout=30)
+    index.execute("PRAGMA journal_mode=WAL")  # web workers keep reading while the archiver writes
+    index.execute(INDEX_SCHEMA)
+    return index
+
+
+def eligible(older_than_days: int):
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return License.objects.filter(
+        Q(status__in=[License.Status.EXPIRED, License.Status.REVOKED], updated_at__lt=cutoff)
+        | Q(expires_at__lt=cutoff)
+    )
+
+
+def _fsync_dir(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_files(records: list[dict]) -> list[tuple]:
+    """Write records into this chunk's per-month files; returns their index entries."""
+    root = archive_root()
+    by_month = defaultdict(list)
+    for record in records:
+        when = record["expires_at"] or record["updated_at"]
+        by_month[f"{when:%Y}/{when:%m}"].append(record)
+
+    archived_at = timezone.now().isoformat()
+    name = f"licenses-{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.ndjson.gz"
+    entries = []
+    for month, month_records in sorted(by_month.items()):
+        directory = root / month
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / name
+        tmp = directory / f".{name}.tmp"
+        with open(tmp, "wb") as f:
+            for block in batched(month_records, settings.ARCHIVE_BLOCK_SIZE):
+                data = "".join(json.dumps(record, cls=DjangoJSONEncoder) + "\n" for record in block).encode()
+                member = gzip.compress(data, mtime=0)
+                offset = f.tell()
+                f.write(member)
+                entries.extend(
+                    (
+                        record["id"], f"{month}/{name}", offset, len(member), record["vendor_id"],
+                        record["product"], record["status"],
+                        record["expires_at"].isoformat() if record["expires_at"] else None, archived_at,
+                    )
+                    for record in block
+                )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(directory)
+    return entries
+
+
+def _remove(rows: list[dict]):
+    """
+    Delete archived rows with their seats. This is a plain DELETE rather than
+    queryset.delete(), whose per-row signals would announce the rows as deleted;
+    the summary tables, audit trail and change feed are updated here instead.
+    """
+    ids = [row["id"] for row in rows]
+    instances = [License(**row) for row in rows]
+
+    Seat.objects.filter(license_id__in=ids).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {connection.ops.quote_name(License._meta.db_table)} WHERE id = ANY(%s)", [ids])
+
+    delta = SummaryDelta()
+    for instance in instances:
+        delta.move(instance._summary_key, None)
+    delta.apply()
+
+    events = [("license.archived", license_payload(instance)) for instance in instances]
+    audit.record_many(events)
+    changefeed.publish_on_commit(events)
+    purge_api_cache_on_commit("licenses")
+
+
+def archive(older_than_days=None, chunk_size=None, dry_run=False, time_limit=None) -> tuple[int, bool]:
+    """
+    Archive eligible licenses a chunk at a time. Returns (rows archived,
+    finished); finished is False if `time_limit` seconds ran out first.
+    Rows locked by another transaction are skipped until the next run.
+    """
+    older_than_days = settings.LICENSE_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    chunk_size = chunk_size or settings.ARCHIVE_CHUNK_SIZE
+    candidates = eligible(older_than_days).order_by("pk")
+    if dry_run:
+        return candidates.count(), True
+
+    started = time.monotonic()
+    last_pk = 0
+    total = 0
+    index = open_index()
+    try:
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    candidates.filter(pk__gt=last_pk).select_for_update(skip_locked=True).values(*RECORD_FIELDS)[:chunk_size]
+                )
+                if not rows:
+                    return total, True
+                last_pk = rows[-1]["id"]
+                for row in rows:
+                    if isinstance(row["license_key"], LazySecret):
+                        row["license_key"] = row["license_key"].ciphertext
+
+                entries = write_files(rows)
+                with index:
+                    index.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", entries)
+                _remove(rows)
+            total += len(rows)
+            logger.info("Archived %s licenses up to id %s", total, last_pk)
+            if time_limit and time.monotonic() - started >= time_limit:
+                return total, False
+    finally:
+        index.close()
+
+
+def fetch(license_id) -> dict | None:
+    """The archived record for a license ID, or None if it was never archived."""
+    try:
+        license_id = int(license_id)
+    except (TypeError, ValueError):
+        return None
+    path = archive_root() / "index.sqlite3"
+    if not path.exists():
+        return None
+    index = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+    try:
+        entry = index.execute("SELECT path, offset, length FROM entries WHERE license_id = ?", (license_id,)).fetchone()
+    finally:
+        index.close()
+    if entry is None:
+        return None
+
+    relative, offset, length = entry
+    with open(archive_root() / relative, "rb") as f:
+        f.seek(offset)
+        member = f.read(length)
+    for line in gzip.decompress(member).splitlines():
+        record = json.loads(line)
+        if record["id"] == license_id:
+            return record
+    return None
+
+
+def reveal(record: dict) -> dict:
+    """Record with its license key decrypted, for display."""
+    return {**record, "license_key": crypto.decrypt(record["license_key"]) if record["license_key"] else ""}
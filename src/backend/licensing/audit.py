@@ -0,0 +1,24 @@
+"""
+License audit trail (AuditEvent). Rows are written in the same transaction
+as the change they record, tagged with the request ID from backend.jsonlog
+so an entry can be matched to its access and application log lines.
+"""
+
+from backend.jsonlog import request_id_var
+
+from .models import AuditEvent
+
+
+def record_many(events) -> int:
+    """Record (action, license payload) pairs. Returns the rows written."""
+    request_id = request_id_var.get() or ""
+    rows = [
+        AuditEvent(action=action, license_id=payload.get("id"), request_id=request_id, payload=payload)
+        for action, payload in events
+    ]
+    AuditEvent.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def record(action: str, payload: dict) -> int:
+    return record_many([(action, payload)])
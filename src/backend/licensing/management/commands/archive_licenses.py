@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.licensing.archive import archive, fetch
+
+
+class Command(BaseCommand):
+    help = 'Move licenses expired or revoked for longer than LICENSE_ARCHIVE_AFTER_DAYS to the cold archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, help="Days since expiry/revocation (default LICENSE_ARCHIVE_AFTER_DAYS)")
+        parser.add_argument('--chunk-size', type=int, help="Rows per transaction (default ARCHIVE_CHUNK_SIZE)")
+        parser.add_argument('--dry-run', action='store_true', help="Count eligible licenses without moving them")
+        parser.add_argument('--async', dest='use_celery', action='store_true', help="Queue the Celery task instead of running here")
+        parser.add_argument('--lookup', type=int, metavar='ID', help="Print an archived license record and exit")
+
+    def handle(self, *args, **options):
+        if options['lookup'] is not None:
+            record = fetch(options['lookup'])
+            if record is None:
+                raise CommandError(f"License {options['lookup']} is not in the archive.")
+            for key, value in record.items():
+                self.stdout.write(f"{key}: {'<encrypted>' if key == 'license_key' and value else value}")
+            return
+
+        if options['use_celery']:
+            from backend.licensing.tasks import archive_licenses
+
+            archive_licenses.delay()
+            self.stdout.write(self.style.SUCCESS("Queued license archival."))
+            return
+
+        days = settings.LICENSE_ARCHIVE_AFTER_DAYS if options['older_than'] is None else options['older_than']
+        count, _ = archive(days, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        verb = 'would be archived' if options['dry_run'] else 'archived'
+        self.stdout.write(self.style.SUCCESS(f"{count} license(s) {verb} (older than {days} days)."))
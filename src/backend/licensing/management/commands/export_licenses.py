@@ -0,0 +1,45 @@
+import csv
+import json
+import sys
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from backend.api.serializers import LicenseSerializer
+from backend.fields import reveal_all
+from backend.licensing.models import License
+
+
+class Command(BaseCommand):
+    help = 'Stream every license, with decrypted keys, as JSON lines or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+        parser.add_argument('--output', default='-', help="File to write (default: stdout)")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Rows fetched and decrypted per batch")
+
+    def handle(self, *args, **options):
+        out = sys.stdout if options['output'] == '-' else open(options['output'], 'w', newline='')
+        fields = list(LicenseSerializer.Meta.fields)
+        writer = None
+        if options['format'] == 'csv':
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+
+        rows = License.objects.select_related('vendor').order_by('pk').iterator(chunk_size=options['chunk_size'])
+        count = 0
+        try:
+            for chunk in batched(rows, options['chunk_size']):
+                reveal_all(chunk, 'license_key')
+                for item in LicenseSerializer(chunk, many=True).data:
+                    if writer:
+                        item['metadata'] = json.dumps(item['metadata'])
+                        writer.writerow(item)
+                    else:
+                        out.write(json.dumps(item, cls=DjangoJSONEncoder) + '\n')
+                count += len(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        self.stderr.write(self.style.SUCCESS(f"Exported {count} licenses."))
@@ -0,0 +1,75 @@
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Run a local HTTP endpoint that prints notification batches it receives. '
+        'Point a webhook or chat destination at http://127.0.0.1:<port>/ to '
+        'exercise batching, retries (--fail-rate) and concurrency limits (--delay).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8025)
+        parser.add_argument('--fail-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+        parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before answering")
+        parser.add_argument('--secret', default='', help="Verify X-Licman-Signature with this key")
+
+    def handle(self, *args, **options):
+        command = self
+        active = [0, 0]  # in flight now, most seen at once
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is visible
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with lock:
+                    active[0] += 1
+                    active[1] = max(active)
+                try:
+                    time.sleep(options['delay'])
+                    self.report(body)
+                    code = 503 if random.random() < options['fail_rate'] else 200
+                    self.send_response(code)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                finally:
+                    with lock:
+                        active[0] -= 1
+
+            def report(self, body):
+                signature = ''
+                if options['secret']:
+                    expected = 'sha256=' + hmac.new(options['secret'].encode(), body, hashlib.sha256).hexdigest()
+                    ok = hmac.compare_digest(expected, self.headers.get('X-Licman-Signature', ''))
+                    signature = ' signature ok' if ok else ' BAD SIGNATURE'
+                try:
+                    payload = json.loads(body)
+                    size = len(payload['events']) if 'events' in payload else 1
+                except (ValueError, TypeError):
+                    size = '?'
+                command.stdout.write(
+                    f"{self.client_address[0]}:{self.client_address[1]} {self.path} "
+                    f"batch of {size}{signature} (in flight {active[0]}, max {active[1]})"
+                )
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), Handler)
+        self.stdout.write(f"Notification stub listening on http://127.0.0.1:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
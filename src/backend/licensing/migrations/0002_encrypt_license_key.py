@@ -0,0 +1,30 @@
+from django.db import migrations
+
+import backend.crypto
+import backend.fields
+
+
+def encrypt_existing(apps, schema_editor):
+    License = apps.get_model('licensing', 'License')
+    rows = License.objects.exclude(license_key='').values_list('pk', 'license_key')
+    for pk, value in rows.iterator(chunk_size=500):
+        raw = value.ciphertext if isinstance(value, backend.fields.LazySecret) else value
+        if raw and not backend.crypto.is_encrypted(raw):
+            # Assigning plaintext makes the field encrypt it.
+            License.objects.filter(pk=pk).update(license_key=raw)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='license',
+            name='license_key',
+            field=backend.fields.EncryptedTextField(blank=True),
+        ),
+        migrations.RunPython(encrypt_existing, migrations.RunPython.noop),
+    ]
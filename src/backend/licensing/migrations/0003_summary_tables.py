@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build(apps, schema_editor):
+    from backend.licensing.summary import rebuild
+
+    rebuild(
+        apps.get_model('licensing', 'License'),
+        apps.get_model('licensing', 'LicenseStatusSummary'),
+        apps.get_model('licensing', 'ExpirationCalendar'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0002_encrypt_license_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseStatusSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('expired', 'Expired'), ('revoked', 'Revoked')], max_length=16)),
+                ('count', models.IntegerField(default=0)),
+                ('seats', models.BigIntegerField(default=0)),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='licensing.vendor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('vendor', 'status'), name='licensing_status_summary_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpirationCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('seats', models.BigIntegerField(default=0)),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='licensing.vendor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'vendor'), name='licensing_expiration_calendar_unique')],
+            },
+        ),
+        migrations.RunPython(build, migrations.RunPython.noop),
+    ]
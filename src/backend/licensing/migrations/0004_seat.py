@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0003_summary_tables'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Seat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('checked_out_at', models.DateTimeField(blank=True, null=True)),
+                ('holder', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='seats', to=settings.AUTH_USER_MODEL)),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_rows', to='licensing.license')),
+            ],
+            options={
+                'ordering': ['license', 'number'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('license', 'number'), name='licensing_seat_number_unique'),
+                    models.UniqueConstraint(condition=models.Q(('holder__isnull', False)), fields=('license', 'holder'), name='licensing_seat_holder_unique'),
+                ],
+            },
+        ),
+    ]
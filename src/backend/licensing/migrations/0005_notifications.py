@@ -0,0 +1,55 @@
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+import backend.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0004_seat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDestination',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('kind', models.CharField(choices=[('webhook', 'Webhook'), ('chat', 'Chat (Slack-compatible incoming webhook)'), ('email', 'Email')], default='webhook', max_length=16)),
+                ('target', models.CharField(max_length=1024)),
+                ('secret', backend.fields.EncryptedTextField(blank=True)),
+                ('event_types', models.JSONField(blank=True, default=list)),
+                ('batch_size', models.PositiveIntegerField(default=50)),
+                ('max_concurrency', models.PositiveSmallIntegerField(default=2)),
+                ('enabled', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=64)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('delivered', 'Delivered'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('batch', models.UUIDField(blank=True, null=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('destination', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='licensing.notificationdestination')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['destination', 'status', 'next_attempt_at'], name='licensing_notif_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+# PostgreSQL requires the partition key in the primary key; Django still
+# addresses rows by the identity column alone.
+PARTITIONED_TABLE = """
+CREATE TABLE licensing_auditevent (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    occurred_at timestamp with time zone NOT NULL,
+    action varchar(64) NOT NULL,
+    license_id bigint NULL,
+    request_id varchar(64) NOT NULL,
+    payload jsonb NOT NULL,
+    PRIMARY KEY (id, occurred_at)
+) PARTITION BY RANGE (occurred_at);
+CREATE INDEX licensing_audit_license_idx ON licensing_auditevent (license_id, occurred_at);
+"""
+
+
+class CreatePartitionedModel(migrations.CreateModel):
+    """
+    CreateModel whose table is range-partitioned on PostgreSQL. Other
+    backends get the plain table; reversing drops it either way.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        schema_editor.execute(PARTITIONED_TABLE)
+
+        from backend.partitions import maintain
+
+        maintain(['licensing_auditevent'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0005_notifications'),
+    ]
+
+    operations = [
+        CreatePartitionedModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('action', models.CharField(max_length=64)),
+                ('license_id', models.BigIntegerField(blank=True, null=True)),
+                ('request_id', models.CharField(blank=True, max_length=64)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+            ],
+            options={
+                'ordering': ['-occurred_at'],
+                'indexes': [models.Index(fields=['license_id', 'occurred_at'], name='licensing_audit_license_idx')],
+            },
+        ),
+    ]
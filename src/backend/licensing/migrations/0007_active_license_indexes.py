@@ -0,0 +1,22 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without locking out writes on a large licenses table.
+    atomic = False
+
+    dependencies = [
+        ('licensing', '0006_auditevent'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='license',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['expires_at'], name='licensing_active_expiry_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='license',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['vendor'], name='licensing_active_vendor_idx'),
+        ),
+    ]
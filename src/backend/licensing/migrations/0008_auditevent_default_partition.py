@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_default(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from backend.partitions import create_default
+
+    with schema_editor.connection.cursor() as cursor:
+        create_default(cursor, 'licensing_auditevent')
+
+
+def drop_default(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from backend.partitions import PARTITIONED_TABLES, default_name, drain_default
+
+    column, _ = PARTITIONED_TABLES['licensing_auditevent']
+    with schema_editor.connection.cursor() as cursor:
+        drain_default(cursor, 'licensing_auditevent', column)
+    schema_editor.execute(f"DROP TABLE IF EXISTS {schema_editor.quote_name(default_name('licensing_auditevent'))}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0007_active_license_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default, drop_default),
+    ]
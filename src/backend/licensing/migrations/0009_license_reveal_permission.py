@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0008_auditevent_default_partition'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='license',
+            options={'ordering': ['-id'], 'permissions': [('reveal_license_key', 'Can list licenses with decrypted keys')]},
+        ),
+    ]
@@ -0,0 +1,210 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from backend.fields import EncryptedTextField
+
+
+class Vendor(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    website = models.URLField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class License(models.Model):
+    class Status(models.TextChoices):
+        ACTIVE = "active", "Active"
+        EXPIRED = "expired", "Expired"
+        REVOKED = "revoked", "Revoked"
+
+    vendor = models.ForeignKey(Vendor, on_delete=models.PROTECT, related_name="licenses")
+    product = models.CharField(max_length=255)
+    license_key = EncryptedTextField(blank=True)
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="licenses",
+    )
+    seats = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.ACTIVE, db_index=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    notes = models.TextField(blank=True)
+    metadata = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-id"]
+        permissions = [
+            ("reveal_license_key", "Can list licenses with decrypted keys"),
+        ]
+        indexes = [
+            # Most rows end up expired or revoked; the hot queries only ever want active ones.
+            models.Index(fields=["expires_at"], condition=models.Q(status="active"), name="licensing_active_expiry_idx"),
+            models.Index(fields=["vendor"], condition=models.Q(status="active"), name="licensing_active_vendor_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.vendor} {self.product} #{self.pk}"
+
+
+class LicenseStatusSummary(models.Model):
+    """
+    License and seat counts per vendor and status. Maintained incrementally
+    by backend.licensing.summary and rebuilt periodically; read by the dashboard.
+    """
+
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name="+")
+    status = models.CharField(max_length=16, choices=License.Status.choices)
+    count = models.IntegerField(default=0)
+    seats = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["vendor", "status"], name="licensing_status_summary_unique"),
+        ]
+
+
+class ExpirationCalendar(models.Model):
+    """
+    Active licenses (and their seats) expiring on each local calendar day, per
+    vendor. Expiry buckets and weekly totals are sums over this table.
+    """
+
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+    seats = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "vendor"], name="licensing_expiration_calendar_unique"),
+        ]
+
+
+class Seat(models.Model):
+    """
+    One row per seat of a license. Checkouts claim a free row with
+    SELECT ... FOR UPDATE SKIP LOCKED (see backend.licensing.seats), so
+    concurrent checkouts on one license lock different rows.
+    """
+
+    license = models.ForeignKey(License, on_delete=models.CASCADE, related_name="seat_rows")
+    number = models.PositiveIntegerField()
+    holder = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="seats",
+    )
+    checked_out_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["license", "number"]
+        constraints = [
+            models.UniqueConstraint(fields=["license", "number"], name="licensing_seat_number_unique"),
+            models.UniqueConstraint(
+                fields=["license", "holder"],
+                condition=models.Q(holder__isnull=False),
+                name="licensing_seat_holder_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.license_id} seat {self.number}"
+
+
+class NotificationDestination(models.Model):
+    """Somewhere license events are delivered (see backend.licensing.notifications)."""
+
+    class Kind(models.TextChoices):
+        WEBHOOK = "webhook", "Webhook"
+        CHAT = "chat", "Chat (Slack-compatible incoming webhook)"
+        EMAIL = "email", "Email"
+
+    name = models.CharField(max_length=255, unique=True)
+    kind = models.CharField(max_length=16, choices=Kind.choices, default=Kind.WEBHOOK)
+    # URL for webhook/chat, comma-separated addresses for email
+    target = models.CharField(max_length=1024)
+    # Webhook bodies are signed with HMAC-SHA256 under this key when set
+    secret = EncryptedTextField(blank=True)
+    # Event types to deliver, e.g. ["license.expiring"]; empty means all
+    event_types = models.JSONField(default=list, blank=True)
+    batch_size = models.PositiveIntegerField(default=50)
+    max_concurrency = models.PositiveSmallIntegerField(default=2)
+    enabled = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+    def wants(self, event_type: str) -> bool:
+        return not self.event_types or event_type in self.event_types
+
+
+class NotificationEvent(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        DELIVERED = "delivered", "Delivered"
+        FAILED = "failed", "Failed"
+
+    destination = models.ForeignKey(NotificationDestination, on_delete=models.CASCADE, related_name="events")
+    event_type = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Set while a worker is sending the event as part of a batch
+    batch = models.UUIDField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["destination", "status", "next_attempt_at"], name="licensing_notif_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} -> {self.destination_id} ({self.status})"
+
+
+class AuditEvent(models.Model):
+    """
+    Append-only history of license changes. On PostgreSQL the table is
+    partitioned by month on occurred_at and old months are dropped after
+    AUDIT_RETENTION_MONTHS (see backend.partitions); filter on occurred_at
+    so queries only touch the months they need.
+    """
+
+    occurred_at = models.DateTimeField(default=timezone.now)
+    action = models.CharField(max_length=64)
+    # Not a foreign key: the history outlives the license.
+    license_id = models.BigIntegerField(null=True, blank=True)
+    request_id = models.CharField(max_length=64, blank=True)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ["-occurred_at"]
+        indexes = [
+            models.Index(fields=["license_id", "occurred_at"], name="licensing_audit_license_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} #{self.license_id} at {self.occurred_at:%Y-%m-%d %H:%M:%S}"
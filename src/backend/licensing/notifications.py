@@ -0,0 +1,264 @@
+"""
+Outbound notifications (webhooks, chat, email) for license events.
+
+notify() records one NotificationEvent per subscribed destination inside the
+caller's transaction, and once it commits queues deliver_notifications for
+each destination. Delivery:
+
+  * claims pending events in batches of destination.batch_size and sends each
+    batch as one request (one webhook call, one chat message, one email);
+  * keeps at most destination.max_concurrency batches in flight per
+    destination across all workers. Claims are serialized on the destination
+    row; sends are not;
+  * sends HTTP through a per-process keep-alive pool (backend.httppool);
+  * retries a failed batch after a capped exponential backoff with full
+    jitter, and gives up after NOTIFICATION_MAX_ATTEMPTS;
+  * reclaims a batch whose worker died once its NOTIFICATION_LEASE expires.
+
+Retries and reclaimed batches are picked up by the deliver_pending_notifications
+beat task. `manage.py notification_stub` runs a local endpoint to point a
+destination at.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+import uuid
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from backend.httppool import ConnectionPool
+
+from .models import License, NotificationDestination, NotificationEvent
+
+logger = logging.getLogger("backend.licensing.notifications")
+
+Status = NotificationEvent.Status
+
+# Subscriptions are re-read at most this often per process, so license writes
+# do not each pay for a destinations query. Changes saved in this process
+# apply at once (see signals.forget_subscriptions); disable a destination
+# rather than deleting it, or other processes may queue events for it until
+# their copy expires.
+SUBSCRIPTIONS_TTL = 30.0
+_subscriptions = (0.0, [])
+
+
+class DeliveryError(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def http_pool() -> ConnectionPool:
+    return ConnectionPool(timeout=settings.NOTIFICATION_HTTP_TIMEOUT)
+
+
+def subscriptions() -> list[NotificationDestination]:
+    global _subscriptions
+    expires, destinations = _subscriptions
+    if time.monotonic() >= expires:
+        destinations = list(NotificationDestination.objects.filter(enabled=True).only("id", "event_types"))
+        _subscriptions = (time.monotonic() + SUBSCRIPTIONS_TTL, destinations)
+    return destinations
+
+
+def forget_subscriptions():
+    global _subscriptions
+    _subscriptions = (0.0, [])
+
+
+def notify_many(events) -> int:
+    """Record (event_type, payload) pairs for every subscribed destination. Returns the rows created."""
+    destinations = subscriptions()
+    rows = [
+        NotificationEvent(destination_id=destination.pk, event_type=event_type, payload=payload)
+        for event_type, payload in events
+        for destination in destinations
+        if destination.wants(event_type)
+    ]
+    if not rows:
+        return 0
+    NotificationEvent.objects.bulk_create(rows, batch_size=500)
+    destination_ids = sorted({row.destination_id for row in rows})
+    transaction.on_commit(lambda: schedule(destination_ids))
+    return len(rows)
+
+
+def notify(event_type: str, payload: dict) -> int:
+    return notify_many([(event_type, payload)])
+
+
+def schedule(destination_ids):
+    from .tasks import deliver_notifications
+
+    for destination_id in destination_ids:
+        deliver_notifications.delay(destination_id)
+
+
+def license_payload(instance: License) -> dict:
+    return {
+        "id": instance.pk,
+        "vendor": instance.vendor_id,
+        "product": instance.product,
+        "status": instance.status,
+        "seats": instance.seats,
+        "expires_at": instance.expires_at,
+    }
+
+
+def expiration_digest(days: int) -> dict:
+    """Active licenses expiring in the next `days` days, soonest first."""
+    now = timezone.now()
+    licenses = (
+        License.objects.filter(status=License.Status.ACTIVE, expires_at__gte=now, expires_at__lt=now + timedelta(days=days))
+        .order_by("expires_at")
+        .values("id", "vendor__name", "product", "seats", "expires_at")
+    )
+    return {
+        "days": days,
+        "licenses": [
+            {"id": row["id"], "vendor": row["vendor__name"], "product": row["product"],
+             "seats": row["seats"], "expires_at": row["expires_at"]}
+            for row in licenses[:1000]
+        ],
+    }
+
+
+def backoff(attempt: int) -> float:
+    """Seconds before retry number `attempt` (1-based): full jitter over a capped exponential."""
+    ceiling = min(settings.NOTIFICATION_RETRY_CAP, settings.NOTIFICATION_RETRY_BASE * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+def claim(destination_id):
+    """
+    Claim the next batch for a destination: (destination, batch id, events),
+    or None if nothing is due or the destination is at its concurrency limit.
+    """
+    now = timezone.now()
+    lease_start = now - timedelta(seconds=settings.NOTIFICATION_LEASE)
+    with transaction.atomic():
+        destination = NotificationDestination.objects.select_for_update().filter(pk=destination_id, enabled=True).first()
+        if destination is None:
+            return None
+        events = NotificationEvent.objects.filter(destination=destination)
+        in_flight = (
+            events.filter(status=Status.SENDING, claimed_at__gte=lease_start).values("batch").distinct().count()
+        )
+        if in_flight >= destination.max_concurrency:
+            return None
+        due = Q(status=Status.PENDING, next_attempt_at__lte=now) | Q(status=Status.SENDING, claimed_at__lt=lease_start)
+        ids = list(events.filter(due).order_by("id").values_list("id", flat=True)[:destination.batch_size])
+        if not ids:
+            return None
+        batch = uuid.uuid4()
+        NotificationEvent.objects.filter(pk__in=ids).update(status=Status.SENDING, batch=batch, claimed_at=now)
+    return destination, batch, list(NotificationEvent.objects.filter(batch=batch).order_by("id"))
+
+
+def describe(event: NotificationEvent) -> str:
+    payload = event.payload
+    if event.event_type == "license.expiring":
+        lines = [f"{len(payload['licenses'])} license(s) expire within {payload['days']} days:"]
+        lines += [f"  {l['vendor']} {l['product']} #{l['id']} on {l['expires_at'][:10]}" for l in payload["licenses"]]
+        return "\n".join(lines)
+    if event.event_type.startswith("license."):
+        return f"{event.event_type}: {payload.get('product')} #{payload.get('id')} ({payload.get('status')})"
+    return f"{event.event_type}: {json.dumps(payload)}"
+
+
+def render(destination: NotificationDestination, events) -> dict:
+    if destination.kind == NotificationDestination.Kind.CHAT:
+        return {"text": "\n".join(describe(event) for event in events)}
+    return {
+        "events": [
+            {"id": event.pk, "type": event.event_type, "created_at": event.created_at, "data": event.payload}
+            for event in events
+        ]
+    }
+
+
+def send(destination: NotificationDestination, events):
+    if destination.kind == NotificationDestination.Kind.EMAIL:
+        recipients = [address.strip() for address in destination.target.split(",") if address.strip()]
+        send_mail(
+            f"[licman] {len(events)} license notification(s)",
+            "\n\n".join(describe(event) for event in events),
+            None,
+            recipients,
+        )
+        return
+
+    body = json.dumps(render(destination, events), cls=DjangoJSONEncoder).encode()
+    headers = {"Content-Type": "application/json", "User-Agent": "licman-notifications"}
+    if destination.secret:
+        digest = hmac.new(str(destination.secret).encode(), body, hashlib.sha256).hexdigest()
+        headers["X-Licman-Signature"] = f"sha256={digest}"
+    status, data = http_pool().request("POST", destination.target, body=body, headers=headers)
+    if status >= 300:
+        raise DeliveryError(f"HTTP {status}: {data[:200].decode(errors='replace')}")
+
+
+def finish(batch, error: Exception | None = None):
+    events = NotificationEvent.objects.filter(batch=batch)
+    if error is None:
+        events.update(status=Status.DELIVERED, delivered_at=timezone.now(), batch=None, last_error="")
+        return
+    # The batch is retried as a unit, so it backs off as far as its most-tried event.
+    attempt = max(events.values_list("attempts", flat=True), default=0) + 1
+    failed = {
+        "attempts": F("attempts") + 1,
+        "batch": None,
+        "claimed_at": None,
+        "last_error": f"{type(error).__name__}: {error}"[:2000],
+    }
+    events.filter(attempts__gte=settings.NOTIFICATION_MAX_ATTEMPTS - 1).update(status=Status.FAILED, **failed)
+    events.update(
+        status=Status.PENDING,
+        next_attempt_at=timezone.now() + timedelta(seconds=backoff(attempt)),
+        **failed,
+    )
+
+
+def deliver(destination_id, time_limit: float = 60.0) -> int:
+    """
+    Send due batches for one destination until none are left, a slot is not
+    free, a send fails, or `time_limit` seconds pass. Returns events delivered.
+    """
+    started = time.monotonic()
+    delivered = 0
+    while time.monotonic() - started < time_limit:
+        claimed = claim(destination_id)
+        if claimed is None:
+            break
+        destination, batch, events = claimed
+        try:
+            send(destination, events)
+        except Exception as e:
+            logger.warning("Delivery of %s event(s) to %s failed: %s", len(events), destination, e)
+            finish(batch, e)
+            break  # the destination is likely down; retries are scheduled
+        finish(batch)
+        delivered += len(events)
+    return delivered
+
+
+def due_destinations() -> list[int]:
+    """Destinations with events due for a retry or whose lease has expired."""
+    now = timezone.now()
+    lease_start = now - timedelta(seconds=settings.NOTIFICATION_LEASE)
+    due = Q(status=Status.PENDING, next_attempt_at__lte=now) | Q(status=Status.SENDING, claimed_at__lt=lease_start)
+    return list(
+        NotificationEvent.objects.filter(due, destination__enabled=True)
+        .order_by().values_list("destination_id", flat=True).distinct()
+    )
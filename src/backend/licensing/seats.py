@@ -0,0 +1,120 @@
+"""
+Seat checkout for floating and volume licenses.
+
+Each seat is its own Seat row, created on demand up to License.seats. A
+checkout claims the lowest free seat with SELECT ... FOR UPDATE SKIP LOCKED:
+concurrent checkouts skip rows another transaction is claiming instead of
+queueing behind it, so a burst of checkouts against one license proceeds in
+parallel and no transaction ever locks the license row or a shared counter.
+
+Seat rows can drift from their license (seats reduced, license revoked or
+expired, bulk writes); reconcile() repairs that and runs periodically from
+Celery beat.
+"""
+
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import License, Seat
+
+logger = logging.getLogger("backend.licensing.seats")
+
+
+class SeatUnavailable(Exception):
+    pass
+
+
+def _checkable(license_id):
+    """The seat count of a license that can be checked out from; raises SeatUnavailable otherwise."""
+    row = License.objects.filter(pk=license_id).values("status", "seats", "expires_at").first()
+    if row is None:
+        raise SeatUnavailable(f"License {license_id} does not exist.")
+    if row["status"] != License.Status.ACTIVE or (row["expires_at"] and row["expires_at"] <= timezone.now()):
+        raise SeatUnavailable(f"License {license_id} is not active.")
+    return row["seats"]
+
+
+def provision(license_id, seats: int) -> int:
+    """Create any missing seat rows 1..seats. Returns the number created."""
+    existing = set(Seat.objects.filter(license_id=license_id).values_list("number", flat=True))
+    missing = [Seat(license_id=license_id, number=n) for n in range(1, seats + 1) if n not in existing]
+    # ignore_conflicts: a concurrent checkout may be provisioning the same license.
+    Seat.objects.bulk_create(missing, batch_size=1000, ignore_conflicts=True)
+    return len(missing)
+
+
+def checkout(license_id, user) -> Seat:
+    """
+    Give `user` a seat on the license, or return the one they already hold.
+    Raises SeatUnavailable if the license is inactive or every seat is taken
+    (or being taken by a concurrent checkout).
+    """
+    seats = _checkable(license_id)
+    held = Seat.objects.filter(license_id=license_id, holder=user).first()
+    if held:
+        return held
+
+    for attempt in range(2):
+        with transaction.atomic():
+            seat = (
+                Seat.objects.select_for_update(skip_locked=True)
+                .filter(license_id=license_id, holder__isnull=True, number__lte=seats)
+                .order_by("number")
+                .first()
+            )
+            if seat is not None:
+                seat.holder = user
+                seat.checked_out_at = timezone.now()
+                try:
+                    with transaction.atomic():
+                        seat.save(update_fields=["holder", "checked_out_at"])
+                except IntegrityError:
+                    # The same user won a seat in a concurrent request.
+                    return Seat.objects.get(license_id=license_id, holder=user)
+                return seat
+        if attempt or not provision(license_id, seats):
+            break
+    raise SeatUnavailable(f"No free seat on license {license_id}.")
+
+
+def release(license_id, user) -> bool:
+    """Free the seat `user` holds on the license. Returns False if they held none."""
+    return bool(
+        Seat.objects.filter(license_id=license_id, holder=user).update(holder=None, checked_out_at=None)
+    )
+
+
+def reconcile(chunk_size: int = 500) -> dict:
+    """
+    Bring seat rows back in line with their licenses:
+
+      * provision missing rows for licenses with fewer rows than seats;
+      * delete free rows numbered beyond a reduced seat count;
+      * release seats held on revoked, expired or past-expiry licenses.
+
+    Held seats beyond a reduced seat count are left with their holders (a
+    release frees them for good) and reported as over-allocated.
+    """
+    stats = {"provisioned": 0, "removed": 0, "released": 0, "over_allocated": 0}
+
+    short = (
+        License.objects.filter(status=License.Status.ACTIVE)
+        .annotate(rows=Count("seat_rows"))
+        .filter(rows__lt=F("seats"))
+        .values_list("pk", "seats")
+    )
+    for license_id, seats in short.iterator(chunk_size=chunk_size):
+        stats["provisioned"] += provision(license_id, seats)
+
+    stats["removed"] = Seat.objects.filter(holder__isnull=True, number__gt=F("license__seats")).delete()[0]
+
+    inactive = ~Q(license__status=License.Status.ACTIVE) | Q(license__expires_at__lte=timezone.now())
+    stats["released"] = Seat.objects.filter(inactive, holder__isnull=False).update(holder=None, checked_out_at=None)
+
+    stats["over_allocated"] = Seat.objects.filter(holder__isnull=False, number__gt=F("license__seats")).count()
+    if any(stats.values()):
+        logger.info("Seat reconciliation: %s", stats)
+    return stats
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from backend import changefeed
+from backend.edge import purge_api_cache_on_commit
+
+from . import audit, notifications, summary
+from .models import License, NotificationDestination, Vendor
+
+
+@receiver([post_save, post_delete], sender=License)
+@receiver([post_save, post_delete], sender=Vendor)
+def purge_license_cache(sender, **kwargs):
+    # Vendor names are rendered into license payloads, so both purge 'licenses'.
+    purge_api_cache_on_commit("licenses")
+
+
+@receiver([post_save, post_delete], sender=NotificationDestination)
+def forget_subscriptions(sender, **kwargs):
+    notifications.forget_subscriptions()
+
+
+@receiver(post_init, sender=License)
+def remember_summary_key(sender, instance, **kwargs):
+    summary.snapshot(instance)
+
+
+@receiver(post_save, sender=License)
+def update_summary_on_save(sender, instance, created, **kwargs):
+    new = summary.summary_key(instance)
+    delta = summary.SummaryDelta()
+    delta.move(None if created else getattr(instance, "_summary_key", summary.UNKNOWN), new)
+    delta.apply()
+    instance._summary_key = new
+
+
+@receiver(post_delete, sender=License)
+def update_summary_on_delete(sender, instance, **kwargs):
+    delta = summary.SummaryDelta()
+    delta.move(getattr(instance, "_summary_key", summary.UNKNOWN), None)
+    delta.apply()
+
+
+def announce(event_type: str, instance: License):
+    """Record a license change in the audit trail, notify destinations and publish it to the change feed."""
+    payload = notifications.license_payload(instance)
+    audit.record(event_type, payload)
+    notifications.notify(event_type, payload)
+    changefeed.publish_on_commit([(event_type, payload)])
+
+
+@receiver(post_save, sender=License)
+def announce_license_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        announce("license.created" if created else "license.updated", instance)
+
+
+@receiver(post_delete, sender=License)
+def announce_license_deleted(sender, instance, **kwargs):
+    announce("license.deleted", instance)
@@ -0,0 +1,148 @@
+"""
+Dashboard summary tables (LicenseStatusSummary, ExpirationCalendar).
+
+Every license write is turned into a delta against the summary rows it moves
+between: the row's summary key is snapshotted when it is loaded, and on save
+or delete the old key is decremented and the new one incremented with
+UPDATE ... SET count = count + n, in the writer's transaction. The batch API
+collects the deltas of a whole batch and applies one UPDATE per summary row.
+
+Writes that bypass both (queryset.update(), raw SQL, restores) are caught by
+rebuild(), which the refresh_license_summaries task runs periodically.
+"""
+
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+UNKNOWN = object()
+
+KEY_FIELDS = ("vendor_id", "status", "expires_at", "seats")
+
+
+def summary_key(instance):
+    """
+    (vendor_id, status, local expiry date, seats), or UNKNOWN if any of them
+    is deferred; reading a deferred field here would cost a query per row.
+    """
+    values = instance.__dict__
+    if any(name not in values for name in KEY_FIELDS):
+        return UNKNOWN
+    day = values["expires_at"]
+    if day is not None:
+        day = timezone.localdate(day) if timezone.is_aware(day) else day.date()
+    return values["vendor_id"], values["status"], day, values["seats"] or 0
+
+
+def snapshot(instance):
+    instance._summary_key = summary_key(instance) if instance.pk is not None else None
+
+
+class SummaryDelta:
+    """Accumulates summary changes and applies them with one UPDATE per touched row."""
+
+    def __init__(self):
+        self.by_status = defaultdict(lambda: [0, 0])
+        self.by_day = defaultdict(lambda: [0, 0])
+        self.stale = False
+
+    def move(self, old, new):
+        """Record a row moving from summary key `old` to `new` (None: absent)."""
+        if old is UNKNOWN or new is UNKNOWN:
+            self.stale = True
+            return
+        if old == new:
+            return
+        for key, sign in ((old, -1), (new, 1)):
+            if key is None:
+                continue
+            vendor_id, status, day, seats = key
+            self._add(self.by_status[(vendor_id, status)], sign, seats)
+            if day is not None and status == "active":
+                self._add(self.by_day[(vendor_id, day)], sign, seats)
+
+    @staticmethod
+    def _add(totals, sign, seats):
+        totals[0] += sign
+        totals[1] += sign * seats
+
+    def apply(self):
+        from .models import ExpirationCalendar, LicenseStatusSummary
+
+        for model, fields, changes in (
+            (LicenseStatusSummary, ("vendor_id", "status"), self.by_status),
+            (ExpirationCalendar, ("vendor_id", "day"), self.by_day),
+        ):
+            # Sorted, so concurrent writers lock summary rows in the same order.
+            for key, (count, seats) in sorted(changes.items(), key=lambda item: tuple(map(str, item[0]))):
+                if count or seats:
+                    bump(model, dict(zip(fields, key)), count, seats)
+        if self.stale:
+            transaction.on_commit(schedule_refresh)
+        self.by_status.clear()
+        self.by_day.clear()
+        self.stale = False
+
+
+def bump(model, lookup: dict, count: int, seats: int):
+    updated = model.objects.filter(**lookup).update(count=F("count") + count, seats=F("seats") + seats)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, count=count, seats=seats)
+    except IntegrityError:
+        # Another writer created the row first.
+        model.objects.filter(**lookup).update(count=F("count") + count, seats=F("seats") + seats)
+
+
+def schedule_refresh():
+    from .tasks import refresh_license_summaries
+
+    refresh_license_summaries.delay()
+
+
+def rebuild(license_model=None, status_model=None, calendar_model=None):
+    """
+    Recompute both summary tables from the license table in one transaction.
+
+    Summary rows are zeroed first, which locks them: writers with a pending
+    delta finish before the counts are taken, and later deltas queue behind
+    the rebuild and land on the fresh totals. Rows left at zero are dropped.
+    """
+    from . import models
+
+    license_model = license_model or models.License
+    status_model = status_model or models.LicenseStatusSummary
+    calendar_model = calendar_model or models.ExpirationCalendar
+
+    with transaction.atomic():
+        status_model.objects.update(count=0, seats=0)
+        calendar_model.objects.update(count=0, seats=0)
+
+        by_status = (
+            license_model.objects.order_by()
+            .values("vendor_id", "status")
+            .annotate(n=Count("id"), total_seats=Coalesce(Sum("seats"), 0))
+        )
+        by_day = (
+            license_model.objects.filter(status="active", expires_at__isnull=False)
+            .order_by()
+            .annotate(day=TruncDate("expires_at", tzinfo=timezone.get_current_timezone()))
+            .values("vendor_id", "day")
+            .annotate(n=Count("id"), total_seats=Coalesce(Sum("seats"), 0))
+        )
+        status_rows = status_model.objects.bulk_create(
+            [status_model(vendor_id=r["vendor_id"], status=r["status"], count=r["n"], seats=r["total_seats"]) for r in by_status],
+            batch_size=1000, update_conflicts=True, unique_fields=["vendor", "status"], update_fields=["count", "seats"],
+        )
+        calendar_rows = calendar_model.objects.bulk_create(
+            [calendar_model(vendor_id=r["vendor_id"], day=r["day"], count=r["n"], seats=r["total_seats"]) for r in by_day],
+            batch_size=1000, update_conflicts=True, unique_fields=["day", "vendor"], update_fields=["count", "seats"],
+        )
+        status_model.objects.filter(count=0, seats=0).delete()
+        calendar_model.objects.filter(count=0, seats=0).delete()
+    return len(status_rows), len(calendar_rows)
@@ -1,6 +1,51 @@
 from celery import shared_task
 
 @shared_task
-def send_license_report():
-    print("Generating license report...")
-    return True
+def send_license_report(days=None):
+    """Notify subscribers of active licenses expiring within NOTIFICATION_DIGEST_DAYS."""
+    from django.conf import settings
+
+    from .notifications import expiration_digest, notify
+
+    digest = expiration_digest(days or settings.NOTIFICATION_DIGEST_DAYS)
+    if digest["licenses"]:
+        notify("license.expiring", digest)
+    return len(digest["licenses"])
+
+@shared_task(ignore_result=True)
+def refresh_license_summaries():
+    """Rebuild the dashboard summary tables from the license table."""
+    from .summary import rebuild
+
+    return rebuild()
+
+@shared_task(ignore_result=True)
+def reconcile_seats():
+    """Repair seat rows that drifted from their licenses."""
+    from .seats import reconcile
+
+    return reconcile()
+
+@shared_task(ignore_result=True)
+def deliver_notifications(destination_id):
+    """Send due notification batches to one destination."""
+    from .notifications import deliver
+
+    return deliver(destination_id)
+
+@shared_task(ignore_result=True)
+def deliver_pending_notifications():
+    """Queue delivery for destinations with retries due or batches abandoned by a dead worker."""
+    from .notifications import due_destinations
+
+    for destination_id in due_destinations():
+        deliver_notifications.delay(destination_id)
+
+@shared_task(bind=True, acks_late=True, ignore_result=True)
+def archive_licenses(self, time_limit=240):
+    """Move long-expired and revoked licenses to the cold archive, re-queuing until done."""
+    from .archive import archive
+
+    _, finished = archive(time_limit=time_limit)
+    if not finished:
+        self.apply_async(kwargs={"time_limit": time_limit})
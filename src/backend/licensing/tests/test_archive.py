@@ -0,0 +1,88 @@
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.licensing import archive, seats
+from backend.licensing.models import AuditEvent, License, LicenseStatusSummary, Seat, Vendor
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+        settings_override = override_settings(
+            ARCHIVE_DIR=self.archive_dir.name, LICENSE_ARCHIVE_AFTER_DAYS=365, ARCHIVE_BLOCK_SIZE=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.vendor = Vendor.objects.create(name="Acme")
+        long_ago = timezone.now() - timedelta(days=400)
+        self.revoked = self.make_license("Old revoked", License.Status.REVOKED, updated_at=long_ago)
+        self.expired = self.make_license("Old expired", License.Status.EXPIRED, updated_at=long_ago)
+        self.lapsed = self.make_license("Lapsed", expires_at=long_ago)
+        self.recent = self.make_license("Recently revoked", License.Status.REVOKED)
+        self.active = self.make_license("Active")
+
+    def make_license(self, product, status=License.Status.ACTIVE, updated_at=None, **fields):
+        license = License.objects.create(
+            vendor=self.vendor, product=product, status=status, license_key=f"KEY-{product}", seats=2, **fields
+        )
+        if updated_at:
+            License.objects.filter(pk=license.pk).update(updated_at=updated_at)  # bypasses auto_now
+        return license
+
+    def archived(self):
+        return [self.revoked, self.expired, self.lapsed]
+
+    def test_dry_run_only_counts(self):
+        self.assertEqual(archive.archive(dry_run=True), (3, True))
+        self.assertEqual(License.objects.count(), 5)
+
+    def test_archive_moves_eligible_licenses_out_of_the_database(self):
+        seats.provision(self.lapsed.pk, 2)
+
+        self.assertEqual(archive.archive(chunk_size=2), (3, True))
+
+        self.assertEqual(
+            set(License.objects.values_list("pk", flat=True)), {self.recent.pk, self.active.pk}
+        )
+        self.assertFalse(Seat.objects.filter(license_id=self.lapsed.pk).exists())
+        self.assertEqual(
+            set(AuditEvent.objects.filter(action="license.archived").values_list("license_id", flat=True)),
+            {license.pk for license in self.archived()},
+        )
+        revoked = LicenseStatusSummary.objects.get(vendor=self.vendor, status=License.Status.REVOKED)
+        self.assertEqual((revoked.count, revoked.seats), (1, 2))
+
+        for license in self.archived():
+            record = archive.fetch(license.pk)
+            self.assertEqual(record["product"], license.product)
+            self.assertNotEqual(record["license_key"], license.license_key)  # stored encrypted
+            self.assertEqual(archive.reveal(record)["license_key"], f"KEY-{license.product}")
+        self.assertEqual(archive.archive(), (0, True))
+
+    def test_fetch_unknown_or_malformed_id(self):
+        self.assertIsNone(archive.fetch(self.revoked.pk))  # no index yet
+        archive.archive()
+        self.assertIsNone(archive.fetch(self.active.pk))
+        self.assertIsNone(archive.fetch("abc"))
+
+    def test_retrieve_falls_back_to_the_archive(self):
+        archive.archive()
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user("alice", password="x"))
+
+        response = client.get(f"/api/licenses/{self.revoked.pk}/")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["archived"])
+        self.assertEqual(body["vendor_name"], "Acme")
+        self.assertEqual(body["license_key"], "KEY-Old revoked")
+
+        self.assertNotIn("archived", client.get(f"/api/licenses/{self.active.pk}/").json())
+        self.assertEqual(client.get("/api/licenses/999999/").status_code, 404)
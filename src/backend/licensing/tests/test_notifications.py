@@ -0,0 +1,113 @@
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from backend.licensing import notifications
+from backend.licensing.models import NotificationDestination, NotificationEvent
+from backend.licensing.tasks import deliver_notifications
+from backend.tests.httpstub import StubServer
+
+Status = NotificationEvent.Status
+
+
+@override_settings(NOTIFICATION_MAX_ATTEMPTS=3, NOTIFICATION_LEASE=300, NOTIFICATION_RETRY_BASE=30)
+class NotificationTests(TestCase):
+    def setUp(self):
+        notifications.forget_subscriptions()
+        # The destinations are rolled back after each test, without a delete signal.
+        self.addCleanup(notifications.forget_subscriptions)
+        notifications.http_pool.cache_clear()
+        self.stub = StubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+        self.destination = NotificationDestination.objects.create(
+            name="hook", target=f"{self.stub.url}/hook", secret="s3cret", batch_size=2, max_concurrency=2,
+        )
+
+    def add_events(self, n, destination=None, **fields):
+        return NotificationEvent.objects.bulk_create(
+            NotificationEvent(destination=destination or self.destination, event_type="license.updated",
+                              payload={"id": i}, **fields)
+            for i in range(n)
+        )
+
+    def test_notify_records_events_for_subscribers_and_schedules_on_commit(self):
+        NotificationDestination.objects.create(name="expiring", target="http://x/", event_types=["license.expiring"])
+        with mock.patch.object(deliver_notifications, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(notifications.notify("license.updated", {"id": 1}), 1)
+        delay.assert_called_once_with(self.destination.pk)
+        self.assertEqual(NotificationEvent.objects.get().destination, self.destination)
+
+    def test_deliver_sends_signed_batches_over_one_connection(self):
+        events = self.add_events(5)
+
+        self.assertEqual(notifications.deliver(self.destination.pk), 5)
+
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertEqual(self.stub.connections(), 1)
+        sent = [event["id"] for request in self.stub.requests for event in json.loads(request["body"])["events"]]
+        self.assertEqual(sent, [event.pk for event in events])
+        for request in self.stub.requests:
+            expected = hmac.new(b"s3cret", request["body"], hashlib.sha256).hexdigest()
+            self.assertEqual(request["headers"]["X-Licman-Signature"], f"sha256={expected}")
+        self.assertEqual(set(NotificationEvent.objects.values_list("status", "batch")), {(Status.DELIVERED, None)})
+
+    def test_chat_destinations_get_a_text_message(self):
+        self.destination.kind = NotificationDestination.Kind.CHAT
+        self.destination.secret = ""
+        self.destination.save()
+        self.add_events(1)
+        notifications.deliver(self.destination.pk)
+        request = self.stub.requests[0]
+        self.assertIn("text", json.loads(request["body"]))
+        self.assertNotIn("X-Licman-Signature", request["headers"])
+
+    def test_claim_respects_concurrency_and_reclaims_expired_leases(self):
+        self.add_events(6)
+        first = notifications.claim(self.destination.pk)
+        second = notifications.claim(self.destination.pk)
+        self.assertEqual([len(first[2]), len(second[2])], [2, 2])
+        self.assertNotEqual(first[1], second[1])
+        self.assertIsNone(notifications.claim(self.destination.pk))  # two batches in flight
+
+        # The worker holding the first batch died; its lease runs out.
+        NotificationEvent.objects.filter(batch=first[1]).update(claimed_at=timezone.now() - timedelta(seconds=301))
+        reclaimed = notifications.claim(self.destination.pk)
+        self.assertEqual([event.pk for event in reclaimed[2]], [event.pk for event in first[2]])
+        self.assertIn(self.destination.pk, notifications.due_destinations())
+
+    def test_failed_batch_backs_off_then_fails_for_good(self):
+        self.stub.status = 503
+        self.add_events(3)
+
+        self.assertEqual(notifications.deliver(self.destination.pk), 0)
+        self.assertEqual(len(self.stub.requests), 1)  # stops at the first failure
+        retried = NotificationEvent.objects.filter(attempts=1)
+        self.assertEqual(retried.count(), 2)
+        for event in retried:
+            self.assertEqual(event.status, Status.PENDING)
+            self.assertEqual(event.last_error, "DeliveryError: HTTP 503: ok")
+            self.assertGreaterEqual(event.next_attempt_at, event.created_at)
+            self.assertLessEqual(event.next_attempt_at, timezone.now() + timedelta(seconds=30))
+        self.assertEqual(NotificationEvent.objects.filter(attempts=0, status=Status.PENDING).count(), 1)
+
+        NotificationEvent.objects.update(next_attempt_at=timezone.now(), attempts=2)
+        notifications.deliver(self.destination.pk)
+        self.assertEqual(NotificationEvent.objects.filter(status=Status.FAILED, attempts=3).count(), 2)
+
+    def test_backoff_is_capped_full_jitter(self):
+        with override_settings(NOTIFICATION_RETRY_CAP=100):
+            with mock.patch("random.uniform", side_effect=lambda low, high: high):
+                self.assertEqual([notifications.backoff(n) for n in (1, 2, 3, 10)], [30, 60, 100, 100])
+
+    def test_disabled_destination_is_not_claimed(self):
+        self.add_events(1)
+        NotificationDestination.objects.filter(pk=self.destination.pk).update(enabled=False)
+        self.assertIsNone(notifications.claim(self.destination.pk))
+        self.assertEqual(notifications.due_destinations(), [])
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.licensing import seats
+from backend.licensing.models import License, Seat, Vendor
+
+
+class SeatTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = Vendor.objects.create(name="Acme")
+        User = get_user_model()
+        cls.alice = User.objects.create_user("alice", password="x")
+        cls.bob = User.objects.create_user("bob", password="x")
+        cls.carol = User.objects.create_user("carol", password="x")
+
+    def make_license(self, seats=2, **fields):
+        return License.objects.create(vendor=self.vendor, product="Widget", seats=seats, **fields)
+
+
+class CheckoutTests(SeatTestCase):
+    def test_checkout_takes_lowest_free_seat_and_is_idempotent(self):
+        license = self.make_license(seats=2)
+        first = seats.checkout(license.pk, self.alice)
+        self.assertEqual((first.number, first.holder), (1, self.alice))
+        self.assertEqual(seats.checkout(license.pk, self.alice).pk, first.pk)
+        self.assertEqual(seats.checkout(license.pk, self.bob).number, 2)
+
+    def test_checkout_fails_when_every_seat_is_taken(self):
+        license = self.make_license(seats=1)
+        seats.checkout(license.pk, self.alice)
+        with self.assertRaises(seats.SeatUnavailable):
+            seats.checkout(license.pk, self.bob)
+
+    def test_checkout_fails_on_inactive_or_expired_license(self):
+        revoked = self.make_license(status=License.Status.REVOKED)
+        expired = self.make_license(expires_at=timezone.now() - timedelta(days=1))
+        for license in (revoked, expired):
+            with self.assertRaises(seats.SeatUnavailable):
+                seats.checkout(license.pk, self.alice)
+
+    def test_release_frees_the_seat(self):
+        license = self.make_license(seats=1)
+        seats.checkout(license.pk, self.alice)
+        self.assertTrue(seats.release(license.pk, self.alice))
+        self.assertFalse(seats.release(license.pk, self.alice))
+        self.assertEqual(seats.checkout(license.pk, self.bob).number, 1)
+
+
+class ReconcileTests(SeatTestCase):
+    def test_reconcile_repairs_drift(self):
+        license = self.make_license(seats=3)
+        seats.checkout(license.pk, self.alice)
+        seats.checkout(license.pk, self.bob)
+        seats.checkout(license.pk, self.carol)
+        # Seats reduced while held: seat 3 stays with its holder until released.
+        License.objects.filter(pk=license.pk).update(seats=1)
+        seats.release(license.pk, self.bob)
+
+        revoked = self.make_license(seats=1)
+        seats.checkout(revoked.pk, self.alice)
+        License.objects.filter(pk=revoked.pk).update(status=License.Status.REVOKED)
+
+        unprovisioned = self.make_license(seats=4)
+
+        stats = seats.reconcile()
+
+        self.assertEqual(stats, {"provisioned": 4, "removed": 1, "released": 1, "over_allocated": 1})
+        self.assertEqual(
+            list(Seat.objects.filter(license=license).values_list("number", "holder")),
+            [(1, self.alice.pk), (3, self.carol.pk)],
+        )
+        self.assertFalse(Seat.objects.filter(license=revoked, holder__isnull=False).exists())
+        self.assertEqual(Seat.objects.filter(license=unprovisioned).count(), 4)
+        self.assertEqual(seats.reconcile()["provisioned"], 0)
+
+
+class SeatAPITests(SeatTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_checkout_and_release(self):
+        license = self.make_license(seats=1)
+        response = self.client.post(f"/api/licenses/{license.pk}/checkout/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["number"], 1)
+
+        self.client.force_authenticate(self.bob)
+        self.assertEqual(self.client.post(f"/api/licenses/{license.pk}/checkout/").status_code, 409)
+        self.assertEqual(self.client.post(f"/api/licenses/{license.pk}/release/").status_code, 404)
+
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.post(f"/api/licenses/{license.pk}/release/").status_code, 204)
+
+    def test_unknown_or_malformed_license_is_404(self):
+        for pk in ("999999", "abc"):
+            self.assertEqual(self.client.post(f"/api/licenses/{pk}/checkout/").status_code, 404)
+            self.assertEqual(self.client.post(f"/api/licenses/{pk}/release/").status_code, 404)
+
+    def test_only_staff_check_out_for_others(self):
+        license = self.make_license(seats=2)
+        response = self.client.post(f"/api/licenses/{license.pk}/checkout/", {"user": self.bob.pk}, format="json")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,80 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.api.batch import LicenseBatch
+from backend.licensing import summary
+from backend.licensing.models import ExpirationCalendar, License, LicenseStatusSummary, Vendor
+from backend.licensing.tasks import refresh_license_summaries
+
+
+def tables():
+    """Both summary tables; rows at zero are left by deltas and dropped by rebuild(), so they are ignored."""
+    nonzero = ~Q(count=0, seats=0)
+    return (
+        sorted(LicenseStatusSummary.objects.filter(nonzero).values_list("vendor_id", "status", "count", "seats")),
+        sorted(ExpirationCalendar.objects.filter(nonzero).values_list("vendor_id", "day", "count", "seats")),
+    )
+
+
+class SummaryDeltaTests(TestCase):
+    def setUp(self):
+        self.acme = Vendor.objects.create(name="Acme")
+        self.globex = Vendor.objects.create(name="Globex")
+        self.soon = timezone.now() + timedelta(days=3)
+
+    def assertMatchesRebuild(self):
+        incremental = tables()
+        summary.rebuild()
+        self.assertEqual(incremental, tables())
+
+    def test_model_writes_keep_summaries_exact(self):
+        a = License.objects.create(vendor=self.acme, product="A", seats=5, expires_at=self.soon)
+        b = License.objects.create(vendor=self.acme, product="B", seats=2)
+        c = License.objects.create(vendor=self.globex, product="C", seats=1, expires_at=self.soon)
+        self.assertMatchesRebuild()
+
+        a.seats = 7
+        a.expires_at += timedelta(days=10)
+        a.save()
+        b.status = License.Status.REVOKED
+        b.save()
+        c.vendor = self.acme
+        c.save()
+        License.objects.get(pk=c.pk).delete()  # a freshly loaded instance carries its own snapshot
+        self.assertMatchesRebuild()
+
+        a.status = License.Status.EXPIRED
+        a.save()
+        self.assertEqual(tables()[1], [])
+        self.assertMatchesRebuild()
+
+    def test_batch_writes_keep_summaries_exact(self):
+        a = License.objects.create(vendor=self.acme, product="A", seats=5, expires_at=self.soon)
+        b = License.objects.create(vendor=self.globex, product="B", seats=2)
+        applied = LicenseBatch([
+            {"op": "create", "data": {"vendor": self.globex.pk, "product": "New", "seats": 4, "expires_at": self.soon}},
+            {"op": "update", "id": a.pk, "data": {"seats": 9}},
+            {"op": "revoke", "id": a.pk},
+            {"op": "delete", "id": b.pk},
+        ]).run()
+        self.assertTrue(applied)
+        self.assertMatchesRebuild()
+
+    def test_unknown_previous_key_schedules_a_rebuild(self):
+        License.objects.create(vendor=self.acme, product="A", seats=5)
+        license = License.objects.only("id", "product").get()
+        license.product = "Renamed"
+        with mock.patch.object(refresh_license_summaries, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                license.save(update_fields=["product"])
+        delay.assert_called_once_with()
+
+    def test_rebuild_drops_rows_left_at_zero(self):
+        license = License.objects.create(vendor=self.acme, product="A", seats=5, expires_at=self.soon)
+        License.objects.filter(pk=license.pk).update(status=License.Status.REVOKED)  # bypasses the deltas
+        summary.rebuild()
+        self.assertEqual(tables(), ([(self.acme.pk, "revoked", 1, 5)], []))
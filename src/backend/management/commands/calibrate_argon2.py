@@ -0,0 +1,71 @@
+import os
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MIN_MEMORY_KIB = 19 * 1024  # OWASP floor for Argon2id
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Argon2id on this host and recommend cost parameters for a target hashing time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=250, help="Hashing time to aim for per login (default 250)")
+        parser.add_argument('--max-memory-mib', type=int, default=128, help="Largest memory cost to consider, per hash (default 128)")
+        parser.add_argument('--parallelism', type=int, default=min(os.cpu_count() or 1, 8), help="Lanes (default: CPU count, at most 8)")
+        parser.add_argument('--rounds', type=int, default=5, help="Samples per measurement; the median is used (default 5)")
+
+    def measure(self, time_cost, memory_cost, parallelism, rounds):
+        from argon2 import PasswordHasher, Type
+
+        hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism, type=Type.ID)
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            hasher.hash("calibration-password")
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def handle(self, *args, **options):
+        target = options['target_ms']
+        parallelism = options['parallelism']
+        rounds = options['rounds']
+
+        # Memory is the cost that hurts attackers most, so find the largest
+        # memory that fits the target with one pass, then add passes.
+        memory = options['max_memory_mib'] * 1024
+        while True:
+            elapsed = self.measure(1, memory, parallelism, rounds)
+            self.stdout.write(f"  m={memory // 1024:>4} MiB t=1 p={parallelism}: {elapsed:7.1f} ms")
+            if elapsed <= target or memory // 2 < MIN_MEMORY_KIB:
+                break
+            memory //= 2
+
+        if elapsed > target:
+            raise CommandError(
+                f"Even {memory // 1024} MiB with one pass takes {elapsed:.0f} ms; raise --target-ms or lower --parallelism."
+            )
+
+        time_cost = max(1, int(target // elapsed))
+        while time_cost > 1 and (elapsed := self.measure(time_cost, memory, parallelism, rounds)) > target:
+            time_cost -= 1
+        if time_cost == 1:
+            elapsed = self.measure(1, memory, parallelism, rounds)
+        self.stdout.write(f"  m={memory // 1024:>4} MiB t={time_cost} p={parallelism}: {elapsed:7.1f} ms")
+
+        current = (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM)
+        self.stdout.write(self.style.SUCCESS(
+            f"\nRecommended for ~{target:.0f} ms: time_cost={time_cost}, memory_cost={memory} KiB, parallelism={parallelism}"
+        ))
+        self.stdout.write(
+            "Set these under `django:` in .licman-cfg.yml and rerun bin/configure:\n"
+            f"  ARGON2_TIME_COST: '{time_cost}'\n"
+            f"  ARGON2_MEMORY_COST: '{memory}'\n"
+            f"  ARGON2_PARALLELISM: '{parallelism}'"
+        )
+        if current != (time_cost, memory, parallelism):
+            self.stdout.write(
+                f"(currently t={current[0]} m={current[1]} p={current[2]}; existing hashes upgrade at next login)"
+            )
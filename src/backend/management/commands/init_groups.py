@@ -30,6 +30,9 @@ class Command(BaseCommand):
             # Sessions
             ("sessions", "session", "view_session"),
             ("sessions", "session", "delete_session"),
+
+            # License (bulk key reveal: GET /api/licenses/?reveal=license_key)
+            ("licensing", "license", "reveal_license_key"),
         ],
         "support": [
             # LogEntry
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend.partitions import PARTITIONED_TABLES, maintain, status
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions and drop those past retention (also run daily by Celery beat).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tables', nargs='*', help="Limit to these partitioned tables")
+        parser.add_argument('--status', action='store_true', help="List partitions with estimated row counts and exit")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Table partitioning needs PostgreSQL.")
+        unknown = set(options['tables']) - set(PARTITIONED_TABLES)
+        if unknown:
+            raise CommandError(f"Unknown tables: {', '.join(sorted(unknown))}. Known: {', '.join(PARTITIONED_TABLES)}")
+        tables = options['tables'] or list(PARTITIONED_TABLES)
+
+        if options['status']:
+            for table in tables:
+                self.stdout.write(table)
+                for name, start, rows in status(table):
+                    month = f"{start:%Y-%m}" if start else "default"
+                    self.stdout.write(f"  {name}  {month}  ~{rows} rows")
+            return
+
+        for table, changes in maintain(tables).items():
+            created = ', '.join(changes['created']) or 'none'
+            dropped = ', '.join(changes['dropped']) or 'none'
+            self.stdout.write(self.style.SUCCESS(f"{table}: created {created}; dropped {dropped}"))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from backend import crypto
+from backend.rotation import encrypted_fields, reset, rotate, status
+
+
+class Command(BaseCommand):
+    help = 'Re-encrypt encrypted fields under the primary FIELD_ENCRYPTION_KEYS version, resumably.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fields', nargs='*', help="Limit to '<app>.<Model>.<field>' labels")
+        parser.add_argument('--chunk-size', type=int, help="Rows per transaction (default KEY_ROTATION_CHUNK_SIZE)")
+        parser.add_argument('--rate', type=float, help="Rows/sec budget, 0 = unthrottled (default KEY_ROTATION_ROWS_PER_SECOND)")
+        parser.add_argument('--restart', action='store_true', help="Discard the checkpoint and start from the first row")
+        parser.add_argument('--async', dest='use_celery', action='store_true', help="Queue the Celery task instead of running here")
+        parser.add_argument('--status', action='store_true', help="Show progress and exit")
+
+    def handle(self, *args, **options):
+        known = {label for label, _, _ in encrypted_fields()}
+        unknown = set(options['fields']) - known
+        if unknown:
+            raise CommandError(f"Unknown encrypted fields: {', '.join(sorted(unknown))}. Known: {', '.join(sorted(known))}")
+
+        primary = crypto.keyring().primary
+        if options['status']:
+            for label, checkpoint in status():
+                if checkpoint is None:
+                    state = 'not started'
+                elif checkpoint.finished_at:
+                    state = f'done ({checkpoint.rotated} of {checkpoint.scanned} rows re-encrypted)'
+                else:
+                    state = f'in progress at pk {checkpoint.last_pk} ({checkpoint.rotated} re-encrypted)'
+                self.stdout.write(f"{label} -> v{primary}: {state}")
+            return
+
+        if options['restart']:
+            reset(options['fields'] or None)
+
+        if options['use_celery']:
+            from backend.tasks import rotate_encryption_keys
+
+            rotate_encryption_keys.delay(labels=options['fields'] or None)
+            self.stdout.write(self.style.SUCCESS(f"Queued rotation to key v{primary}."))
+            return
+
+        rotate(
+            options['fields'] or None,
+            chunk_size=options['chunk_size'],
+            rows_per_second=options['rate'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"All encrypted fields are under key v{primary}."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.edge import rate_limit_payload, sync_rate_limits
+
+class Command(BaseCommand):
+    help = 'Push API rate limits and daily quotas to the OpenResty edge.'
+
+    def handle(self, *args, **kwargs):
+        payload = rate_limit_payload()
+        if not sync_rate_limits(payload):
+            raise CommandError("Edge admin socket unavailable; limits were not synced.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Synced defaults and {len(payload['identities'])} per-token limits to the edge."
+        ))
@@ -0,0 +1,103 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .jsonlog import clean_request_id, new_request_id, request_id_var
+from .querycount import QueryBudgetExceeded, QueryCounter, budget_for
+
+logger = logging.getLogger("backend.querycount")
+
+
+class RequestIdMiddleware:
+    """
+    Bind the request ID nginx forwards in X-Request-ID (or a fresh one) to the
+    logging context for the duration of the request, and echo it back.
+
+    Sync and async capable, so the ASGI app's async views (the change feed)
+    are not funnelled through a sync adapter.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_id, token = self.bind(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response["X-Request-ID"] = request_id
+        return response
+
+    async def __acall__(self, request):
+        request_id, token = self.bind(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response["X-Request-ID"] = request_id
+        return response
+
+    def bind(self, request):
+        request_id = clean_request_id(request.META.get("HTTP_X_REQUEST_ID")) or new_request_id()
+        request.request_id = request_id
+        return request_id, request_id_var.set(request_id)
+
+
+class QueryCountMiddleware:
+    """
+    Count the queries issued while handling each request, log N+1 suspects
+    with the view/serializer locations responsible, and enforce per-endpoint
+    budgets from settings.QUERY_BUDGETS (keyed by resolved view name).
+
+    With QUERY_BUDGET_STRICT enabled an overrun raises, so the test client
+    surfaces it as a failing test instead of a log line. Sync and async
+    capable, like RequestIdMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+        return self.report(request, response, counter)
+
+    async def __acall__(self, request):
+        with QueryCounter() as counter:
+            response = await self.get_response(request)
+        return self.report(request, response, counter)
+
+    def report(self, request, response, counter: QueryCounter):
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else None
+        endpoint = f"{request.method} {request.path} ({view_name or 'unresolved'})"
+
+        repeated = counter.repeated()
+        if repeated:
+            logger.warning("N+1 query pattern on %s\n%s", endpoint, counter.describe())
+
+        budget = budget_for(view_name)
+        if budget is not None and len(counter) > budget:
+            message = f"Query budget of {budget} exceeded on {endpoint}\n{counter.describe()}"
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        response["X-Query-Count"] = str(len(counter))
+        return response
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.db import models
+
+
+class ApiQuota(models.Model):
+    """
+    Per-user overrides for the edge rate limits. Empty fields fall back to the
+    EDGE_RATE_LIMITS defaults; 0 means unlimited.
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="api_quota")
+    requests_per_minute = models.PositiveIntegerField(null=True, blank=True)
+    requests_per_day = models.PositiveIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"API quota for {self.user}"
+
+
+class KeyRotation(models.Model):
+    """
+    Checkpoint for re-encrypting one encrypted field under one key version
+    (see backend.rotation). `last_pk` is the keyset position, so an
+    interrupted rotation resumes where it stopped.
+    """
+
+    field = models.CharField(max_length=255)  # "<app_label>.<Model>.<field>"
+    key_version = models.CharField(max_length=32)
+    last_pk = models.BigIntegerField(default=0)
+    scanned = models.PositiveBigIntegerField(default=0)
+    rotated = models.PositiveBigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["field", "key_version"], name="unique_key_rotation"),
+        ]
+
+    def __str__(self):
+        return f"{self.field} -> v{self.key_version}"
@@ -0,0 +1,184 @@
+"""
+Monthly range partitions for append-only PostgreSQL tables.
+
+Each table in PARTITIONED_TABLES is created PARTITION BY RANGE on a timestamp
+column by its migration. maintain() creates partitions PARTITION_MONTHS_AHEAD
+months in advance, and detaches and drops partitions lying wholly outside the
+table's retention, so expiring old rows is a catalog operation instead of a
+DELETE followed by a long vacuum. It runs at migrate time and daily from
+Celery beat.
+
+A DEFAULT partition catches rows outside every monthly range (beat stopped
+for longer than the look-ahead, a skewed clock), so writes never fail for
+want of a partition. It is meant to stay empty: attaching a month scans it.
+maintain() drains any rows it finds into proper monthly partitions, briefly
+locking the table while it does.
+
+Partitions are named <table>_pYYYYMM and cover UTC calendar months; the
+default one is <table>_default.
+"""
+
+import logging
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger("backend.partitions")
+
+# table -> (partition key column, setting holding its retention in months;
+# 0 keeps every partition)
+PARTITIONED_TABLES = {
+    "licensing_auditevent": ("occurred_at", "AUDIT_RETENTION_MONTHS"),
+}
+
+PARTITION_NAME = re.compile(r"^(?P<table>.+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` away from `day`'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, start: date) -> str:
+    return f"{table}_p{start:%Y%m}"
+
+
+def default_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partitions(cursor, table: str) -> list[tuple[str, date, bool]]:
+    """(name, month, detach pending) for every monthly partition of `table`, oldest first."""
+    cursor.execute(
+        """
+        SELECT child.relname, inh.inhdetachpending
+        FROM pg_inherits inh
+        JOIN pg_class child ON child.oid = inh.inhrelid
+        JOIN pg_class parent ON parent.oid = inh.inhparent
+        WHERE parent.relname = %s
+        """,
+        [table],
+    )
+    found = []
+    for name, pending in cursor.fetchall():
+        match = PARTITION_NAME.match(name)
+        if match and match["table"] == table:
+            found.append((name, date(int(match["year"]), int(match["month"]), 1), pending))
+    return sorted(found, key=lambda p: p[1])
+
+
+def create_partition(cursor, table: str, start: date) -> str:
+    name = partition_name(table, start)
+    qn = connection.ops.quote_name
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} "
+        f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{add_months(start, 1).isoformat()} 00:00:00+00')"
+    )
+    return name
+
+
+def create_default(cursor, table: str) -> str:
+    name = default_name(table)
+    qn = connection.ops.quote_name
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} DEFAULT")
+    return name
+
+
+def drain_default(cursor, table: str, column: str) -> list[str]:
+    """
+    Move rows out of the default partition into monthly partitions, creating
+    those as needed. Returns the partitions created. The default is detached
+    meanwhile (a month cannot be attached while it holds that month's rows),
+    which locks the table against writes until the transaction commits.
+    """
+    default, qn = default_name(table), connection.ops.quote_name
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', {qn(column)} AT TIME ZONE 'UTC')::date FROM {qn(default)}"
+    )
+    months = sorted(row[0] for row in cursor.fetchall())
+    if not months:
+        return []
+    with transaction.atomic():
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(default)}")
+        existing = {start for _, start, _ in partitions(cursor, table)}
+        created = [create_partition(cursor, table, month) for month in months if month not in existing]
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(default)}")
+        moved = cursor.rowcount
+        cursor.execute(f"TRUNCATE {qn(default)}")
+        cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default)} DEFAULT")
+    logger.warning("Moved %s rows out of %s into %s", moved, default, [partition_name(table, m) for m in months])
+    return created
+
+
+def drop_partition(cursor, table: str, name: str, pending: bool = False):
+    """
+    Detach, then drop, in one transaction. The detach cannot be CONCURRENTLY
+    while the table has a default partition, so it briefly locks the table;
+    with nothing to scan that is a catalog update. A partition left pending by
+    an interrupted concurrent detach is finalized instead.
+    """
+    qn = connection.ops.quote_name
+    with transaction.atomic():
+        mode = " FINALIZE" if pending else ""
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}{mode}")
+        cursor.execute(f"DROP TABLE {qn(name)}")
+
+
+def maintain(tables=None, today: date | None = None) -> dict:
+    """
+    Drain the default partition, create upcoming partitions and drop expired
+    ones. Returns {table: {"created": [...], "dropped": [...]}}; a no-op off
+    PostgreSQL.
+    """
+    if connection.vendor != "postgresql":
+        return {}
+    today = today or timezone.now().date()
+    this_month = add_months(today, 0)
+    report = {}
+    with connection.cursor() as cursor:
+        for table, (column, retention_setting) in PARTITIONED_TABLES.items():
+            if tables and table not in tables:
+                continue
+            create_default(cursor, table)
+            created = drain_default(cursor, table, column)
+            existing = {start for _, start, _ in partitions(cursor, table)}
+            created += [
+                create_partition(cursor, table, start)
+                for start in (add_months(this_month, n) for n in range(settings.PARTITION_MONTHS_AHEAD + 1))
+                if start not in existing
+            ]
+
+            dropped = []
+            retention = getattr(settings, retention_setting, 0)
+            if retention:
+                cutoff = add_months(this_month, -retention)
+                for name, start, pending in partitions(cursor, table):
+                    if add_months(start, 1) <= cutoff:
+                        drop_partition(cursor, table, name, pending)
+                        dropped.append(name)
+
+            if created or dropped:
+                logger.info("Partitions of %s: created %s, dropped %s", table, created, dropped)
+            report[table] = {"created": created, "dropped": dropped}
+    return report
+
+
+def status(table: str) -> list[tuple[str, date | None, int]]:
+    """
+    (name, month, estimated rows) per partition, with the default partition
+    last (month None); estimates come from the last ANALYZE.
+    """
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        rows = []
+        named = [(name, start) for name, start, _ in partitions(cursor, table)] + [(default_name(table), None)]
+        for name, start in named:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [qn(name)])
+            found = cursor.fetchone()
+            if found:
+                rows.append((name, start, max(found[0], 0)))
+    return rows
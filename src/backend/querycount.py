@@ -0,0 +1,168 @@
+"""
+Query counting and N+1 detection for development and tests.
+
+`QueryCounter` hooks every database connection with an execute wrapper and
+records the normalized shape of each statement together with the innermost
+backend source location that issued it. Identical shapes repeated many times
+within a single request are reported as N+1 suspects.
+"""
+
+import logging
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("backend.querycount")
+
+BACKEND_DIR = str(Path(__file__).resolve().parent)
+THIS_FILE = str(Path(__file__).resolve())
+
+# Compiled once; shapes are computed for every query while counting is on.
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or block issues more queries than its budget allows."""
+
+
+@dataclass
+class QueryRecord:
+    shape: str
+    duration: float
+    location: str
+
+
+def sql_shape(sql: str) -> str:
+    """
+    Reduce a SQL statement to its shape: literals become `?` and
+    `IN (...)` lists collapse, so the same ORM call in a loop always yields
+    the same string regardless of the ids involved.
+    """
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def _caller_location() -> str:
+    """
+    Return the innermost frame inside src/backend (excluding this module),
+    which is normally the view, serializer or service that triggered the query.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(BACKEND_DIR) and filename != THIS_FILE:
+            relative = filename[len(BACKEND_DIR) + 1:]
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<outside backend>"
+
+
+class QueryCounter:
+    """
+    Context manager that records every query executed on the given database
+    aliases (all configured aliases by default).
+    """
+
+    def __init__(self, using=None, capture_locations: bool = True):
+        self.aliases = [using] if using else list(connections)
+        self.capture_locations = capture_locations
+        self.queries: list[QueryRecord] = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        location = _caller_location() if self.capture_locations else ""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(QueryRecord(sql_shape(sql), time.perf_counter() - start, location))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in self.aliases:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    def __len__(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(q.duration for q in self.queries)
+
+    def repeated(self, threshold: int | None = None) -> dict[str, dict]:
+        """
+        Return shapes executed at least `threshold` times, mapped to their
+        count and the distinct source locations that issued them.
+        """
+        if threshold is None:
+            threshold = getattr(settings, "QUERY_COUNT_REPEAT_THRESHOLD", 5)
+        counts = Counter(q.shape for q in self.queries)
+        locations = defaultdict(Counter)
+        for q in self.queries:
+            if counts[q.shape] >= threshold:
+                locations[q.shape][q.location] += 1
+        return {
+            shape: {"count": counts[shape], "locations": dict(locations[shape])}
+            for shape in locations
+        }
+
+    def describe(self, threshold: int | None = None) -> str:
+        lines = [f"{len(self)} queries in {self.total_time * 1000:.1f}ms"]
+        for shape, info in self.repeated(threshold).items():
+            lines.append(f"  repeated {info['count']}x: {shape}")
+            for location, n in info["locations"].items():
+                lines.append(f"    {n}x from {location}")
+        return "\n".join(lines)
+
+
+def budget_for(view_name: str | None) -> int | None:
+    """Look up the query budget for a resolved view name, falling back to the default."""
+    budgets = getattr(settings, "QUERY_BUDGETS", {})
+    if view_name and view_name in budgets:
+        return budgets[view_name]
+    return getattr(settings, "QUERY_BUDGET_DEFAULT", None)
+
+
+@contextmanager
+def assert_max_queries(limit: int, using=None, allow_repeats: bool = True):
+    """
+    Test helper: fail if the enclosed block issues more than `limit` queries,
+    or (with allow_repeats=False) if any N+1 pattern is detected.
+
+        with assert_max_queries(3):
+            client.get("/api/licenses/")
+    """
+    with QueryCounter(using=using) as counter:
+        yield counter
+    if len(counter) > limit:
+        raise QueryBudgetExceeded(f"Query budget of {limit} exceeded.\n{counter.describe()}")
+    if not allow_repeats and counter.repeated():
+        raise QueryBudgetExceeded(f"N+1 query pattern detected.\n{counter.describe()}")
+
+
+class QueryBudgetMixin:
+    """Mixin for django.test.TestCase classes exposing the query budget helpers as assertions."""
+
+    def assertMaxQueries(self, limit: int, using=None):
+        return assert_max_queries(limit, using=using)
+
+    def assertNoNPlusOne(self, limit: int = sys.maxsize, using=None):
+        return assert_max_queries(limit, using=using, allow_repeats=False)
@@ -0,0 +1,120 @@
+"""
+Online re-encryption of encrypted fields under the primary key version.
+
+Rows are visited in primary-key order, one chunk per short transaction, and
+each row is rewritten with a compare-and-swap on its old ciphertext, so the
+table is never locked and a concurrent edit is never overwritten (the edit is
+already encrypted under the primary key). Progress is checkpointed in
+KeyRotation after every chunk; a rotation interrupted by a deploy or a worker
+restart picks up from the last committed chunk. Starting over is a separate
+step (reset()), so re-running an interrupted slice never discards progress. Throughput is held to a
+rows/sec budget so the job does not compete with live traffic.
+"""
+
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import crypto
+from .fields import EncryptedTextField, LazySecret
+from .models import KeyRotation
+
+logger = logging.getLogger("backend.rotation")
+
+
+def encrypted_fields():
+    """Every (model, field) pair using EncryptedTextField, as '<app>.<Model>.<field>' labels."""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, EncryptedTextField):
+                yield f"{model._meta.label}.{field.name}", model, field
+
+
+def checkpoint_for(label: str) -> KeyRotation:
+    checkpoint, _ = KeyRotation.objects.get_or_create(field=label, key_version=crypto.keyring().primary)
+    return checkpoint
+
+
+def reset(labels=None) -> int:
+    """Discard the checkpoints of the given fields (default: all), so the next rotate() starts from the first row."""
+    selected = [label for label, _, _ in encrypted_fields() if not labels or label in labels]
+    return KeyRotation.objects.filter(field__in=selected, key_version=crypto.keyring().primary).update(
+        last_pk=0, scanned=0, rotated=0, finished_at=None, updated_at=timezone.now()
+    )
+
+
+def rotate_chunk(model, field, checkpoint: KeyRotation, chunk_size: int) -> tuple[int, KeyRotation]:
+    """
+    Re-encrypt the next chunk after the checkpoint. Returns the rows scanned
+    (0 when done) and the updated checkpoint. The checkpoint row is locked for
+    the chunk, so two workers running the same rotation take turns.
+    """
+    ring = crypto.keyring()
+    with transaction.atomic():
+        checkpoint = KeyRotation.objects.select_for_update().get(pk=checkpoint.pk)
+        if checkpoint.finished_at:
+            return 0, checkpoint
+        rows = list(
+            model._default_manager.filter(pk__gt=checkpoint.last_pk)
+            .order_by("pk")
+            .values_list("pk", field.attname)[:chunk_size]
+        )
+        rotated = 0
+        for pk, value in rows:
+            stored = value.ciphertext if isinstance(value, LazySecret) else value
+            if not stored or not ring.needs_rotation(stored):
+                continue
+            # Compare-and-swap: skipped if the row changed since it was read.
+            rotated += model._default_manager.filter(pk=pk, **{field.attname: LazySecret(stored)}).update(
+                **{field.attname: LazySecret(ring.reencrypt(stored))}
+            )
+
+        if rows:
+            checkpoint.last_pk = rows[-1][0]
+            checkpoint.scanned += len(rows)
+            checkpoint.rotated += rotated
+        else:
+            checkpoint.finished_at = timezone.now()
+        checkpoint.save()
+    return len(rows), checkpoint
+
+
+def rotate(labels=None, chunk_size=None, rows_per_second=None, time_limit=None) -> bool:
+    """
+    Rotate the given fields (default: all). Returns True when every field is
+    finished, False if `time_limit` seconds ran out first (call again to resume).
+    """
+    chunk_size = chunk_size or settings.KEY_ROTATION_CHUNK_SIZE
+    rows_per_second = settings.KEY_ROTATION_ROWS_PER_SECOND if rows_per_second is None else rows_per_second
+    started = time.monotonic()
+
+    for label, model, field in encrypted_fields():
+        if labels and label not in labels:
+            continue
+        checkpoint = checkpoint_for(label)
+        if checkpoint.finished_at:
+            continue
+
+        logger.info("Rotating %s to key v%s from pk > %s", label, checkpoint.key_version, checkpoint.last_pk)
+        while True:
+            chunk_started = time.monotonic()
+            scanned, checkpoint = rotate_chunk(model, field, checkpoint, chunk_size)
+            if not scanned:
+                logger.info("Rotated %s: %s of %s rows re-encrypted", label, checkpoint.rotated, checkpoint.scanned)
+                break
+            if rows_per_second:
+                # Sleep off whatever the chunk finished ahead of its budget.
+                time.sleep(max(0.0, scanned / rows_per_second - (time.monotonic() - chunk_started)))
+            if time_limit and time.monotonic() - started >= time_limit:
+                return False
+    return True
+
+
+def status():
+    primary = crypto.keyring().primary
+    checkpoints = {c.field: c for c in KeyRotation.objects.filter(key_version=primary)}
+    return [(label, checkpoints.get(label)) for label, _, _ in encrypted_fields()]
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .edge import sync_rate_limits_on_commit
+from .models import ApiQuota
+
+
+@receiver([post_save, post_delete], sender=ApiQuota)
+@receiver([post_save, post_delete], sender=Token)
+def push_rate_limits(sender, **kwargs):
+    sync_rate_limits_on_commit()
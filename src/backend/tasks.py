@@ -0,0 +1,58 @@
+import time
+
+from celery import shared_task
+from django.conf import settings
+
+from .edge import sync_rate_limits
+
+
+@shared_task
+def sync_edge_limits():
+    """Re-push rate limits so a restarted nginx picks them up within a minute."""
+    return sync_rate_limits()
+
+
+@shared_task(bind=True, acks_late=True, ignore_result=True)
+def rotate_encryption_keys(self, labels=None, time_limit=120):
+    """
+    Re-encrypt secrets under the primary key in time-boxed slices; each slice
+    re-queues the next, and acks_late re-delivers a slice lost to a worker
+    restart, which resumes from the last checkpoint. It never resets the
+    checkpoint itself (see rotation.reset()), so a redelivery is harmless.
+    """
+    from .rotation import rotate
+
+    if not rotate(labels, time_limit=time_limit):
+        self.apply_async(kwargs={"labels": labels, "time_limit": time_limit})
+
+
+@shared_task(ignore_result=True)
+def clear_expired_sessions(batch_size=None, pause=0.05):
+    """
+    Delete expired django_session rows a batch at a time, so cleanup never
+    holds a long lock or bloats one transaction. Needed for the 'db' and
+    'cached_db' engines; with 'cache', Redis expires keys itself and this
+    only drains rows left from before the switch.
+    """
+    from django.contrib.sessions.models import Session
+    from django.utils import timezone
+
+    batch_size = batch_size or settings.SESSION_CLEANUP_BATCH_SIZE
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=now).values_list("session_key", flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        time.sleep(pause)
+
+
+@shared_task(ignore_result=True)
+def maintain_partitions():
+    """Create next months' partitions and drop those past retention."""
+    from .partitions import maintain
+
+    return maintain()
@@ -0,0 +1,69 @@
+"""
+In-process HTTP endpoint for tests that exercise outbound requests
+(backend.httppool, notification delivery).
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubServer:
+    """
+    Records every request as a dict (method, path, headers, body, client
+    port) and answers with `status`, which may be a callable taking the
+    request number. With `drop_idle`, each connection is closed after its
+    response without telling the client, as a server dropping an idle
+    keep-alive connection would.
+    """
+
+    def __init__(self, status=200, delay=0.0, drop_idle=False):
+        self.status = status
+        self.delay = delay
+        self.drop_idle = drop_idle
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with stub._lock:
+                    number = len(stub.requests)
+                    stub.requests.append({
+                        "method": self.command, "path": self.path, "headers": dict(self.headers),
+                        "body": body, "port": self.client_address[1],
+                    })
+                time.sleep(stub.delay)
+                self.send_response(stub.status(number) if callable(stub.status) else stub.status)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+                if stub.drop_idle:
+                    self.close_connection = True
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+    def connections(self) -> int:
+        return len({request["port"] for request in self.requests})
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from backend.licensing.models import AuditEvent, License, LicenseStatusSummary, Vendor
+
+
+class LicenseBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = Vendor.objects.create(name="Acme")
+        cls.user = get_user_model().objects.create_user("alice", password="x")
+        cls.license = License.objects.create(vendor=cls.vendor, product="Widget", seats=3)
+        cls.doomed = License.objects.create(vendor=cls.vendor, product="Gadget")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, *operations):
+        return self.client.post("/api/licenses/batch/", {"operations": list(operations)}, format="json")
+
+    def snapshot(self):
+        return (
+            list(License.objects.order_by("pk").values_list("pk", "product", "status", "assigned_to")),
+            list(LicenseStatusSummary.objects.order_by("pk").values_list("status", "count", "seats")),
+            AuditEvent.objects.count(),
+        )
+
+    def test_applies_every_operation(self):
+        response = self.post(
+            {"op": "create", "data": {"vendor": self.vendor.pk, "product": "New", "seats": 2}},
+            {"op": "assign", "id": self.license.pk, "user": self.user.pk},
+            {"op": "revoke", "id": self.doomed.pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["applied"])
+        self.assertEqual([result["status"] for result in body["results"]], ["created", "assigned", "revoked"])
+        self.assertTrue(License.objects.filter(pk=body["results"][0]["id"], product="New").exists())
+        self.assertEqual(License.objects.get(pk=self.license.pk).assigned_to, self.user)
+        self.assertEqual(License.objects.get(pk=self.doomed.pk).status, License.Status.REVOKED)
+        self.assertEqual(
+            set(AuditEvent.objects.values_list("action", flat=True)),
+            {"license.created", "license.updated"},
+        )
+
+    def test_one_invalid_operation_rolls_back_the_batch(self):
+        before = self.snapshot()
+        response = self.post(
+            {"op": "create", "data": {"vendor": self.vendor.pk, "product": "New"}},
+            {"op": "update", "id": self.license.pk, "data": {"product": "Renamed"}},
+            {"op": "delete", "id": self.doomed.pk},
+            {"op": "assign", "id": self.license.pk, "user": 999999},
+        )
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertFalse(body["applied"])
+        self.assertEqual([result["status"] for result in body["results"]], ["created", "updated", "deleted", "error"])
+        self.assertEqual(self.snapshot(), before)
+
+    def test_write_failure_rolls_back_the_batch(self):
+        before = self.snapshot()
+        with mock.patch.object(License.objects, "bulk_update", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                self.post(
+                    {"op": "create", "data": {"vendor": self.vendor.pk, "product": "New"}},
+                    {"op": "revoke", "id": self.license.pk},
+                )
+        self.assertEqual(self.snapshot(), before)
+
+    def test_operations_on_a_deleted_license_fail(self):
+        response = self.post({"op": "delete", "id": self.doomed.pk}, {"op": "revoke", "id": self.doomed.pk})
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(License.objects.filter(pk=self.doomed.pk).exists())
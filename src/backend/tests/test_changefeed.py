@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+from django.test import SimpleTestCase, override_settings
+
+from backend import changefeed
+
+
+class FakeRedis:
+    """The slice of redis.asyncio.Redis the broadcaster uses, over an in-memory stream."""
+
+    def __init__(self):
+        self.entries = []
+        self.clock = 1700000000000
+
+    def add(self, event="license.updated", **data):
+        self.clock += 1
+        entry = (f"{self.clock}-0".encode(), {b"event": event.encode(), b"data": json.dumps(data).encode()})
+        self.entries.append(entry)
+        return entry
+
+    def after(self, entry_id):
+        start = changefeed.parse_id(entry_id)
+        return [entry for entry in self.entries if changefeed.parse_id(entry[0]) > start]
+
+    async def xrange(self, stream, min="-", count=None):
+        entries = self.entries if min == "-" else self.after(min.lstrip("("))
+        return entries[:count]
+
+    async def xrevrange(self, stream, count=None):
+        return self.entries[::-1][:count]
+
+    async def xread(self, streams, count=None, block=None):
+        (stream, position), = streams.items()
+        entries = self.after(position)
+        if not entries:
+            await asyncio.sleep(0.01)
+            return []
+        return [(stream.encode(), entries[:count])]
+
+
+@override_settings(CHANGEFEED_KEEPALIVE=0.5, CHANGEFEED_QUEUE_SIZE=10, CHANGEFEED_MAX_SUBSCRIBERS=5)
+class StreamTests(SimpleTestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.broadcaster = changefeed.Broadcaster()
+        self.broadcaster._redis = self.redis
+        self.original, changefeed.broadcaster = changefeed.broadcaster, self.broadcaster
+        self.addCleanup(setattr, changefeed, "broadcaster", self.original)
+
+    async def open(self, last_event_id=None):
+        subscriber = await self.broadcaster.subscribe()
+        self.assertIsNotNone(subscriber)
+        return subscriber, changefeed.stream(subscriber, last_event_id)
+
+    async def events(self, body, n):
+        """The next `n` events as (id, event) pairs, skipping keepalives."""
+        found = []
+        async with asyncio.timeout(2):
+            while len(found) < n:
+                chunk = (await anext(body)).decode()
+                if chunk.startswith(":"):
+                    continue
+                fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+                found.append((fields["id"], fields["event"]))
+        return found
+
+    async def close(self, subscriber, body):
+        await body.aclose()
+        self.assertNotIn(subscriber, self.broadcaster.subscribers)
+        self.broadcaster._task.cancel()
+
+    async def test_new_connection_gets_ready_then_live_changes(self):
+        first = self.redis.add()
+        subscriber, body = await self.open()
+        self.assertEqual(await self.events(body, 1), [(first[0].decode(), "ready")])
+
+        live = self.redis.add("license.created")
+        self.assertEqual(await self.events(body, 1), [(live[0].decode(), "license.created")])
+        await self.close(subscriber, body)
+
+    async def test_changes_before_the_first_read_are_not_skipped(self):
+        first = self.redis.add()
+        subscriber, body = await self.open()
+        # The tail fans an entry out before the response body starts.
+        early = self.redis.add("license.created")
+        async with asyncio.timeout(2):
+            while self.broadcaster.position != early[0].decode():
+                await asyncio.sleep(0.01)
+
+        self.assertEqual(
+            await self.events(body, 2),
+            [(first[0].decode(), "ready"), (early[0].decode(), "license.created")],
+        )
+        await self.close(subscriber, body)
+
+    async def test_resume_replays_missed_entries_once(self):
+        seen = self.redis.add()
+        missed = [self.redis.add(), self.redis.add()]
+        subscriber, body = await self.open(seen[0].decode())
+        # The live tail may deliver an entry the replay already covered.
+        subscriber.queue.put_nowait(missed[1])
+        live = self.redis.add("license.deleted")
+
+        self.assertEqual(
+            await self.events(body, 3),
+            [(missed[0][0].decode(), "license.updated"), (missed[1][0].decode(), "license.updated"),
+             (live[0].decode(), "license.deleted")],
+        )
+        await self.close(subscriber, body)
+
+    async def test_trimmed_resume_token_gets_reset(self):
+        trimmed = self.redis.add()
+        self.redis.entries.clear()
+        latest = self.redis.add()
+        subscriber, body = await self.open(trimmed[0].decode())
+        self.assertEqual(await self.events(body, 1), [(latest[0].decode(), "reset")])
+        await self.close(subscriber, body)
+
+    async def test_malformed_resume_token_is_a_new_connection(self):
+        latest = self.redis.add()
+        subscriber, body = await self.open("not-an-id")
+        self.assertEqual(await self.events(body, 1), [(latest[0].decode(), "ready")])
+        await self.close(subscriber, body)
+
+    async def test_overflowed_subscriber_is_disconnected(self):
+        subscriber, body = await self.open()
+        await self.events(body, 1)
+        for _ in range(11):
+            self.broadcaster._fan_out(self.redis.add())
+        self.assertTrue(subscriber.overflowed)
+        # The stream ends; the client reconnects with Last-Event-ID and replays.
+        self.assertEqual([chunk async for chunk in body], [])
+        self.assertNotIn(subscriber, self.broadcaster.subscribers)
+        self.broadcaster._task.cancel()
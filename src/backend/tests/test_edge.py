@@ -0,0 +1,31 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from backend.edge import rate_limit_payload
+from backend.models import ApiQuota
+
+LIMITS = {"token": (600, 100000), "session": (600, 0), "anonymous": (60, 0)}
+
+
+def sha1(key):
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+@override_settings(EDGE_RATE_LIMITS=LIMITS, EDGE_ADMIN_SOCKET="")
+class RateLimitPayloadTests(TestCase):
+    def test_lists_every_token_with_its_quota_or_the_defaults(self):
+        User = get_user_model()
+        plain = Token.objects.create(user=User.objects.create_user("plain"))
+        limited = Token.objects.create(user=User.objects.create_user("limited"))
+        ApiQuota.objects.create(user=limited.user, requests_per_minute=30)
+
+        payload = rate_limit_payload()
+
+        self.assertEqual(payload["defaults"], {kind: list(values) for kind, values in LIMITS.items()})
+        self.assertEqual(payload["identities"], {
+            sha1(plain.key): [600, 100000],
+            sha1(limited.key): [30, 100000],
+        })
@@ -0,0 +1,34 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from backend import health
+from backend.celery_app import app
+
+
+def ping(timeout):
+    # Like kombu: a worker answers at once, but replies are gathered until the timeout.
+    time.sleep(timeout + 0.02)
+    return [{"celery@worker1": {"ok": "pong"}}]
+
+
+@override_settings(HEALTH_CHECK_TIMEOUT=0.3)
+class HealthTests(SimpleTestCase):
+    def test_workers_replying_at_once_are_ok(self):
+        monitor = health.HealthMonitor({"workers": (health.check_workers, False)})
+        with mock.patch.object(app.control, "ping", side_effect=ping):
+            result = monitor.run_checks()
+        self.assertEqual(result["status"], health.OK)
+        self.assertEqual(result["checks"]["workers"]["workers"], 1)
+
+    def test_failures_are_reported_without_details(self):
+        def broken():
+            raise OSError("connect to /var/run/secret.sock failed")
+
+        monitor = health.HealthMonitor({"database": (broken, True), "redis": (lambda: None, False)})
+        with self.assertLogs("backend.health", "WARNING"):
+            result = monitor.run_checks()
+        self.assertEqual(result["status"], health.FAIL)
+        self.assertEqual(result["checks"]["database"], {"status": health.FAIL})
+        self.assertEqual(result["checks"]["redis"]["status"], health.OK)
@@ -0,0 +1,46 @@
+import socket
+
+from django.test import SimpleTestCase
+
+from backend.httppool import ConnectionPool
+
+from .httpstub import StubServer
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_reuses_keep_alive_connections(self):
+        pool = ConnectionPool(timeout=5)
+        with StubServer() as stub:
+            for _ in range(3):
+                self.assertEqual(pool.request("POST", f"{stub.url}/hook?a=1", body=b"{}"), (200, b"ok"))
+        self.assertEqual(stub.connections(), 1)
+        self.assertEqual(stub.requests[0]["path"], "/hook?a=1")
+
+    def test_retries_once_the_server_dropped_an_idle_connection(self):
+        pool = ConnectionPool(timeout=5)
+        with StubServer(drop_idle=True) as stub:
+            self.assertEqual(pool.request("POST", stub.url, body=b"1")[0], 200)
+            self.assertEqual(pool.request("POST", stub.url, body=b"2")[0], 200)
+        self.assertEqual([request["body"] for request in stub.requests], [b"1", b"2"])
+        self.assertEqual(stub.connections(), 2)
+
+    def test_keeps_at_most_max_idle_per_host(self):
+        pool = ConnectionPool(timeout=5, max_idle_per_host=1)
+        with StubServer() as stub:
+            key = ("http", "127.0.0.1", stub.server.server_port)
+            first, _ = pool._acquire(key)
+            second, _ = pool._acquire(key)
+            pool._release(key, first)
+            pool._release(key, second)
+        self.assertEqual(pool._idle[key], [first])
+
+    def test_fresh_connection_errors_propagate(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]  # nothing listens once the socket closes
+        with self.assertRaises(OSError):
+            ConnectionPool(timeout=1).request("GET", f"http://127.0.0.1:{port}/")
+
+    def test_rejects_unsupported_urls(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool().request("GET", "ftp://example.com/")
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from backend.licensing.models import License, Vendor
+
+
+class RevealTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        vendor = Vendor.objects.create(name="Acme")
+        License.objects.create(vendor=vendor, product="Widget", license_key="KEY-1")
+        User = get_user_model()
+        cls.user = User.objects.create_user("user", password="x")
+        cls.staff = User.objects.create_user("staff", password="x", is_staff=True)
+        cls.revealer = User.objects.create_user("revealer", password="x")
+        cls.revealer.user_permissions.add(Permission.objects.get(codename="reveal_license_key"))
+
+    def list_licenses(self, user, query=""):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(f"/api/licenses/{query}")
+
+    def test_list_omits_keys(self):
+        response = self.list_licenses(self.user)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("license_key", response.json()[0])
+
+    def test_reveal_requires_staff_or_permission(self):
+        self.assertEqual(self.list_licenses(self.user, "?reveal=license_key").status_code, 403)
+        for user in (self.staff, self.revealer):
+            response = self.list_licenses(user, "?reveal=license_key")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()[0]["license_key"], "KEY-1")
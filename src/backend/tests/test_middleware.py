@@ -0,0 +1,37 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from backend.jsonlog import request_id_var
+from backend.middleware import QueryCountMiddleware, RequestIdMiddleware
+
+
+def sync_view(request):
+    return HttpResponse(request_id_var.get())
+
+
+async def async_view(request):
+    return HttpResponse(request_id_var.get())
+
+
+class MiddlewareTests(SimpleTestCase):
+    def call(self, middleware, **headers):
+        request = RequestFactory().get("/api/ping/", **headers)
+        if iscoroutinefunction(middleware):
+            return async_to_sync(middleware)(request)
+        return middleware(request)
+
+    def test_follows_the_view_between_sync_and_async(self):
+        self.assertFalse(iscoroutinefunction(QueryCountMiddleware(RequestIdMiddleware(sync_view))))
+        self.assertTrue(iscoroutinefunction(QueryCountMiddleware(RequestIdMiddleware(async_view))))
+
+    def test_request_id_is_bound_and_echoed(self):
+        for view in (sync_view, async_view):
+            response = self.call(RequestIdMiddleware(view), HTTP_X_REQUEST_ID="abc-123")
+            self.assertEqual(response["X-Request-ID"], "abc-123")
+            self.assertEqual(response.content, b"abc-123")
+            self.assertIsNone(request_id_var.get())
+
+    def test_query_count_header(self):
+        for view in (sync_view, async_view):
+            self.assertEqual(self.call(QueryCountMiddleware(view))["X-Query-Count"], "0")
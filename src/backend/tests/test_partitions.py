@@ -0,0 +1,72 @@
+from datetime import date, datetime, timezone
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from backend import partitions
+from backend.licensing.models import AuditEvent
+
+TABLE = "licensing_auditevent"
+
+
+def months():
+    with connection.cursor() as cursor:
+        return [start for _, start, _ in partitions.partitions(cursor, TABLE)]
+
+
+class PartitionMaintenanceTests(TestCase):
+    def default_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {partitions.default_name(TABLE)}")
+            return cursor.fetchone()[0]
+
+    def test_creates_months_ahead(self):
+        with override_settings(PARTITION_MONTHS_AHEAD=2):
+            partitions.maintain([TABLE], today=date(2031, 11, 20))
+        self.assertTrue({date(2031, 11, 1), date(2031, 12, 1), date(2032, 1, 1)} <= set(months()))
+
+    def test_rows_beyond_the_window_land_in_default_and_are_drained(self):
+        when = datetime(2035, 6, 15, 12, tzinfo=timezone.utc)
+        event = AuditEvent.objects.create(action="license.updated", license_id=1, occurred_at=when)
+        self.assertNotIn(date(2035, 6, 1), months())
+        self.assertEqual(self.default_rows(), 1)
+
+        report = partitions.maintain([TABLE])
+
+        self.assertIn(partitions.partition_name(TABLE, date(2035, 6, 1)), report[TABLE]["created"])
+        self.assertEqual(self.default_rows(), 0)
+        self.assertEqual(AuditEvent.objects.get(pk=event.pk).occurred_at, when)
+        # The default partition is attached again and keeps catching strays.
+        AuditEvent.objects.create(action="license.updated", occurred_at=datetime(2040, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(self.default_rows(), 1)
+
+    def test_drops_months_past_retention(self):
+        old = datetime(2020, 3, 10, tzinfo=timezone.utc)
+        AuditEvent.objects.create(action="license.updated", occurred_at=old)
+        with override_settings(AUDIT_RETENTION_MONTHS=0):
+            partitions.maintain([TABLE])
+        self.assertIn(date(2020, 3, 1), months())
+
+        with override_settings(AUDIT_RETENTION_MONTHS=12):
+            report = partitions.maintain([TABLE])
+
+        self.assertIn(partitions.partition_name(TABLE, date(2020, 3, 1)), report[TABLE]["dropped"])
+        self.assertFalse(AuditEvent.objects.filter(occurred_at=old).exists())
+
+
+class AutocommitPartitionMaintenanceTests(TransactionTestCase):
+    """maintain() as beat and the management command run it: outside any transaction."""
+
+    def test_drops_months_past_retention(self):
+        old = datetime(2019, 5, 10, tzinfo=timezone.utc)
+        AuditEvent.objects.create(action="license.updated", occurred_at=old)
+        with override_settings(AUDIT_RETENTION_MONTHS=0):
+            partitions.maintain([TABLE])
+        self.assertIn(date(2019, 5, 1), months())
+
+        with override_settings(AUDIT_RETENTION_MONTHS=12):
+            report = partitions.maintain([TABLE])
+
+        self.assertIn(partitions.partition_name(TABLE, date(2019, 5, 1)), report[TABLE]["dropped"])
+        self.assertNotIn(date(2019, 5, 1), months())
+        self.assertFalse(AuditEvent.objects.filter(occurred_at=old).exists())
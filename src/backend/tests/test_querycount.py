@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from backend.licensing.models import License, Vendor
+from backend.querycount import QueryBudgetExceeded, QueryBudgetMixin, assert_max_queries, budget_for, sql_shape
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("alice", password="x")
+        for n in range(10):
+            vendor = Vendor.objects.create(name=f"Vendor {n}")
+            License.objects.create(vendor=vendor, product=f"Widget {n}", license_key=f"KEY-{n}")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_over_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with self.assertMaxQueries(1):
+                list(Vendor.objects.all())
+                list(License.objects.all())
+
+    def test_n_plus_one_is_detected(self):
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            with self.assertNoNPlusOne():
+                for license in License.objects.all():
+                    license.vendor.name
+        self.assertIn("N+1", str(raised.exception))
+
+    def test_counter_is_yielded(self):
+        with assert_max_queries(2) as counter:
+            Vendor.objects.count()
+        self.assertEqual(len(counter), 1)
+
+    def test_license_endpoints_stay_within_budget(self):
+        license = License.objects.first()
+        for url, name in (("/api/licenses/", "license-list"), (f"/api/licenses/{license.pk}/", "license-detail")):
+            with self.assertMaxQueries(settings.QUERY_BUDGETS[name]), self.assertNoNPlusOne():
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_sql_shape_ignores_literals(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  AND n = 5"),
+            sql_shape("SELECT * FROM t WHERE id IN (%s) AND name = 'y' AND n = 7"),
+        )
+
+    @override_settings(QUERY_BUDGETS={"api-ping": 0}, QUERY_BUDGET_DEFAULT=10)
+    def test_budget_lookup_falls_back_to_default(self):
+        self.assertEqual(budget_for("api-ping"), 0)
+        self.assertEqual(budget_for("license-list"), 10)
+        self.assertEqual(budget_for(None), 10)
@@ -0,0 +1,87 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from backend import crypto, rotation
+from backend.licensing.models import License, Vendor
+from backend.models import KeyRotation
+from backend.tasks import rotate_encryption_keys
+
+LABEL = "licensing.License.license_key"
+OLD_KEYS = {"1": "old secret"}
+NEW_KEYS = {"2": "new secret", "1": "old secret"}
+
+
+def stored(license):
+    return License.objects.values_list("license_key", flat=True).get(pk=license.pk).ciphertext
+
+
+@override_settings(FIELD_ENCRYPTION_KEYS=NEW_KEYS, FIELD_ENCRYPTION_PRIMARY="")
+class RotationTests(TestCase):
+    def setUp(self):
+        vendor = Vendor.objects.create(name="Acme")
+        with override_settings(FIELD_ENCRYPTION_KEYS=OLD_KEYS):
+            self.licenses = [
+                License.objects.create(vendor=vendor, product=f"Widget {n}", license_key=f"KEY-{n}")
+                for n in range(5)
+            ]
+
+    def versions(self):
+        return [crypto.split(stored(license))[0] for license in self.licenses]
+
+    def test_rotates_every_row_and_keeps_plaintext(self):
+        self.assertEqual(self.versions(), ["1"] * 5)
+        self.assertTrue(rotation.rotate([LABEL], rows_per_second=0))
+        self.assertEqual(self.versions(), ["2"] * 5)
+        self.assertEqual(
+            [str(key) for key in License.objects.order_by("pk").values_list("license_key", flat=True)],
+            [f"KEY-{n}" for n in range(5)],
+        )
+        checkpoint = KeyRotation.objects.get(field=LABEL, key_version="2")
+        self.assertEqual((checkpoint.scanned, checkpoint.rotated), (5, 5))
+        self.assertIsNotNone(checkpoint.finished_at)
+
+    def test_resumes_from_checkpoint(self):
+        self.assertFalse(rotation.rotate([LABEL], chunk_size=2, rows_per_second=0, time_limit=1e-9))
+        checkpoint = KeyRotation.objects.get(field=LABEL, key_version="2")
+        self.assertEqual(checkpoint.last_pk, self.licenses[1].pk)
+        self.assertEqual(self.versions(), ["2", "2", "1", "1", "1"])
+
+        # Rows behind the checkpoint are not visited again.
+        with mock.patch.object(crypto.Keyring, "needs_rotation", autospec=True, return_value=True) as needs:
+            rotation.rotate([LABEL], chunk_size=2, rows_per_second=0, time_limit=1e-9)
+        self.assertEqual(needs.call_count, 2)
+        self.assertEqual(KeyRotation.objects.get(pk=checkpoint.pk).last_pk, self.licenses[3].pk)
+
+    def test_concurrent_edit_is_not_overwritten(self):
+        target = self.licenses[2]
+        reencrypt = crypto.Keyring.reencrypt
+
+        def edited_meanwhile(ring, value):
+            if value == stored(target):
+                License.objects.filter(pk=target.pk).update(license_key="EDITED")
+            return reencrypt(ring, value)
+
+        with mock.patch.object(crypto.Keyring, "reencrypt", autospec=True, side_effect=edited_meanwhile):
+            rotation.rotate([LABEL], rows_per_second=0)
+
+        self.assertEqual(str(License.objects.get(pk=target.pk).license_key), "EDITED")
+        self.assertEqual(KeyRotation.objects.get(field=LABEL, key_version="2").rotated, 4)
+
+    def test_restart_resets_before_queueing_and_the_task_never_does(self):
+        rotation.rotate([LABEL], rows_per_second=0)
+        with mock.patch.object(rotate_encryption_keys, "delay") as delay:
+            call_command("rotate_encryption_keys", LABEL, "--restart", "--async", stdout=StringIO())
+        delay.assert_called_once_with(labels=[LABEL])
+        checkpoint = KeyRotation.objects.get(field=LABEL, key_version="2")
+        self.assertEqual((checkpoint.last_pk, checkpoint.finished_at), (0, None))
+
+        # A redelivered slice resumes instead of starting over.
+        rotation.rotate([LABEL], chunk_size=2, rows_per_second=0, time_limit=1e-9)
+        with override_settings(KEY_ROTATION_CHUNK_SIZE=2, KEY_ROTATION_ROWS_PER_SECOND=0):
+            with mock.patch.object(rotate_encryption_keys, "apply_async") as requeue:
+                rotate_encryption_keys.run(labels=[LABEL], time_limit=1e-9)
+        requeue.assert_called_once()
+        self.assertEqual(KeyRotation.objects.get(pk=checkpoint.pk).scanned, 4)